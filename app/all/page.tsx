@@ -8,7 +8,7 @@ import { Badge } from "@/components/ui/badge";
 import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
 import { JobListing } from "@/lib/types";
 import { loadAllJobs } from "@/lib/data-utils";
-import { Loader2, Search, Filter, ExternalLink, Calendar, MapPin } from "lucide-react";
+import { Loader2, Search, Filter, ExternalLink, Calendar, MapPin, Download } from "lucide-react";
 import { format } from "date-fns";
 
 const sourceColors = {
@@ -38,7 +38,7 @@ export default function AllListings() {
     async function fetchJobs() {
       try {
         setLoading(true);
-        const allJobs = await loadAllJobs();
+        const allJobs = await loadAllJobs('all');
         setJobs(allJobs);
       } catch (err) {
         setError('Failed to load job listings');
@@ -97,6 +97,9 @@ export default function AllListings() {
 
   const totalPages = Math.ceil(filteredAndSortedJobs.length / itemsPerPage);
 
+  // Exports cover the sources the page shows, not every scraped source
+  const visibleSources = selectedSources.length > 0 ? selectedSources : Object.keys(sourceLabels);
+
   const toggleSource = (source: string) => {
     setSelectedSources(prev =>
       prev.includes(source)
@@ -219,10 +222,28 @@ export default function AllListings() {
           {/* Results */}
           <Card className="shadow-lg border-l-4 border-l-purple-500">
             <CardHeader className="bg-gradient-to-r from-purple-50/50 to-pink-50/50 dark:from-purple-950/20 dark:to-pink-950/20">
-              <CardTitle className="bg-gradient-to-r from-purple-600 to-pink-600 bg-clip-text text-transparent">
-                {filteredAndSortedJobs.length} Results
-                {searchTerm && ` for "${searchTerm}"`}
-              </CardTitle>
+              <div className="flex items-center justify-between gap-4">
+                <CardTitle className="bg-gradient-to-r from-purple-600 to-pink-600 bg-clip-text text-transparent">
+                  {filteredAndSortedJobs.length} Results
+                  {searchTerm && ` for "${searchTerm}"`}
+                </CardTitle>
+                <div className="flex gap-2">
+                  {['csv', 'ndjson'].map(fmt => (
+                    <Button
+                      key={fmt}
+                      asChild
+                      variant="outline"
+                      size="sm"
+                      className="border-purple-200 text-purple-600 hover:bg-purple-50 dark:hover:bg-purple-950/20"
+                    >
+                      <a href={`/api/export?${new URLSearchParams([['format', fmt], ...visibleSources.map(source => ['source', source])])}`}>
+                        <Download className="h-4 w-4 mr-1" />
+                        {fmt.toUpperCase()}
+                      </a>
+                    </Button>
+                  ))}
+                </div>
+              </div>
             </CardHeader>
             <CardContent>
               {filteredAndSortedJobs.length === 0 ? (
@@ -0,0 +1,33 @@
+import { applyRequest, normalizeEmail, tokenMatches, updateSubscriptions } from '@/lib/subscriptions';
+
+function page(status: number, message: string): Response {
+  return new Response(`<!doctype html><meta charset="utf-8"><title>Job digests</title><p>${message}</p>`, {
+    status,
+    headers: { 'Content-Type': 'text/html; charset=utf-8', 'Cache-Control': 'no-store' },
+  });
+}
+
+// Confirmation link mailed by job_data/digest.py: applies the pending subscribe or unsubscribe
+export async function GET(request: Request) {
+  const params = new URL(request.url).searchParams;
+  const email = normalizeEmail(params.get('email') ?? '');
+  const token = params.get('token') ?? '';
+
+  try {
+    const action = await updateSubscriptions((subscriptions, requests) => {
+      const pending = requests[email];
+      if (!pending || !tokenMatches(pending.token, token)) return null;
+      applyRequest(subscriptions, email, pending);
+      delete requests[email];
+      return pending.action;
+    });
+
+    if (action === null) return page(404, 'This link has expired or was already used.');
+    return page(200, action === 'subscribe'
+      ? 'Your job digest subscription is confirmed.'
+      : 'You are unsubscribed and will get no more job digests.');
+  } catch (error) {
+    console.error('Error confirming email configuration:', error);
+    return page(500, 'Could not update your subscription, please try again later.');
+  }
+}
@@ -0,0 +1,76 @@
+import { EmailConfiguration } from '@/lib/types';
+import { newToken, normalizeEmail, updateSubscriptions } from '@/lib/subscriptions';
+
+const EMAIL_PATTERN = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
+const SOURCE_PATTERN = /^[a-z_]+$/;
+const FREQUENCIES = ['daily', 'weekly'];
+
+interface EmailConfigRequest extends EmailConfiguration {
+  // Addresses the user removed in the UI since loading the configuration
+  removed?: string[];
+}
+
+function isEmailList(value: unknown): value is string[] {
+  return Array.isArray(value) && value.every(item => typeof item === 'string' && EMAIL_PATTERN.test(item.trim()));
+}
+
+// Returns an error message, or null if the request can be saved
+function validate(config: EmailConfigRequest): string | null {
+  if (!config || typeof config !== 'object') return 'Expected a JSON object';
+  if (!isEmailList(config.emails)) return 'emails must be a list of email addresses';
+  if (config.removed !== undefined && !isEmailList(config.removed)) {
+    return 'removed must be a list of email addresses';
+  }
+  if (!FREQUENCIES.includes(config.frequency)) return `frequency must be one of ${FREQUENCIES.join(', ')}`;
+  if (!Array.isArray(config.sources) || !config.sources.every(source => typeof source === 'string' && SOURCE_PATTERN.test(source))) {
+    return 'sources must be a list of source names';
+  }
+  if (config.keywords !== undefined && typeof config.keywords !== 'string') return 'keywords must be a string';
+  return null;
+}
+
+// Request subscription changes for the digest job (job_data/digest.py).
+// Nothing changes until the owner of each address opens the confirmation link that
+// digest.py mails to it (/api/email-config/confirm), so a caller can neither subscribe
+// nor unsubscribe an address it does not control.
+export async function POST(request: Request) {
+  let config: EmailConfigRequest;
+  try {
+    config = await request.json();
+  } catch {
+    return new Response('Invalid JSON', { status: 400 });
+  }
+  const error = validate(config);
+  if (error) {
+    return new Response(error, { status: 400 });
+  }
+
+  try {
+    const emails = new Set(config.emails.map(normalizeEmail));
+    const removed = new Set((config.removed ?? []).map(normalizeEmail).filter(email => !emails.has(email)));
+    const requestedAt = new Date().toISOString();
+
+    await updateSubscriptions((_, requests) => {
+      for (const email of emails) {
+        requests[email] = {
+          action: 'subscribe',
+          token: newToken(),
+          requested_at: requestedAt,
+          frequency: config.frequency,
+          sources: config.sources,
+          ...(config.keywords ? { keywords: config.keywords } : {}),
+        };
+      }
+      for (const email of removed) {
+        requests[email] = { action: 'unsubscribe', token: newToken(), requested_at: requestedAt };
+      }
+    });
+
+    return Response.json({ pending: emails.size + removed.size });
+  } catch (error) {
+    console.error('Error saving email configuration:', error);
+    return new Response('Error saving email configuration', {
+      status: 500,
+    });
+  }
+}
@@ -0,0 +1,106 @@
+import { spawn } from 'child_process';
+import path from 'path';
+
+const contentTypes: Record<string, string> = {
+  csv: 'text/csv; charset=utf-8',
+  ndjson: 'application/x-ndjson; charset=utf-8',
+  parquet: 'application/vnd.apache.parquet',
+};
+
+const datePattern = /^\d{4}-\d{2}-\d{2}$/;
+const sourcePattern = /^[a-z]+$/;
+
+// Stream the normalized job archive from job_data/export.py without buffering it
+export async function GET(request: Request) {
+  const params = new URL(request.url).searchParams;
+  const format = params.get('format') ?? 'csv';
+  const sources = params.getAll('source');
+  const since = params.get('since');
+  const until = params.get('until');
+
+  if (!(format in contentTypes)
+      || !sources.every(source => sourcePattern.test(source))
+      || (since && !datePattern.test(since))
+      || (until && !datePattern.test(until))) {
+    return new Response('Invalid export parameters', {
+      status: 400,
+    });
+  }
+
+  const args = ['export.py', '--format', format];
+  sources.forEach(source => args.push('--source', source));
+  if (since) args.push('--since', since);
+  if (until) args.push('--until', until);
+
+  const child = spawn(process.env.PYTHON ?? 'python3', args, {
+    cwd: path.join(process.cwd(), 'job_data'),
+  });
+
+  let stderr = '';
+  child.stderr.on('data', (chunk: Buffer) => {
+    stderr = (stderr + chunk.toString()).slice(-4000);
+    console.error('Export error:', chunk.toString());
+  });
+  const exited = new Promise<number | null>((resolve) => {
+    child.on('close', (code) => resolve(code));
+    child.on('error', (error) => {
+      console.error('Error running export:', error);
+      stderr += String(error);
+      resolve(-1);
+    });
+  });
+
+  // Hold the response until the exporter produces output or exits, so a failure
+  // before the first byte (bad archive, missing pyarrow) becomes a 500, not an empty 200
+  child.stdout.pause();
+  const firstChunk = await Promise.race([
+    new Promise<Buffer | null>((resolve) => {
+      child.stdout.once('data', (chunk: Buffer) => {
+        child.stdout.pause();
+        resolve(chunk);
+      });
+      child.stdout.resume();
+    }),
+    exited.then(() => null),
+  ]);
+  if (firstChunk === null) {
+    const code = await exited;
+    if (code !== 0) {
+      return new Response(`Export failed: ${stderr.trim() || `exit code ${code}`}`, {
+        status: 500,
+      });
+    }
+  }
+
+  // Pull-based so a slow client pauses the exporter instead of buffering in memory
+  const stream = new ReadableStream<Uint8Array>({
+    start(controller) {
+      if (firstChunk) controller.enqueue(new Uint8Array(firstChunk));
+      child.stdout.on('data', (chunk: Buffer) => {
+        controller.enqueue(new Uint8Array(chunk));
+        if ((controller.desiredSize ?? 0) <= 0) child.stdout.pause();
+      });
+      // Headers are sent by now; a failure mid-stream aborts the download instead of truncating it silently
+      exited.then((code) => {
+        if (code === 0) {
+          controller.close();
+        } else {
+          controller.error(new Error(`Export failed: ${stderr.trim() || `exit code ${code}`}`));
+        }
+      });
+    },
+    pull() {
+      child.stdout.resume();
+    },
+    cancel() {
+      child.kill();
+    },
+  });
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': contentTypes[format],
+      'Content-Disposition': `attachment; filename="jobs.${format}"`,
+    },
+  });
+}
@@ -1,20 +1,5 @@
-import { promises as fs } from 'fs';
-import path from 'path';
+import { serveJobsCsv } from '@/lib/job-files';
 
-export async function GET() {
-  try {
-    const filePath = path.join(process.cwd(), 'job_data', 'meritmind_jobs.csv');
-    const fileContent = await fs.readFile(filePath, 'utf8');
-    
-    return new Response(fileContent, {
-      headers: {
-        'Content-Type': 'text/csv',
-      },
-    });
-  } catch (error) {
-    console.error('Error reading Meritmind jobs file:', error);
-    return new Response('Error loading jobs data', {
-      status: 500,
-    });
-  }
-} 
\ No newline at end of file
+export async function GET(request: Request) {
+  return serveJobsCsv(request, 'meritmind_jobs.csv', 'Meritmind');
+}
@@ -0,0 +1,5 @@
+import { serveBundleFile } from '@/lib/job-files';
+
+export async function GET(request: Request, { params }: { params: Promise<{ path: string[] }> }) {
+  return serveBundleFile(request, (await params).path);
+}
@@ -1,6 +1,6 @@
 "use client";
 
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card";
 import { Input } from "@/components/ui/input";
 import { Button } from "@/components/ui/button";
@@ -17,8 +17,20 @@ export default function EmailConfig() {
     sources: ['meritmind', 'poolia', 'arbetsformedlingen'],
   });
   const [newEmail, setNewEmail] = useState("");
+  const [removed, setRemoved] = useState<string[]>([]);
   const [saved, setSaved] = useState(false);
 
+  useEffect(() => {
+    const stored = localStorage.getItem('email-config');
+    if (stored) {
+      try {
+        setConfig(prev => ({ ...prev, ...JSON.parse(stored) }));
+      } catch {
+        localStorage.removeItem('email-config');
+      }
+    }
+  }, []);
+
   const addEmail = () => {
     if (newEmail && !config.emails.includes(newEmail)) {
       const emailRegex = /^[^\s@]+@[^\s@]+\.[^\s@]+$/;
@@ -27,6 +39,7 @@ export default function EmailConfig() {
           ...prev,
           emails: [...prev.emails, newEmail]
         }));
+        setRemoved(prev => prev.filter(e => e !== newEmail));
         setNewEmail("");
       }
     }
@@ -37,6 +50,7 @@ export default function EmailConfig() {
       ...prev,
       emails: prev.emails.filter(e => e !== email)
     }));
+    setRemoved(prev => prev.includes(email) ? prev : [...prev, email]);
   };
 
   const toggleSource = (source: string) => {
@@ -48,9 +62,23 @@ export default function EmailConfig() {
     }));
   };
 
-  const saveConfiguration = () => {
-    // In a real app, this would save to a backend
+  const saveConfiguration = async () => {
     localStorage.setItem('email-config', JSON.stringify(config));
+    // File subscribe/unsubscribe requests; each address confirms through the link the digest job mails it
+    try {
+      const response = await fetch('/api/email-config', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ...config, removed }),
+      });
+      if (!response.ok) {
+        console.error('Error saving email configuration:', await response.text());
+        return;
+      }
+      setRemoved([]);
+    } catch (error) {
+      console.error('Error saving email configuration:', error);
+    }
     setSaved(true);
     setTimeout(() => setSaved(false), 3000);
   };
@@ -104,7 +132,7 @@ export default function EmailConfig() {
                     Email Addresses
                   </CardTitle>
                   <CardDescription>
-                    Manage the email addresses that will receive job notifications
+                    Manage the email addresses that will receive job notifications. Each address gets a link to confirm additions and removals.
                   </CardDescription>
                 </CardHeader>
                 <CardContent className="space-y-4">
@@ -251,6 +279,26 @@ export default function EmailConfig() {
                   </CardContent>
                 </Card>
               </div>
+
+              {/* Saved search */}
+              <Card className="mt-6 border-l-4 border-l-purple-500 bg-gradient-to-r from-white to-purple-50/30 dark:from-card dark:to-purple-950/20 shadow-lg">
+                <CardHeader className="bg-gradient-to-r from-purple-50/50 to-pink-50/50 dark:from-purple-950/20 dark:to-pink-950/20">
+                  <CardTitle className="bg-gradient-to-r from-purple-600 to-pink-600 bg-clip-text text-transparent">
+                    Keywords
+                  </CardTitle>
+                  <CardDescription>
+                    Only notify about jobs matching all of these words, e.g. &quot;jurist stockholm&quot;. Leave empty for all jobs.
+                  </CardDescription>
+                </CardHeader>
+                <CardContent>
+                  <Input
+                    placeholder="e.g. jurist stockholm"
+                    value={config.keywords ?? ''}
+                    onChange={(e) => setConfig(prev => ({ ...prev, keywords: e.target.value }))}
+                    className="border-purple-200 focus:border-purple-500 focus:ring-purple-500"
+                  />
+                </CardContent>
+              </Card>
             </TabsContent>
           </Tabs>
 
@@ -264,7 +312,7 @@ export default function EmailConfig() {
               {saved ? (
                 <>
                   <CheckCircle className="h-5 w-5 mr-2" />
-                  Configuration Saved!
+                  Check your inbox to confirm
                 </>
               ) : (
                 'Save Configuration'
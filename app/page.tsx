@@ -17,7 +17,7 @@ export default function TodaysListings() {
     async function fetchJobs() {
       try {
         setLoading(true);
-        const allJobs = await loadAllJobs();
+        const allJobs = await loadAllJobs('daily');
         setJobs(allJobs);
       } catch (err) {
         setError('Failed to load job listings');
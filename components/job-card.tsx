@@ -49,6 +49,12 @@ export function JobCard({ job }: JobCardProps) {
           )}
         </div>
 
+        {job.employer && (
+          <div className="text-sm text-muted-foreground bg-purple-50/50 dark:bg-purple-950/20 p-2 rounded-md">
+            <strong className="text-purple-700 dark:text-purple-300">Employer:</strong> {job.employer}
+          </div>
+        )}
+
         {job.occupation && job.occupation !== job.title && (
           <div className="text-sm text-muted-foreground bg-purple-50/50 dark:bg-purple-950/20 p-2 rounded-md">
             <strong className="text-purple-700 dark:text-purple-300">Role:</strong> {job.occupation}
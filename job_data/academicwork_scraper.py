@@ -1,41 +1,45 @@
 #!/usr/bin/env python3
-import requests
 import re
-import csv
 import os
 from datetime import datetime
 import time
 
-def get_jina_content(url, api_key=None):
-    """Fetch content using Jina Reader API"""
-    jina_url = f"https://r.jina.ai/{url}"
-    headers = {}
-    
-    if api_key:
-        headers['Authorization'] = f'Bearer {api_key}'
-    
-    try:
-        response = requests.get(jina_url, headers=headers)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"Error fetching content: {e}")
-        return None
+from classifier import KeywordClassifier, tag_jobs
+from fetcher import get_jina_content
+from publisher import publish_csv
+
+URL_TEMPLATE = "https://www.academicwork.se/lediga-jobb?l=whosonfirst%3Alocality%3A{locality}"
+# Who's On First locality ids
+QUERY_MATRIX = {
+    'city': {
+        'stockholm': {'locality': '101752307'},
+    },
+}
+DEFAULT_QUERY = {'city': 'stockholm'}
+URL = URL_TEMPLATE.format(**QUERY_MATRIX['city']['stockholm'])
+CSV_FILENAME = 'academicwork_jobs.csv'
+FIELDNAMES = ['title', 'link', 'date_added', 'categories', 'employer']
+JOB_URL_PATTERN = r'https://www\.academicwork\.se/jobb/.+'
+CLASSIFIER = KeywordClassifier(
+    role_keywords=['utvecklare', 'konsult', 'analyst', 'manager', 'chef', 'ingenjör', 'designer', 'säljare', 'ekonom', 'koordinator'],
+    skip_keywords=['cookie', 'consent', 'om oss', 'kontakt', 'för företag', 'jobbsökande', 'sök', 'filter']
+)
+# Pattern to match Academic Work job listings
+# Looking for various job link patterns
+JOB_PATTERNS = [
+    re.compile(r'\[([^\]]+)\]\((https://www\.academicwork\.se/jobb/[^)]+)\)', re.MULTILINE),  # Standard job links
+    re.compile(r'\[([^\]]+)\]\((https://www\.academicwork\.se/lediga-jobb/[^)]+)\)', re.MULTILINE),  # Alternative job links
+    re.compile(r'#### ([^|]+?)(?:\|[^|]*)?$', re.MULTILINE),  # Job titles as headings
+]
+# Every regex the parser runs, for the sandbox fuzzer
+PATTERNS = [*JOB_PATTERNS, CLASSIFIER.pattern]
 
 def parse_academicwork_jobs(content):
     """Parse Academic Work job listings from Jina content"""
     jobs = []
     
-    # Pattern to match Academic Work job listings
-    # Looking for various job link patterns
-    job_patterns = [
-        r'\[([^\]]+)\]\((https://www\.academicwork\.se/jobb/[^)]+)\)',  # Standard job links
-        r'\[([^\]]+)\]\((https://www\.academicwork\.se/lediga-jobb/[^)]+)\)',  # Alternative job links
-        r'#### ([^|]+?)(?:\|[^|]*)?$',  # Job titles as headings
-    ]
-    
-    for pattern in job_patterns:
-        matches = re.findall(pattern, content, re.MULTILINE)
+    for pattern in JOB_PATTERNS:
+        matches = pattern.findall(content)
         for match in matches:
             if isinstance(match, tuple):
                 title, link = match
@@ -47,8 +51,7 @@ def parse_academicwork_jobs(content):
             title = title.strip()
             if title and len(title) > 3:
                 # Filter out navigation and non-job content
-                skip_keywords = ['cookie', 'consent', 'om oss', 'kontakt', 'för företag', 'jobbsökande', 'sök', 'filter']
-                if not any(skip.lower() in title.lower() for skip in skip_keywords):
+                if not CLASSIFIER.label(title).skip:
                     jobs.append({
                         'title': title,
                         'link': link,
@@ -63,7 +66,7 @@ def parse_academicwork_jobs(content):
             # Look for potential job titles in content
             if len(line) > 10 and len(line) < 200:
                 # Look for job-related keywords
-                if any(keyword in line.lower() for keyword in ['utvecklare', 'konsult', 'analyst', 'manager', 'chef', 'ingenjör', 'designer', 'säljare', 'ekonom', 'koordinator']):
+                if CLASSIFIER.label(line).role:
                     jobs.append({
                         'title': line,
                         'link': 'https://www.academicwork.se/lediga-jobb',
@@ -79,11 +82,11 @@ def parse_academicwork_jobs(content):
             seen.add(job_key)
             unique_jobs.append(job)
     
-    return unique_jobs[:50]  # Limit to first 50 jobs
+    return tag_jobs(unique_jobs[:50])  # Limit to first 50 jobs
 
 def scrape_academicwork_jobs():
     """Main function to scrape Academic Work jobs"""
-    url = "https://www.academicwork.se/lediga-jobb?l=whosonfirst%3Alocality%3A101752307"
+    url = URL
     
     # Get API key from environment (if available)
     api_key = os.getenv('JINA_API_KEY')
@@ -103,17 +106,12 @@ def scrape_academicwork_jobs():
         print(content[:1000])
         return
     
-    # Write to CSV
-    csv_filename = 'academicwork_jobs.csv'
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'link', 'date_added']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for job in jobs:
-            writer.writerow(job)
-    
-    print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    # Publish the CSV atomically
+    csv_filename = CSV_FILENAME
+    if publish_csv(csv_filename, FIELDNAMES, jobs):
+        print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    else:
+        print(f"Scraped {len(jobs)} jobs, {csv_filename} unchanged")
     
     # Display first few jobs
     for i, job in enumerate(jobs[:5]):
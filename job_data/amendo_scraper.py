@@ -1,40 +1,38 @@
 #!/usr/bin/env python3
-import requests
 import re
-import csv
 import os
 from datetime import datetime
 import time
 
-def get_jina_content(url, api_key=None):
-    """Fetch content using Jina Reader API"""
-    jina_url = f"https://r.jina.ai/{url}"
-    headers = {}
-    
-    if api_key:
-        headers['Authorization'] = f'Bearer {api_key}'
-    
-    try:
-        response = requests.get(jina_url, headers=headers)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"Error fetching content: {e}")
-        return None
+from classifier import KeywordClassifier, tag_jobs
+from fetcher import get_jina_content
+from publisher import publish_csv
+
+URL = "https://jobb.amendo.se/jobs"
+CSV_FILENAME = 'amendo_jobs.csv'
+FIELDNAMES = ['title', 'link', 'date_added', 'categories', 'employer']
+JOB_URL_PATTERN = r'https://jobb\.amendo\.se/jobs/\d+'
+BACKEND = 'html'
+HTML_SELECTORS = {'item': 'a[href*="/jobs/"]'}
+CLASSIFIER = KeywordClassifier(
+    role_keywords=['utvecklare', 'konsult', 'analyst', 'manager', 'chef', 'ingenjör', 'koordinator', 'specialist'],
+    skip_keywords=['cookie', 'consent', 'samtycke', 'information', 'om', 'logotyp']
+)
+# Pattern to match Amendo job listings
+JOB_PATTERNS = [
+    re.compile(r'\[([^\]]+)\]\((https://jobb\.amendo\.se/jobs/[^)]+)\)', re.MULTILINE),  # Job links
+    re.compile(r'\[([^\]]+)\]\((https://amendo\.se/[^)]+)\)', re.MULTILINE),  # Alternative links
+    re.compile(r'#### ([^|]+?)(?:\|[^|]*)?$', re.MULTILINE),  # Job titles as headings
+]
+# Every regex the parser runs, for the sandbox fuzzer
+PATTERNS = [*JOB_PATTERNS, CLASSIFIER.pattern]
 
 def parse_amendo_jobs(content):
     """Parse Amendo job listings from Jina content"""
     jobs = []
     
-    # Pattern to match Amendo job listings
-    job_patterns = [
-        r'\[([^\]]+)\]\((https://jobb\.amendo\.se/jobs/[^)]+)\)',  # Job links
-        r'\[([^\]]+)\]\((https://amendo\.se/[^)]+)\)',  # Alternative links
-        r'#### ([^|]+?)(?:\|[^|]*)?$',  # Job titles as headings
-    ]
-    
-    for pattern in job_patterns:
-        matches = re.findall(pattern, content, re.MULTILINE)
+    for pattern in JOB_PATTERNS:
+        matches = pattern.findall(content)
         for match in matches:
             if isinstance(match, tuple):
                 title, link = match
@@ -46,8 +44,7 @@ def parse_amendo_jobs(content):
             title = title.strip()
             if title and len(title) > 3:
                 # Filter out navigation and non-job content
-                skip_keywords = ['cookie', 'consent', 'samtycke', 'information', 'om', 'logotyp']
-                if not any(skip.lower() in title.lower() for skip in skip_keywords):
+                if not CLASSIFIER.label(title).skip:
                     jobs.append({
                         'title': title,
                         'link': link,
@@ -61,7 +58,7 @@ def parse_amendo_jobs(content):
             line = line.strip()
             if len(line) > 10 and len(line) < 200:
                 # Look for job-related keywords
-                if any(keyword in line.lower() for keyword in ['utvecklare', 'konsult', 'analyst', 'manager', 'chef', 'ingenjör', 'koordinator', 'specialist']):
+                if CLASSIFIER.label(line).role:
                     jobs.append({
                         'title': line,
                         'link': 'https://jobb.amendo.se/jobs',
@@ -77,11 +74,11 @@ def parse_amendo_jobs(content):
             seen.add(job_key)
             unique_jobs.append(job)
     
-    return unique_jobs[:30]  # Limit to first 30
+    return tag_jobs(unique_jobs[:30])  # Limit to first 30
 
 def scrape_amendo_jobs():
     """Main function to scrape Amendo jobs"""
-    url = "https://jobb.amendo.se/jobs"
+    url = URL
     
     # Get API key from environment (if available)
     api_key = os.getenv('JINA_API_KEY')
@@ -101,17 +98,12 @@ def scrape_amendo_jobs():
         print(content[:1000])
         return
     
-    # Write to CSV
-    csv_filename = 'amendo_jobs.csv'
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'link', 'date_added']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for job in jobs:
-            writer.writerow(job)
-    
-    print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    # Publish the CSV atomically
+    csv_filename = CSV_FILENAME
+    if publish_csv(csv_filename, FIELDNAMES, jobs):
+        print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    else:
+        print(f"Scraped {len(jobs)} jobs, {csv_filename} unchanged")
     
     # Display first few jobs
     for i, job in enumerate(jobs[:5]):
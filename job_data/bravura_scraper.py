@@ -1,36 +1,31 @@
 #!/usr/bin/env python3
-import requests
 import re
-import csv
 import os
 from datetime import datetime
 import time
 
-def get_jina_content(url, api_key=None):
-    """Fetch content using Jina Reader API"""
-    jina_url = f"https://r.jina.ai/{url}"
-    headers = {}
-    
-    if api_key:
-        headers['Authorization'] = f'Bearer {api_key}'
-    
-    try:
-        response = requests.get(jina_url, headers=headers)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"Error fetching content: {e}")
-        return None
+from classifier import tag_jobs
+from fetcher import get_jina_content
+from publisher import publish_csv
+
+URL = "https://www.bravura.se/jobb/"
+CSV_FILENAME = 'bravura_jobs.csv'
+FIELDNAMES = ['title', 'link', 'date_added', 'categories', 'employer']
+JOB_URL_PATTERN = r'https://ledigajobb\.bravura\.se/\w+/jobs/\d+'
+BACKEND = 'html'
+HTML_SELECTORS = {'item': 'a[href*="/jobs/"]'}
+# Markdown links with job titles and URLs
+JOB_PATTERN = re.compile(r'\[#### (.+?)\]\((https://ledigajobb\.bravura\.se/[^)]+)\)')
+# Other link formats on lines that mention bravura.se
+ALT_JOB_PATTERN = re.compile(r'\[([^]]+)\]\((https://[^)]+bravura\.se[^)]+)\)')
+# Every regex the parser runs, for the sandbox fuzzer
+PATTERNS = [JOB_PATTERN, ALT_JOB_PATTERN]
 
 def parse_bravura_jobs(content):
     """Parse Bravura job listings from Jina content"""
     jobs = []
     
-    # Pattern to match Bravura job listings
-    # Looking for markdown links with job titles and URLs
-    job_pattern = r'\[#### (.+?)\]\((https://ledigajobb\.bravura\.se/[^)]+)\)'
-    
-    matches = re.findall(job_pattern, content)
+    matches = JOB_PATTERN.findall(content)
     
     for title, link in matches:
         # Clean the title
@@ -54,8 +49,7 @@ def parse_bravura_jobs(content):
         # Look for job titles that might not be in the main pattern
         if line.startswith('[') and 'bravura.se' in line and line not in [job['title'] for job in jobs]:
             # Try to extract title and link from other formats
-            alt_pattern = r'\[([^]]+)\]\((https://[^)]+bravura\.se[^)]+)\)'
-            alt_matches = re.findall(alt_pattern, line)
+            alt_matches = ALT_JOB_PATTERN.findall(line)
             for alt_title, alt_link in alt_matches:
                 if len(alt_title) > 5 and 'jobb' in alt_title.lower():
                     jobs.append({
@@ -73,11 +67,11 @@ def parse_bravura_jobs(content):
             seen.add(job_key)
             unique_jobs.append(job)
     
-    return unique_jobs
+    return tag_jobs(unique_jobs)
 
 def scrape_bravura_jobs():
     """Main function to scrape Bravura jobs"""
-    url = "https://www.bravura.se/jobb/"
+    url = URL
     
     # Get API key from environment (if available)
     api_key = os.getenv('JINA_API_KEY')
@@ -97,17 +91,12 @@ def scrape_bravura_jobs():
         print(content[:1000])
         return
     
-    # Write to CSV
-    csv_filename = 'bravura_jobs.csv'
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'link', 'date_added']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for job in jobs:
-            writer.writerow(job)
-    
-    print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    # Publish the CSV atomically
+    csv_filename = CSV_FILENAME
+    if publish_csv(csv_filename, FIELDNAMES, jobs):
+        print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    else:
+        print(f"Scraped {len(jobs)} jobs, {csv_filename} unchanged")
     
     # Display first few jobs
     for i, job in enumerate(jobs[:5]):
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Per-source circuit breaker for the scrape runner.
+
+Consecutive failures (fetch errors, Jina error pages, empty parses, output
+rejected by the quality check) open a source's circuit. While it is open
+the runner skips the source and the web app keeps serving its last good CSV.
+After the cool-down one trial run is allowed (half-open): success closes the
+circuit, another failure re-opens it with a doubled cool-down.
+"""
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+STATE_FILE = 'breaker_state.json'
+FAILURE_THRESHOLD = int(os.getenv('BREAKER_FAILURE_THRESHOLD', '3'))
+COOLDOWN = timedelta(hours=float(os.getenv('BREAKER_COOLDOWN_HOURS', '6')))
+MAX_COOLDOWN = timedelta(days=2)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Tracks failures per source and decides which sources may run"""
+
+    def __init__(self, state_file=STATE_FILE, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN):
+        self.state_file = state_file
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        try:
+            with open(state_file, encoding='utf-8') as f:
+                self._sources = json.load(f)
+        except (OSError, ValueError):
+            self._sources = {}
+
+    def _source(self, source):
+        return self._sources.setdefault(source, {
+            'state': CLOSED,
+            'consecutive_failures': 0,
+            'open_until': None,
+            'cooldown_hours': self.cooldown.total_seconds() / 3600,
+            'last_error': None,
+        })
+
+    def allow(self, source, now=None):
+        """Whether the source may run now; moves a cooled-down open circuit to half-open"""
+        now = now or datetime.now()
+        with self._lock:
+            entry = self._source(source)
+            if entry['state'] == OPEN:
+                if now < datetime.fromisoformat(entry['open_until']):
+                    return False
+                entry['state'] = HALF_OPEN
+            return True
+
+    def record_success(self, source):
+        """Close the circuit"""
+        with self._lock:
+            entry = self._source(source)
+            entry.update({
+                'state': CLOSED,
+                'consecutive_failures': 0,
+                'open_until': None,
+                'cooldown_hours': self.cooldown.total_seconds() / 3600,
+            })
+
+    def record_failure(self, source, reason, now=None):
+        """Count a failure; returns True if the circuit is now open"""
+        now = now or datetime.now()
+        with self._lock:
+            entry = self._source(source)
+            entry['consecutive_failures'] += 1
+            entry['last_error'] = reason
+
+            if entry['state'] == HALF_OPEN:
+                # The trial run failed too: back off harder
+                cooldown = min(timedelta(hours=entry['cooldown_hours']) * 2, MAX_COOLDOWN)
+            elif entry['consecutive_failures'] >= self.failure_threshold:
+                cooldown = timedelta(hours=entry['cooldown_hours'])
+            else:
+                return False
+
+            entry.update({
+                'state': OPEN,
+                'open_until': (now + cooldown).isoformat(timespec='seconds'),
+                'cooldown_hours': cooldown.total_seconds() / 3600,
+            })
+            return True
+
+    def status(self, source):
+        """Current breaker entry for a source"""
+        with self._lock:
+            return dict(self._source(source))
+
+    def save(self):
+        """Persist breaker state for the next run"""
+        with self._lock:
+            tmp_file = f'{self.state_file}.tmp'
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self._sources, f, indent=2, sort_keys=True)
+            os.replace(tmp_file, self.state_file)
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Pre-rendered JSON bundles for the web app.
+
+After every run the normalized jobs are rendered into one JSON file per page
+view (daily, weekly, all) and one per source under web_data/bundles/,
+each named by its content hash and written next to .gz and, best-effort,
+.br copies (only when the brotli package is installed), so they can be served
+precompressed with an immutable cache lifetime. web_data/manifest.json, the
+only file that must be revalidated, maps every view and source to its current
+file. The app serves the directory at /data/ from app/data/[...path]/route.ts,
+which reads it on every request (next start does not serve files added to
+public/ after the build); BUNDLE_DIR, an absolute path, moves it for both.
+The pages fetch the manifest and then a single bundle, instead of three CSVs
+they parse and filter on every visit.
+
+Views are cut relative to the build date (weeks start on Sunday, as in the
+pages) and always contain every job the page could show until the next
+run; the pages still apply their exact date filter client-side. Jobs
+without a date are in every view, as before. Dates are shipped as integer
+days since 1970-01-01 (the normalized <date>_day columns), so the pages
+build them without parsing strings.
+
+    python bundles.py                    # rebuild from the published CSVs
+    python bundles.py --output-dir /tmp/data
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BROTLI_AVAILABLE = brotli is not None
+BUNDLE_DIR = os.getenv('BUNDLE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'web_data'))
+MANIFEST_FILE = 'manifest.json'
+HASH_LENGTH = 12
+
+# Sources the pages know how to display (lib/types.ts JobListing.source)
+WEB_SOURCES = ('meritmind', 'poolia', 'arbetsformedlingen')
+
+# JobListing field -> normalized column
+FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'link': 'link',
+    'source': 'source',
+    'employer': 'employer',
+    'email': 'email',
+    'city': 'city',
+    'occupation': 'occupation',
+}
+# BundleJob day field -> normalized column (days since 1970-01-01)
+DAY_FIELDS = {
+    'dateAddedDay': 'date_added_day',
+    'publishedDateDay': 'published_date_day',
+    'applyByDateDay': 'apply_by_date_day',
+}
+
+
+def view_starts(today=None):
+    """First day each page view can show, for a build on today"""
+    today = today or date.today()
+    # Sunday-based week, like Date.getDay() in the pages
+    start_of_week = today - timedelta(days=(today.weekday() + 1) % 7)
+    return {
+        'daily': today - timedelta(days=1),
+        'weekly': start_of_week - timedelta(days=7),
+        'all': None,
+    }
+
+
+def job_records(frame):
+    """Normalized rows -> JobListing-shaped dicts, empty fields left out"""
+    records = []
+    for row in frame[list(FIELDS.values()) + list(DAY_FIELDS.values()) + ['categories']].itertuples(index=False):
+        row = row._asdict()
+        job = {field: row[column] for field, column in FIELDS.items() if isinstance(row[column], str) and row[column]}
+        job.update({field: int(row[column]) for field, column in DAY_FIELDS.items() if not pd.isna(row[column])})
+        job.setdefault('title', 'Job Opening')
+        categories = row['categories'].split('|') if row['categories'] else []
+        job['categories'] = [category for category in categories if category]
+        records.append(job)
+    return records
+
+
+def render(jobs):
+    """Canonical JSON bytes of a bundle"""
+    return json.dumps({'jobs': jobs}, ensure_ascii=False, separators=(',', ':'), sort_keys=True).encode('utf-8')
+
+
+def write_atomic(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(path)}-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_bundle(name, jobs, bundles_dir):
+    """Write one content-hashed bundle and its compressed copies; returns its manifest entry"""
+    data = render(jobs)
+    content_hash = hashlib.sha256(data).hexdigest()
+    filename = f'{name}.{content_hash[:HASH_LENGTH]}.json'
+    path = os.path.join(bundles_dir, filename)
+    entry = {'file': f'bundles/{filename}', 'hash': content_hash, 'rows': len(jobs), 'bytes': len(data)}
+
+    # Same name means same bytes, so an existing bundle is already complete
+    if not os.path.exists(path):
+        # mtime=0 keeps the gzip bytes a function of the content alone
+        write_atomic(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        if BROTLI_AVAILABLE:
+            write_atomic(path + '.br', brotli.compress(data, quality=11))
+        write_atomic(path, data)
+    entry['gzip_bytes'] = os.path.getsize(path + '.gz')
+    if os.path.exists(path + '.br'):
+        entry['brotli_bytes'] = os.path.getsize(path + '.br')
+    return entry
+
+
+def load_manifest(output_dir=BUNDLE_DIR):
+    try:
+        with open(os.path.join(output_dir, MANIFEST_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def referenced_files(manifest):
+    return {os.path.basename(entry['file'])
+            for group in ('views', 'sources') for entry in manifest.get(group, {}).values()}
+
+
+def publish_bundles(output_dir=BUNDLE_DIR, today=None):
+    """Render every view and source bundle and swap in the new manifest; returns the manifest"""
+    from normalize import load_normalized
+
+    bundles_dir = os.path.join(output_dir, 'bundles')
+    os.makedirs(bundles_dir, exist_ok=True)
+    frame = load_normalized()
+    frame = frame.sort_values('date_added', ascending=False, na_position='first', kind='stable')
+
+    web = frame[frame['source'].isin(WEB_SOURCES)]
+    views = {}
+    for view, start in view_starts(today).items():
+        rows = web if start is None else web[web['date_added'].isna() | (web['date_added'] >= pd.Timestamp(start))]
+        views[view] = write_bundle(view, job_records(rows), bundles_dir)
+    sources = {source: write_bundle(f'source-{source}', job_records(rows), bundles_dir)
+               for source, rows in frame.groupby('source', sort=True)}
+
+    previous = load_manifest(output_dir)
+    manifest = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'views': views,
+        'sources': sources,
+    }
+    # An unchanged manifest keeps its bytes, and so its ETag
+    if (previous.get('views'), previous.get('sources')) != (views, sources):
+        write_atomic(os.path.join(output_dir, MANIFEST_FILE),
+                     json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    else:
+        manifest = previous
+
+    # Keep the previous generation for clients that loaded the old manifest moments ago
+    keep = referenced_files(manifest) | referenced_files(previous)
+    for filename in os.listdir(bundles_dir):
+        if filename.split('.json')[0] + '.json' not in keep:
+            os.unlink(os.path.join(bundles_dir, filename))
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render the web app's JSON bundles")
+    parser.add_argument('--output-dir', default=BUNDLE_DIR, help="directory for manifest.json and bundles/")
+    args = parser.parse_args()
+
+    manifest = publish_bundles(args.output_dir)
+    for group in ('views', 'sources'):
+        for name, entry in manifest[group].items():
+            br = f", {entry['brotli_bytes']} br" if 'brotli_bytes' in entry else ''
+            print(f"{name:<20} {entry['rows']:>6} jobs  {entry['bytes']:>8} bytes, {entry['gzip_bytes']} gz{br}  {entry['file']}")
+    if not BROTLI_AVAILABLE:
+        print("brotli is not installed, only gzip copies were written")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Shared keyword classifier for scraped lines and job titles.
+
+All role keywords, skip keywords and role-category keywords of a classifier
+are compiled into one regex, so a line is labeled in a single scan instead of
+one substring search per keyword. The pattern is a lookahead around a
+longest-first alternation, which reports a match at every start position
+(overlapping matches included, like an Aho-Corasick automaton) and runs in
+the C regex engine.
+"""
+import csv
+import os
+import re
+import sys
+from collections import namedtuple
+
+from employers import PATTERNS as EMPLOYER_PATTERNS, extract_employer
+from publisher import MANIFEST_FILE, publish_csv
+
+# Role categories attached to every job. Keywords are matched as lowercase
+# substrings, the same way the scrapers have always matched them.
+ROLE_CATEGORIES = {
+    'legal': ['jurist', 'advokat', 'legal', 'paralegal', 'juridi', 'rättslig', 'counsel', 'notarie'],
+    'finance': ['ekonom', 'controller', 'redovis', 'löne', 'lön ', 'finans', 'financial', 'accountant',
+                'revisor', 'revision', 'bokför', 'payroll', 'kredit'],
+    'it': ['utvecklare', 'developer', 'programmer', 'it-', ' it ', 'devops', 'infrastruktur', 'moln',
+           'cloud', 'system', 'data', 'application', 'applikation', 'support'],
+    'engineering': ['ingenjör', 'engineer', 'konstruktör', 'tekniker', 'technician', 'elektriker'],
+    'management': ['manager', 'chef', 'ledare', 'head of', 'director', 'direktör', 'vd '],
+    'consulting': ['konsult', 'consultant', 'rådgivare', 'advisor'],
+    'sales': ['säljare', 'sales', 'account', 'försäljning', 'marknad', 'marketing', 'kundansvarig'],
+    'hr': ['hr ', 'hr-', 'rekryter', 'recruit', 'personal', 'talent'],
+    'administration': ['koordinator', 'samordnare', 'coordinator', 'assistent', 'assistant', 'administrat',
+                       'handläggare', 'sekreterare', 'receptionist', 'kundtjänst', 'kundservice'],
+    'analytics': ['analyst', 'analytiker', 'analys'],
+    'design': ['designer', 'design'],
+    'logistics': ['lager', 'logistik', 'logistic', 'inköp', 'purchas', 'supply chain', 'transport'],
+    'healthcare': ['sjuksköterska', 'vård', 'omsorg', 'läkare', 'undersköterska'],
+}
+
+Label = namedtuple('Label', ['role', 'skip', 'categories'])
+
+ROLE = 'role'
+SKIP = 'skip'
+
+
+class KeywordClassifier:
+    """Label text as role line / skip line and tag it with role categories in one scan"""
+
+    def __init__(self, role_keywords=(), skip_keywords=(), categories=ROLE_CATEGORIES):
+        tags = {}
+        for keyword in role_keywords:
+            tags.setdefault(keyword.lower(), set()).add(ROLE)
+        for keyword in skip_keywords:
+            tags.setdefault(keyword.lower(), set()).add(SKIP)
+        for category, keywords in categories.items():
+            for keyword in keywords:
+                tags.setdefault(keyword.lower(), set()).add(category)
+
+        # Only the longest keyword starting at a position is reported, so each
+        # keyword also carries the tags of every keyword that is its prefix.
+        self._tags = {
+            keyword: frozenset().union(*(tags[other] for other in tags if keyword.startswith(other)))
+            for keyword in tags
+        }
+        alternation = '|'.join(re.escape(k) for k in sorted(tags, key=len, reverse=True))
+        self._pattern = re.compile(f'(?=({alternation}))') if tags else None
+
+    @property
+    def pattern(self):
+        """The compiled keyword regex (None without keywords)"""
+        return self._pattern
+
+    def tags(self, text):
+        """Return the set of tags for all keywords occurring in the text"""
+        found = set()
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(f' {text.lower()} '):
+            found |= self._tags[match.group(1)]
+        return found
+
+    def label(self, text):
+        """Label text in a single scan"""
+        found = self.tags(text)
+        categories = sorted(found - {ROLE, SKIP})
+        return Label(ROLE in found, SKIP in found, categories)
+
+    def categories(self, text):
+        """Role categories for a job title"""
+        return self.label(text).categories
+
+
+_category_classifier = KeywordClassifier()
+
+# Every regex tag_jobs runs, for the sandbox fuzzer
+PATTERNS = [_category_classifier.pattern, *EMPLOYER_PATTERNS]
+
+
+def categorize(title):
+    """Role categories for a job title, as a '|'-separated string for CSV output"""
+    return '|'.join(_category_classifier.categories(title))
+
+
+def tag_jobs(jobs, title_field='title'):
+    """Attach role-category tags and the employer named in the title to each parsed job"""
+    for job in jobs:
+        title = job.get(title_field, '')
+        job['categories'] = categorize(title)
+        # Parsers that find the employer elsewhere on the page set it themselves
+        job['employer'] = job.get('employer') or extract_employer(title)
+    return jobs
+
+
+def categorize_csv(csv_file, title_field='title'):
+    """Add or refresh the categories and employer columns of an existing jobs CSV"""
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fieldnames = list(reader.fieldnames or [])
+        jobs = tag_jobs(list(reader), title_field)
+
+    for field in ('categories', 'employer'):
+        if field not in fieldnames:
+            fieldnames.append(field)
+
+    # Through the publisher, so the web app never reads a half-written file or a stale ETag
+    manifest_file = os.path.join(os.path.dirname(os.path.abspath(csv_file)), MANIFEST_FILE)
+    publish_csv(csv_file, fieldnames, jobs, manifest_file)
+    return len(jobs)
+
+
+if __name__ == "__main__":
+    # Categorize historical CSVs: python classifier.py *_jobs.csv
+    for csv_file in sys.argv[1:]:
+        title_field = 'occupation' if csv_file.startswith('arbetsformedlingen') else 'title'
+        print(f"Categorized {categorize_csv(csv_file, title_field)} jobs in {csv_file}")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Email digests for saved subscriptions, run after the scrapers.
+
+The Email Configuration page only files requests (subscription_requests.json);
+each run mails every new request its own confirmation link, and the app
+moves the address into subscriptions.json (or out of it) once the owner
+opens it. Subscribers are grouped by (frequency, sources, keywords), so each
+distinct digest is rendered once and sent in Bcc batches over a single SMTP
+connection. Each group only gets jobs it has not been sent
+before; groups with keywords only get jobs matching their saved search,
+matched for all groups at once through matcher.SavedSearchIndex. A group seen
+for the first time is seeded with the current jobs instead of being sent the
+whole backlog, and the state is saved after every group so a failed send
+doesn't repeat the groups already sent.
+
+Try it against a local debugging server:
+
+    python -m aiosmtpd -n -l localhost:1025
+    SMTP_PORT=1025 python digest.py --force
+"""
+import argparse
+import csv
+import json
+import os
+import smtplib
+from collections import defaultdict
+from datetime import datetime, timedelta
+from email.message import EmailMessage
+from html import escape
+from urllib.parse import urlencode
+
+from matcher import SavedSearchIndex, normalize_query
+
+SUBSCRIPTIONS_FILE = 'subscriptions.json'
+REQUESTS_FILE = 'subscription_requests.json'
+STATE_FILE = 'digest_state.json'
+# Tokens of requests whose confirmation link was already mailed
+CONFIRMATIONS_FILE = 'confirmations_sent.json'
+BATCH_SIZE = 50
+
+SMTP_HOST = os.getenv('SMTP_HOST', 'localhost')
+SMTP_PORT = int(os.getenv('SMTP_PORT', '25'))
+SMTP_USER = os.getenv('SMTP_USER')
+SMTP_PASSWORD = os.getenv('SMTP_PASSWORD')
+SMTP_STARTTLS = os.getenv('SMTP_STARTTLS') == '1'
+DIGEST_FROM = os.getenv('DIGEST_FROM', 'jobs@jurek.se')
+# Where the web app runs, for confirmation and settings links
+APP_URL = os.getenv('APP_URL', 'http://localhost:3000').rstrip('/')
+
+INTERVALS = {
+    'daily': timedelta(days=1),
+    'weekly': timedelta(days=7),
+}
+
+SOURCE_LABELS = {
+    'meritmind': 'Meritmind',
+    'poolia': 'Poolia',
+    'arbetsformedlingen': 'Arbetsförmedlingen',
+}
+
+
+def load_json(path, default):
+    """Load a JSON file, or the default if it doesn't exist yet"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def save_json(path, data):
+    """Write JSON atomically"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def load_source_jobs(source):
+    """Load one source's jobs as title/link/city/occupation rows, whatever its CSV layout"""
+    csv_file = f'{source}_jobs.csv'
+    if not os.path.exists(csv_file):
+        return []
+    jobs = []
+    with open(csv_file, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            link = row.get('link') or row.get('job_url')
+            if not link and row.get('id'):
+                link = f"https://arbetsformedlingen.se/platsbanken/annonser/{row['id']}"
+            title = row.get('title') or row.get('occupation') or 'Job Opening'
+            if link:
+                jobs.append({
+                    'title': title,
+                    'link': link,
+                    'source': source,
+                    'city': row.get('city', ''),
+                    'occupation': row.get('occupation', ''),
+                })
+    return jobs
+
+
+def group_subscribers(subscriptions):
+    """Group recipient emails by (frequency, sources, keywords)"""
+    groups = defaultdict(set)
+    for subscription in subscriptions:
+        frequency = subscription.get('frequency', 'daily')
+        sources = tuple(sorted(set(subscription.get('sources', []))))
+        keywords = normalize_query(subscription.get('keywords', ''))
+        if not sources:
+            continue
+        for email in subscription.get('emails', []):
+            groups[(frequency, sources, keywords)].add(email.strip().lower())
+    return groups
+
+
+def group_id(frequency, sources, keywords=''):
+    """Stable key for a group in the digest state"""
+    key = f"{frequency}:{','.join(sources)}"
+    return f"{key}:{keywords}" if keywords else key
+
+
+def is_due(group_state, frequency, now):
+    """Whether the group's interval has passed since its last send"""
+    last_sent = group_state.get('last_sent')
+    if not last_sent:
+        return True
+    return now - datetime.fromisoformat(last_sent) >= INTERVALS.get(frequency, INTERVALS['daily'])
+
+
+def render_digest(frequency, sources, jobs, keywords=''):
+    """Render the digest body once for a group; returns (subject, text, html)"""
+    label = 'Daily' if frequency == 'daily' else 'Weekly'
+    subject = f"{label} job digest: {len(jobs)} new job{'s' if len(jobs) != 1 else ''}"
+    if keywords:
+        subject += f" matching \"{keywords}\""
+
+    by_source = defaultdict(list)
+    for job in jobs:
+        by_source[job['source']].append(job)
+
+    text_parts = [subject, '']
+    html_parts = [f"<h2>{escape(subject)}</h2>"]
+    settings_url = f"{APP_URL}/email-config"
+    for source in sources:
+        if not by_source[source]:
+            continue
+        name = SOURCE_LABELS.get(source, source.capitalize())
+        text_parts.append(f"{name} ({len(by_source[source])})")
+        html_parts.append(f"<h3>{escape(name)} ({len(by_source[source])})</h3><ul>")
+        for job in by_source[source]:
+            text_parts.append(f"- {job['title']}: {job['link']}")
+            html_parts.append(f"<li><a href=\"{escape(job['link'])}\">{escape(job['title'])}</a></li>")
+        text_parts.append('')
+        html_parts.append("</ul>")
+
+    # Bcc batches share one body, so changes go through the page and a per-address confirmation
+    text_parts.append(f"Change or cancel your digest: {settings_url}")
+    html_parts.append(f"<p><a href=\"{escape(settings_url)}\">Change or cancel your digest</a></p>")
+    return subject, '\n'.join(text_parts), '\n'.join(html_parts)
+
+
+def build_messages(subject, text, html, recipients, batch_size=BATCH_SIZE):
+    """One message per batch of Bcc recipients, all sharing the rendered body"""
+    recipients = sorted(recipients)
+    for i in range(0, len(recipients), batch_size):
+        message = EmailMessage()
+        message['Subject'] = subject
+        message['From'] = DIGEST_FROM
+        message['To'] = DIGEST_FROM
+        message['Bcc'] = ', '.join(recipients[i:i + batch_size])
+        message.set_content(text)
+        message.add_alternative(html, subtype='html')
+        yield message
+
+
+def confirmation_message(email, request):
+    """The one-address message carrying a request's confirmation link"""
+    link = f"{APP_URL}/api/email-config/confirm?{urlencode({'email': email, 'token': request['token']})}"
+    if request.get('action') == 'unsubscribe':
+        subject = "Confirm that you want to stop job digests"
+        text = f"Someone asked to stop the job digests sent to {email}. To unsubscribe, open:\n{link}"
+    else:
+        sources = ', '.join(SOURCE_LABELS.get(source, source) for source in request.get('sources', []))
+        subject = "Confirm your job digest subscription"
+        text = (f"Someone asked to send {request.get('frequency', 'daily')} job digests from {sources} to {email}. "
+                f"To confirm, open:\n{link}")
+    text += "\n\nIf this wasn't you, ignore this message and nothing changes."
+
+    message = EmailMessage()
+    message['Subject'] = subject
+    message['From'] = DIGEST_FROM
+    message['To'] = email
+    message.set_content(text)
+    return message
+
+
+def pending_confirmations(requests, mailed):
+    """(email, request) of every request whose link has not been mailed yet"""
+    return [(email, request) for email, request in sorted(requests.items()) if request.get('token') not in mailed]
+
+
+def open_smtp():
+    """Open the single pooled SMTP connection used for the whole run"""
+    smtp = smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=30)
+    if SMTP_STARTTLS:
+        smtp.starttls()
+    if SMTP_USER:
+        smtp.login(SMTP_USER, SMTP_PASSWORD or '')
+    return smtp
+
+
+def plan_digests(subscriptions, state, now, force=False):
+    """
+    Work out which digests to send.
+
+    Returns a list of (key, frequency, sources, keywords, recipients, new_jobs, current_links).
+    """
+    due = {}
+    for (frequency, sources, keywords), recipients in group_subscribers(subscriptions).items():
+        key = group_id(frequency, sources, keywords)
+        if force or is_due(state.get(key, {}), frequency, now):
+            due[key] = (frequency, sources, keywords, recipients)
+
+    jobs_by_source = {}
+    for frequency, sources, keywords, recipients in due.values():
+        for source in sources:
+            if source not in jobs_by_source:
+                jobs_by_source[source] = load_source_jobs(source)
+
+    # Every job is looked up once against all groups' saved searches
+    index = SavedSearchIndex()
+    for key, (frequency, sources, keywords, recipients) in due.items():
+        index.add(key, keywords)
+    matches = {}
+    if len(index):
+        for jobs in jobs_by_source.values():
+            matches.update(index.match_jobs(jobs))
+
+    planned = []
+    for key, (frequency, sources, keywords, recipients) in due.items():
+        current = [job for source in sources for job in jobs_by_source[source]]
+        if keywords:
+            current = [job for job in current if key in matches.get(job['link'], ())]
+
+        sent = set(state.get(key, {}).get('sent_links', []))
+        new_jobs = [job for job in current if job['link'] not in sent]
+        planned.append((key, frequency, sources, keywords, recipients, new_jobs, [job['link'] for job in current]))
+    return planned
+
+
+def send_digests(dry_run=False, force=False):
+    """Mail new confirmation links, then render and send all due digests; returns the number of messages sent"""
+    subscriptions = load_json(SUBSCRIPTIONS_FILE, [])
+    requests = load_json(REQUESTS_FILE, {})
+    mailed = set(load_json(CONFIRMATIONS_FILE, []))
+    state = load_json(STATE_FILE, {})
+    now = datetime.now()
+
+    confirmations = pending_confirmations(requests, mailed)
+    planned = plan_digests(subscriptions, state, now, force)
+    if not planned and not confirmations:
+        print("No digests due")
+        return 0
+
+    sent_messages = 0
+    smtp = None
+    try:
+        for email, request in confirmations:
+            message = confirmation_message(email, request)
+            if dry_run:
+                print(f"[dry run] {message['Subject']} → {email}")
+            else:
+                if smtp is None:
+                    smtp = open_smtp()
+                smtp.send_message(message)
+                mailed.add(request['token'])
+                # Only tokens still pending are kept, so the file stays small
+                save_json(CONFIRMATIONS_FILE, sorted(mailed & {r.get('token') for r in requests.values()}))
+            sent_messages += 1
+        if confirmations:
+            print(f"Mailed {len(confirmations)} confirmation links")
+
+        for key, frequency, sources, keywords, recipients, new_jobs, current_links in planned:
+            if key not in state and not force:
+                # First run for this group: remember what's there now, send only what comes later
+                state[key] = {'last_sent': now.isoformat(timespec='seconds'), 'sent_links': current_links}
+                if not dry_run:
+                    save_json(STATE_FILE, state)
+                print(f"{key}: seeded with {len(current_links)} current jobs for {len(recipients)} subscribers")
+                continue
+            if not new_jobs:
+                print(f"{key}: no new jobs for {len(recipients)} subscribers")
+                continue
+
+            subject, text, html = render_digest(frequency, sources, new_jobs, keywords)
+            for message in build_messages(subject, text, html, recipients):
+                if dry_run:
+                    print(f"[dry run] {subject} → {message['Bcc']}")
+                else:
+                    if smtp is None:
+                        smtp = open_smtp()
+                    smtp.send_message(message)
+                sent_messages += 1
+
+            # Only remember links still present, so the state stays as small as the job data
+            state[key] = {'last_sent': now.isoformat(timespec='seconds'), 'sent_links': current_links}
+            if not dry_run:
+                save_json(STATE_FILE, state)
+            print(f"{key}: {len(new_jobs)} new jobs sent to {len(recipients)} subscribers")
+    except (OSError, smtplib.SMTPException) as e:
+        print(f"❌ Digest sending failed after {sent_messages} messages: {type(e).__name__}: {e}")
+    finally:
+        if smtp is not None:
+            try:
+                smtp.quit()
+            except (OSError, smtplib.SMTPException):
+                pass
+
+    return sent_messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Send job digests to saved subscriptions")
+    parser.add_argument('--dry-run', action='store_true', help="render digests without sending")
+    parser.add_argument('--force', action='store_true', help="send even if a group is not due yet")
+    args = parser.parse_args()
+
+    sent = send_digests(dry_run=args.dry_run, force=args.force)
+    print(f"Sent {sent} digest messages")
+
+
+if __name__ == "__main__":
+    main()
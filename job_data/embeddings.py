@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Optional semantic title index for similar-job search and cross-language dedupe.
+
+Job titles are embedded in batches with a small multilingual CPU model
+(sentence-transformers), so "Bolagsjurist" lands next to "Legal Counsel".
+Embeddings are cached by title hash in title_embeddings.npz and every
+distinct title is embedded only once. Queries go through an hnswlib
+approximate-nearest-neighbour index when hnswlib is installed, otherwise
+through a brute-force NumPy dot product over the normalized vectors (a few
+milliseconds at this archive's size). The hnswlib index is saved to
+title_index.bin and only rebuilt when the set or order of titles changed.
+
+    python embeddings.py update                       # run_all_scrapers.py --embed does this too
+    python embeddings.py similar "Legal Counsel" -k 5
+    python embeddings.py duplicates --threshold 0.9
+"""
+import argparse
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+try:
+    from sentence_transformers import SentenceTransformer
+except ImportError:
+    SentenceTransformer = None
+
+try:
+    import hnswlib
+except ImportError:
+    hnswlib = None
+
+AVAILABLE = SentenceTransformer is not None
+MODEL_NAME = os.getenv('EMBEDDING_MODEL', 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2')
+CACHE_FILE = 'title_embeddings.npz'
+INDEX_FILE = 'title_index.bin'
+BATCH_SIZE = 64
+NEIGHBOURS = 10
+DUPLICATE_THRESHOLD = 0.9
+
+_model = None
+
+
+def title_key(title):
+    """Cache key of a title: case and whitespace do not change the embedding"""
+    return hashlib.sha1(' '.join(title.lower().split()).encode('utf-8')).hexdigest()[:16]
+
+
+def load_model():
+    """The embedding model, loaded once"""
+    global _model
+    if not AVAILABLE:
+        raise ImportError("Title embeddings need sentence-transformers installed")
+    if _model is None:
+        _model = SentenceTransformer(MODEL_NAME, device='cpu')
+    return _model
+
+
+def load_cache(cache_file=CACHE_FILE):
+    """Cached embeddings as {title key: vector}, empty if made by another model"""
+    try:
+        data = np.load(cache_file, allow_pickle=False)
+    except (OSError, ValueError):
+        return {}
+    if str(data['model']) != MODEL_NAME:
+        return {}
+    return dict(zip(data['keys'].tolist(), data['vectors']))
+
+
+def save_cache(cache, cache_file=CACHE_FILE):
+    """Write the cache atomically"""
+    directory = os.path.dirname(os.path.abspath(cache_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.embeddings-', suffix='.npz')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, model=np.array(MODEL_NAME), keys=np.array(list(cache)),
+                     vectors=np.array(list(cache.values()), dtype=np.float32))
+        os.replace(tmp_path, cache_file)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def embed_titles(titles, cache):
+    """Unit vectors for titles, embedding only those missing from the cache (which is updated)"""
+    keys = [title_key(title) for title in titles]
+    missing = {}
+    for key, title in zip(keys, titles):
+        if key not in cache:
+            missing.setdefault(key, title)
+    if missing:
+        vectors = load_model().encode(list(missing.values()), batch_size=BATCH_SIZE, convert_to_numpy=True,
+                                      normalize_embeddings=True, show_progress_bar=False)
+        cache.update(zip(missing, vectors.astype(np.float32)))
+    return np.stack([cache[key] for key in keys]) if keys else np.empty((0, 0), dtype=np.float32)
+
+
+def index_signature(keys):
+    """Identifies the rows of an index: the model and every title key in row order"""
+    digest = hashlib.sha1(MODEL_NAME.encode('utf-8'))
+    for key in keys:
+        digest.update(key.encode('ascii'))
+    return digest.hexdigest()
+
+
+class TitleIndex:
+    """Nearest-neighbour search over job title embeddings (cosine similarity)"""
+
+    def __init__(self, vectors, hnsw=None):
+        self.vectors = vectors
+        self._hnsw = hnsw
+        if hnsw is None and hnswlib is not None and len(vectors):
+            self._hnsw = hnswlib.Index(space='ip', dim=vectors.shape[1])
+            self._hnsw.init_index(max_elements=len(vectors), ef_construction=200, M=16)
+            self._hnsw.add_items(vectors, np.arange(len(vectors)))
+        if self._hnsw is not None:
+            self._hnsw.set_ef(max(64, NEIGHBOURS * 2))
+
+    @classmethod
+    def cached(cls, vectors, keys, index_file=INDEX_FILE):
+        """Load the saved hnswlib index if it was built for these rows, else build and save it"""
+        if hnswlib is None or not len(vectors):
+            return cls(vectors)
+        signature = index_signature(keys)
+        signature_file = f'{index_file}.sha1'
+        try:
+            with open(signature_file, encoding='ascii') as f:
+                saved_signature = f.read().strip()
+        except OSError:
+            saved_signature = None
+        if saved_signature == signature and os.path.exists(index_file):
+            hnsw = hnswlib.Index(space='ip', dim=vectors.shape[1])
+            hnsw.load_index(index_file, max_elements=len(vectors))
+            return cls(vectors, hnsw)
+
+        index = cls(vectors)
+        directory = os.path.dirname(os.path.abspath(index_file))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.title-index-', suffix='.bin')
+        os.close(fd)
+        try:
+            index._hnsw.save_index(tmp_path)
+            os.replace(tmp_path, index_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        # Written last, so a crash in between leaves a stale signature and forces a rebuild
+        with open(signature_file, 'w', encoding='ascii') as f:
+            f.write(signature)
+        return index
+
+    def query(self, queries, k=NEIGHBOURS):
+        """(indices, similarities) of the k nearest rows for each query vector"""
+        k = min(k, len(self.vectors))
+        if self._hnsw is not None:
+            labels, distances = self._hnsw.knn_query(queries, k=k)
+            return labels, 1.0 - distances
+        similarities = queries @ self.vectors.T
+        top = np.argpartition(-similarities, k - 1, axis=1)[:, :k]
+        top_similarities = np.take_along_axis(similarities, top, axis=1)
+        order = np.argsort(-top_similarities, axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_similarities, order, axis=1)
+
+
+def _load_jobs_and_vectors(cache_file):
+    """(jobs frame, vectors, new embeddings) for every normalized job with a title"""
+    from normalize import load_normalized
+
+    jobs = load_normalized()[['id', 'source', 'title', 'link']]
+    jobs = jobs[jobs['title'] != ''].reset_index(drop=True)
+    cache = load_cache(cache_file)
+    size = len(cache)
+    vectors = embed_titles(jobs['title'].tolist(), cache)
+    if len(cache) != size:
+        save_cache(cache, cache_file)
+    return jobs, vectors, len(cache) - size
+
+
+def load_index(cache_file=CACHE_FILE, index_file=INDEX_FILE):
+    """(jobs frame, TitleIndex) over every normalized job, embedding new titles as needed"""
+    jobs, vectors, _ = _load_jobs_and_vectors(cache_file)
+    keys = [title_key(title) for title in jobs['title']]
+    return jobs, TitleIndex.cached(vectors, keys, index_file)
+
+
+def update_embeddings(cache_file=CACHE_FILE, index_file=INDEX_FILE):
+    """Pipeline stage: embed titles not seen before and refresh the saved index; returns the number embedded"""
+    jobs, vectors, new = _load_jobs_and_vectors(cache_file)
+    TitleIndex.cached(vectors, [title_key(title) for title in jobs['title']], index_file)
+    print(f"Title embeddings: {new} new, {len(jobs)} titles indexed")
+    return new
+
+
+def similar(text, k=NEIGHBOURS, cache_file=CACHE_FILE):
+    """Jobs whose titles are closest in meaning to text, as a list of dicts with a similarity"""
+    jobs, index = load_index(cache_file)
+    if jobs.empty:
+        return []
+    indices, similarities = index.query(embed_titles([text], {}), k)
+    return [dict(jobs.iloc[i], similarity=float(s)) for i, s in zip(indices[0], similarities[0])]
+
+
+def near_duplicates(threshold=DUPLICATE_THRESHOLD, cache_file=CACHE_FILE):
+    """Pairs of jobs from different sources whose titles mean the same, most similar first"""
+    jobs, index = load_index(cache_file)
+    if jobs.empty:
+        return []
+    indices, similarities = index.query(index.vectors, NEIGHBOURS)
+    sources = jobs['source'].to_numpy()
+    pairs = {}
+    for i, (neighbours, scores) in enumerate(zip(indices, similarities)):
+        for j, score in zip(neighbours, scores):
+            if j != i and score >= threshold and sources[i] != sources[j]:
+                pairs[(min(i, j), max(i, j))] = float(score)
+    return [(dict(jobs.iloc[i]), dict(jobs.iloc[j]), score)
+            for (i, j), score in sorted(pairs.items(), key=lambda item: -item[1])]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Semantic job title index")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('update', help="embed titles not cached yet")
+    similar_parser = subparsers.add_parser('similar', help="jobs with similar titles")
+    similar_parser.add_argument('text')
+    similar_parser.add_argument('-k', type=int, default=NEIGHBOURS)
+    duplicates_parser = subparsers.add_parser('duplicates', help="same role listed by different sources")
+    duplicates_parser.add_argument('--threshold', type=float, default=DUPLICATE_THRESHOLD)
+    args = parser.parse_args()
+
+    if not AVAILABLE:
+        raise SystemExit("Title embeddings need sentence-transformers installed")
+
+    if args.command == 'update':
+        update_embeddings()
+    elif args.command == 'similar':
+        for job in similar(args.text, args.k):
+            print(f"{job['similarity']:.3f}  {job['source']:<18} {job['title']}  {job['link']}")
+    elif args.command == 'duplicates':
+        pairs = near_duplicates(args.threshold)
+        for a, b, score in pairs:
+            print(f"{score:.3f}  {a['source']}: {a['title']}  <->  {b['source']}: {b['title']}")
+        print(f"{len(pairs)} cross-source near-duplicates")
+
+
+if __name__ == "__main__":
+    main()
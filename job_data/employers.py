@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Employer extraction and company-name normalization.
+
+Recruiter boards name the hiring company in the title ("Platschef till
+Takab", "Legal Counsel hos Vattenfall i Göteborg", "Engineer at Volvo Cars"),
+though "till"/"to" just as often name a place ("Ekonomer sökes till Uppsala")
+or a step ("Path to Partner"); those are not taken as employers.
+Juridikjobb shows the firm's logo with its name as alt text next to each
+listing. tag_jobs calls extract_employer while a page is parsed, and
+juridikjobb_scraper fills in the logo names itself. The lifecycle table keys
+every posting by company_key, which makes "all open roles at X across all
+boards" one indexed lookup:
+
+    python lifecycle.py employer "Advokatbyrån Gulliksson"
+    python lifecycle.py employers
+    python employers.py "Application Manager till Hydroscand"
+"""
+import re
+import sys
+import unicodedata
+
+from queries import CITIES
+
+# "<role> till/hos/at/to <Company>[ i <Place>]", taking the last connector in the title
+EMPLOYER_PATTERN = re.compile(r'^.*\s(?:till|hos|at|to)\s+(?P<employer>[A-ZÅÄÖ0-9][^,|()]*?)'
+                              r'(?:\s+i\s+[A-ZÅÄÖ][^,|()]*)?\s*(?:[,|(].*)?$')
+
+# Lowercase words that may appear inside a company name
+NAME_CONNECTORS = {'&', 'och', 'and', 'of', 'de', 'la', 'von', 'van'}
+
+# Capitalized words after a connector that name no company ("Path to Partner")
+NOT_COMPANIES = {'partner', 'partners', 'manager', 'senior', 'team', 'sverige', 'sweden', 'norden'}
+
+# Dropped from the comparison key only: "Takab AB" and "TAKAB" are one company
+LEGAL_SUFFIXES = {'ab', 'publ', 'aktiebolag', 'kb', 'hb', 'as', 'asa', 'oy', 'oyj', 'aps',
+                  'ltd', 'limited', 'inc', 'llc', 'gmbh', 'plc', 'sverige', 'sweden'}
+
+# Longer "titles" are page text a parser picked up; the pattern is not run on them
+MAX_TITLE_LENGTH = 200
+
+# Juridikjobb company logos: ![Image 27: Advokatbyrån Gulliksson AB](...%2Fcompany%2F...)
+LOGO_PATTERN = re.compile(r'!\[Image \d+: ([^\]]+)\]\([^)\s]*(?:/|%2F)company(?:/|%2F)[^)\s]*\)')
+
+# Every regex run while a page is parsed, for the sandbox fuzzer
+PATTERNS = [EMPLOYER_PATTERN, LOGO_PATTERN]
+
+
+def clean_employer(name):
+    """Display form of a company name: single spaces, no trailing punctuation"""
+    return ' '.join(name.split()).strip(' -–.,:;!?')
+
+
+def extract_employer(title):
+    """Hiring company named in a job title, or '' when the title names none"""
+    title = ' '.join(title.split())
+    match = EMPLOYER_PATTERN.match(title) if len(title) <= MAX_TITLE_LENGTH else None
+    if not match:
+        return ''
+    employer = clean_employer(match.group('employer'))
+    # "till ledande logistikföretag", "till Life Science bolag": a description, not a name
+    words = employer.split()
+    if any(word[0].islower() and word not in NAME_CONNECTORS for word in words):
+        return ''
+    # "sökes till Uppsala": a place
+    key = company_key(employer)
+    if key in CITIES or key in NOT_COMPANIES:
+        return ''
+    return employer
+
+
+def company_key(name):
+    """Comparison key of a company name: case, accents, punctuation and legal form ignored"""
+    folded = unicodedata.normalize('NFKD', name.casefold())
+    folded = ''.join(ch for ch in folded if not unicodedata.combining(ch))
+    words = re.findall(r'[\w&]+', folded)
+    return ' '.join([word for word in words if word not in LEGAL_SUFFIXES] or words)
+
+
+def logo_employers(content):
+    """(offset, company name) of every company logo on a Juridikjobb page"""
+    return [(match.start(), clean_employer(match.group(1))) for match in LOGO_PATTERN.finditer(content)]
+
+
+if __name__ == "__main__":
+    for title in sys.argv[1:]:
+        employer = extract_employer(title)
+        print(f"{title!r}: {employer or '-'} ({company_key(employer) if employer else '-'})")
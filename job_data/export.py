@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Streaming export of the job archive as CSV, NDJSON or Parquet.
+
+Every source CSV is read in fixed-size chunks, mapped onto the normalized
+schema of normalize.py, filtered and written out chunk by chunk, so memory stays constant
+however large the archive gets. Backs the /api/export route. Parquet needs
+the optional pyarrow package (commented in requirements.txt).
+
+    python export.py --format ndjson --source poolia --since 2025-06-01 > jobs.ndjson
+    python export.py --format parquet --output jobs.parquet
+"""
+import argparse
+import sys
+
+import pandas as pd
+
+from normalize import normalize_frame, source_files
+
+CHUNK_SIZE = 10_000
+FORMATS = ('csv', 'ndjson', 'parquet')
+
+COLUMNS = ['source', 'title', 'link', 'employer', 'date_added', 'published_date', 'apply_by_date',
+           'city', 'occupation', 'categories']
+
+
+def export_columns(normalized):
+    """Export view of a normalized chunk: dates as ISO strings"""
+    return pd.DataFrame({
+        column: normalized[f'{column}_iso'] if f'{column}_iso' in normalized else normalized[column]
+        for column in COLUMNS
+    }, columns=COLUMNS)
+
+
+def iter_chunks(sources=None, since=None, until=None, chunk_size=CHUNK_SIZE):
+    """Yield normalized, filtered chunks of the whole archive"""
+    since = pd.Timestamp(since) if since else None
+    until = pd.Timestamp(until) if until else None
+    for source, path in source_files(sources).items():
+        for chunk in pd.read_csv(path, dtype=str, chunksize=chunk_size):
+            chunk = normalize_frame(chunk, source)
+            # Comparisons with NaT are False, so undated rows pass only without date filters
+            if since is not None:
+                chunk = chunk[chunk['date_added'] >= since]
+            if until is not None:
+                chunk = chunk[chunk['date_added'] <= until]
+            if not chunk.empty:
+                yield export_columns(chunk)
+
+
+def write_csv(chunks, out):
+    header = True
+    for chunk in chunks:
+        chunk.to_csv(out, header=header, index=False)
+        header = False
+    if header:
+        out.write(','.join(COLUMNS) + '\n')
+
+
+def write_ndjson(chunks, out):
+    for chunk in chunks:
+        # Older pandas leaves off the final newline, newer pandas adds it; write exactly one
+        out.write(chunk.to_json(orient='records', lines=True, force_ascii=False).rstrip('\n') + '\n')
+
+
+def write_parquet(chunks, out):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet export needs pyarrow installed")
+
+    schema = pa.schema([(column, pa.string()) for column in COLUMNS])
+    with pq.ParquetWriter(out, schema) as writer:
+        for chunk in chunks:
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+
+def export(fmt, out, sources=None, since=None, until=None, chunk_size=CHUNK_SIZE):
+    """Stream the archive in the given format to a text stream (csv/ndjson) or binary stream (parquet)"""
+    chunks = iter_chunks(sources, since, until, chunk_size)
+    if fmt == 'csv':
+        write_csv(chunks, out)
+    elif fmt == 'ndjson':
+        write_ndjson(chunks, out)
+    elif fmt == 'parquet':
+        write_parquet(chunks, out)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the normalized job archive")
+    parser.add_argument('--format', choices=FORMATS, default='csv')
+    parser.add_argument('--source', action='append', help="only this source (repeatable)")
+    parser.add_argument('--since', help="first date_added to include, YYYY-MM-DD")
+    parser.add_argument('--until', help="last date_added to include, YYYY-MM-DD")
+    parser.add_argument('--output', help="output file (default: stdout)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    binary = args.format == 'parquet'
+    if args.output:
+        out = open(args.output, 'wb' if binary else 'w', newline='' if not binary else None,
+                   encoding=None if binary else 'utf-8')
+    else:
+        out = sys.stdout.buffer if binary else sys.stdout
+
+    try:
+        export(args.format, out, args.source, args.since, args.until, args.chunk_size)
+    finally:
+        if args.output:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+Shared fetch layer for all job scrapers: one pooled HTTP session for the
+Jina Reader proxy and direct HTML fetches, an adaptive concurrency limit for
+the proxy, plus content-hash change detection between runs
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Both can point at a local replay server (replay.py) for offline runs
+JINA_BASE_URL = os.getenv('JINA_BASE_URL', "https://r.jina.ai")
+DIRECT_BASE_URL = os.getenv('DIRECT_FETCH_BASE_URL')
+POOL_SIZE = 16
+REQUEST_TIMEOUT = 60
+STATE_FILE = 'fetch_state.json'
+MAX_RETRIES = 3
+# Jina answers some upstream failures with 200 and an error notice in the markdown
+JINA_ERROR_MARKERS = ('Target URL returned error', 'Failed to fetch', 'AbortError')
+USER_AGENT = 'Mozilla/5.0 (compatible; jurek-job-scraper/1.0)'
+
+# Adaptive concurrency settings, tune via environment for other API-key tiers
+INITIAL_CONCURRENCY = int(os.getenv('JINA_INITIAL_CONCURRENCY', '4'))
+MAX_CONCURRENCY = int(os.getenv('JINA_MAX_CONCURRENCY', str(POOL_SIZE)))
+TARGET_LATENCY = float(os.getenv('JINA_TARGET_LATENCY', '15'))
+# Longest wait before retrying a throttled request, whatever Retry-After asks for
+MAX_RETRY_AFTER = float(os.getenv('JINA_MAX_RETRY_AFTER', '60'))
+# Most page fetches one run may make across all sources and queries (0 = no cap)
+FETCH_BUDGET = int(os.getenv('SCRAPE_FETCH_BUDGET', '0'))
+
+_session = requests.Session()
+_adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+_session.mount('https://', _adapter)
+_session.mount('http://', _adapter)
+
+_state_lock = threading.Lock()
+_state = None
+
+
+class AIMDLimiter:
+    """
+    Additive-increase / multiplicative-decrease concurrency limit.
+
+    Every successful response under the target latency grows the limit by
+    roughly one slot per round of requests; a 429 or a slow response halves
+    it (at most once per cool-down, so a burst of concurrent 429s counts as
+    one congestion signal).
+    """
+
+    def __init__(self, initial=INITIAL_CONCURRENCY, minimum=1, maximum=MAX_CONCURRENCY,
+                 target_latency=TARGET_LATENCY, decrease_factor=0.5, decrease_cooldown=1.0):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.decrease_factor = decrease_factor
+        self.decrease_cooldown = decrease_cooldown
+        self.limit = float(max(minimum, min(initial, maximum)))
+        self.in_flight = 0
+        self._cond = threading.Condition()
+        self._last_decrease = 0.0
+        self._stats = {
+            'requests': 0,
+            'throttled': 0,
+            'errors': 0,
+            'slow': 0,
+            'increases': 0,
+            'decreases': 0,
+            'peak_in_flight': 0,
+            'peak_limit': self.limit,
+            'latency_ewma': None,
+            'wait_time': 0.0,
+        }
+
+    def acquire(self):
+        """Block until a request slot is free"""
+        start = time.monotonic()
+        with self._cond:
+            while self.in_flight >= int(self.limit):
+                self._cond.wait()
+            self.in_flight += 1
+            self._stats['peak_in_flight'] = max(self._stats['peak_in_flight'], self.in_flight)
+            self._stats['wait_time'] += time.monotonic() - start
+
+    def release(self, latency, throttled=False, failed=False):
+        """Free a slot and adjust the limit from the observed response"""
+        with self._cond:
+            self.in_flight -= 1
+            stats = self._stats
+            stats['requests'] += 1
+            ewma = stats['latency_ewma']
+            stats['latency_ewma'] = latency if ewma is None else 0.8 * ewma + 0.2 * latency
+
+            slow = latency > self.target_latency
+            if throttled:
+                stats['throttled'] += 1
+            elif failed:
+                stats['errors'] += 1
+            elif slow:
+                stats['slow'] += 1
+
+            now = time.monotonic()
+            if throttled or slow:
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self.limit = max(self.minimum, self.limit * self.decrease_factor)
+                    self._last_decrease = now
+                    stats['decreases'] += 1
+            elif not failed and self.limit < self.maximum:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+                stats['increases'] += 1
+                stats['peak_limit'] = max(stats['peak_limit'], self.limit)
+
+            self._cond.notify_all()
+
+    def metrics(self):
+        """Snapshot of the limiter state"""
+        with self._cond:
+            metrics = dict(self._stats)
+            metrics['limit'] = round(self.limit, 2)
+            metrics['in_flight'] = self.in_flight
+            metrics['peak_limit'] = round(metrics['peak_limit'], 2)
+            metrics['wait_time'] = round(metrics['wait_time'], 3)
+            if metrics['latency_ewma'] is not None:
+                metrics['latency_ewma'] = round(metrics['latency_ewma'], 3)
+            return metrics
+
+
+limiter = AIMDLimiter()
+
+
+class FetchBudget:
+    """Caps the number of page fetches of a run, shared by all sources"""
+
+    def __init__(self, limit=FETCH_BUDGET):
+        self.limit = limit
+        self.used = 0
+        self.refused = 0
+        self._lock = threading.Lock()
+
+    def take(self):
+        """Reserve one fetch; False once the budget is spent"""
+        with self._lock:
+            if self.limit and self.used >= self.limit:
+                self.refused += 1
+                return False
+            self.used += 1
+            return True
+
+
+budget = FetchBudget()
+
+
+def is_error_page(content):
+    """Whether Jina's markdown is an error notice rather than the page"""
+    head = content[:2000]
+    return any(marker in head for marker in JINA_ERROR_MARKERS)
+
+
+def _retry_after(response, attempt):
+    """Seconds to wait before retrying a throttled request, capped at MAX_RETRY_AFTER"""
+    try:
+        delay = float(response.headers.get('Retry-After', ''))
+    except ValueError:
+        delay = 2 ** attempt
+    return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+
+def get_jina_content(url, api_key=None):
+    """Fetch content using Jina Reader API over the shared connection pool"""
+    jina_url = f"{JINA_BASE_URL}/{url}"
+    headers = {}
+
+    if api_key:
+        headers['Authorization'] = f'Bearer {api_key}'
+
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        start = time.monotonic()
+        throttled = failed = False
+        try:
+            response = _session.get(jina_url, headers=headers, timeout=REQUEST_TIMEOUT)
+            throttled = response.status_code == 429
+            if not throttled:
+                response.raise_for_status()
+                if is_error_page(response.text):
+                    failed = True
+                    print(f"Error fetching content: Jina returned an error page for {url}")
+                    return None
+                return response.text
+        except requests.RequestException as e:
+            failed = True
+            print(f"Error fetching content: {e}")
+            return None
+        finally:
+            limiter.release(time.monotonic() - start, throttled, failed)
+
+        if attempt < MAX_RETRIES:
+            time.sleep(_retry_after(response, attempt))
+
+    print(f"Error fetching content: still rate limited after {MAX_RETRIES} retries")
+    return None
+
+
+def fetch_metrics():
+    """Adaptive concurrency and fetch budget state for run summaries"""
+    return {**limiter.metrics(), 'budget_used': budget.used, 'budget_refused': budget.refused}
+
+
+def _load_state():
+    global _state
+    if _state is None:
+        try:
+            with open(STATE_FILE, encoding='utf-8') as f:
+                _state = json.load(f)
+        except (OSError, ValueError):
+            _state = {}
+    return _state
+
+
+def content_hash(content):
+    """Stable hash of fetched page content"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def content_changed(url, content, csv_filename=None):
+    """Return True if the content differs from the last successfully processed fetch"""
+    if csv_filename and not os.path.exists(csv_filename):
+        return True
+    with _state_lock:
+        return _load_state().get(url) != content_hash(content)
+
+
+def remember_content(url, content):
+    """Record the content as processed so the next run can skip it if unchanged"""
+    with _state_lock:
+        _load_state()[url] = content_hash(content)
+
+
+def save_state():
+    """Persist the change-detection state"""
+    with _state_lock:
+        state = _load_state()
+        tmp_file = f'{STATE_FILE}.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+        os.replace(tmp_file, STATE_FILE)
+
+
+def get_direct_content(url):
+    """Fetch a page's HTML directly from the job site over the shared connection pool"""
+    fetch_url = f"{DIRECT_BASE_URL}/{url}" if DIRECT_BASE_URL else url
+    try:
+        response = _session.get(fetch_url, headers={'User-Agent': USER_AGENT}, timeout=REQUEST_TIMEOUT)
+        response.raise_for_status()
+        return response.text
+    except requests.RequestException as e:
+        print(f"Error fetching HTML: {e}")
+        return None
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Run-history store and trend report for the scrape pipeline.
+
+Every run appends one row per source (jobs found, new jobs, fetch bytes,
+fetch latency, duration, errors) to a local SQLite table, so throughput and
+yield can be compared across runs:
+
+    python history.py report --days 30
+    python history.py report --days 14 --by-day --source poolia
+"""
+import argparse
+import math
+import sqlite3
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+DB_FILE = 'run_history.db'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_runs (
+    run_id TEXT NOT NULL,
+    run_at TEXT NOT NULL,
+    source TEXT NOT NULL,
+    status TEXT NOT NULL,
+    jobs INTEGER NOT NULL DEFAULT 0,
+    new_jobs INTEGER NOT NULL DEFAULT 0,
+    fetch_bytes INTEGER NOT NULL DEFAULT 0,
+    fetch_latency REAL,
+    duration REAL,
+    error TEXT,
+    PRIMARY KEY (run_id, source)
+);
+CREATE INDEX IF NOT EXISTS source_runs_source_time ON source_runs (source, run_at);
+"""
+
+COLUMNS = ['run_id', 'run_at', 'source', 'status', 'jobs', 'new_jobs', 'fetch_bytes',
+           'fetch_latency', 'duration', 'error']
+
+
+def connect(db_file=DB_FILE):
+    """Open the history database, creating the table on first use"""
+    connection = sqlite3.connect(db_file)
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def record_run(run_id, run_at, results, db_file=DB_FILE):
+    """Store one run's per-source results (source -> dict with the COLUMNS fields)"""
+    rows = [
+        (run_id, run_at, source, result.get('status', ''), result.get('jobs', 0), result.get('new_jobs', 0),
+         result.get('fetch_bytes', 0), result.get('fetch_latency'), result.get('duration'), result.get('error'))
+        for source, result in results.items()
+    ]
+    with connect(db_file) as connection:
+        connection.executemany(
+            f"INSERT OR REPLACE INTO source_runs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})",
+            rows
+        )
+    connection.close()
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile of a list of numbers"""
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    position = (len(values) - 1) * q
+    lower, upper = math.floor(position), math.ceil(position)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(rows):
+    """Aggregate a group of run rows into the report metrics"""
+    latencies = [row['fetch_latency'] for row in rows]
+    duration = sum(row['duration'] or 0 for row in rows)
+    jobs = sum(row['jobs'] for row in rows)
+    return {
+        'runs': len(rows),
+        'failures': sum(1 for row in rows if row['status'] not in ('published', 'unchanged')),
+        'latency_p50': percentile(latencies, 0.5),
+        'latency_p95': percentile(latencies, 0.95),
+        'jobs_per_second': jobs / duration if duration else None,
+        'new_jobs_per_run': sum(row['new_jobs'] for row in rows) / len(rows),
+        'mb_fetched': sum(row['fetch_bytes'] for row in rows) / 1e6,
+    }
+
+
+def load_rows(days, source=None, db_file=DB_FILE):
+    """Rows of the last N days, optionally for one source"""
+    since = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+    query = f"SELECT {', '.join(COLUMNS)} FROM source_runs WHERE run_at >= ?"
+    params = [since]
+    if source:
+        query += " AND source = ?"
+        params.append(source)
+    connection = connect(db_file)
+    try:
+        return [dict(zip(COLUMNS, row)) for row in connection.execute(query + " ORDER BY run_at", params)]
+    finally:
+        connection.close()
+
+
+def _fmt(value, spec):
+    width = spec.split('.')[0]
+    return format('-', f'>{width}') if value is None else format(value, spec)
+
+
+def report(days=30, by_day=False, source=None, db_file=DB_FILE):
+    """Print rolling latency, throughput and yield per source (and per day)"""
+    rows = load_rows(days, source, db_file)
+    if not rows:
+        print(f"No runs recorded in the last {days} days")
+        return
+
+    groups = defaultdict(list)
+    for row in rows:
+        key = (row['source'], row['run_at'][:10]) if by_day else (row['source'],)
+        groups[key].append(row)
+
+    label = 'Source / day' if by_day else 'Source'
+    print(f"RUN HISTORY: last {days} days, {len({row['run_id'] for row in rows})} runs")
+    print("=" * 92)
+    print(f"{label:<26} {'Runs':>5} {'Fail':>5} {'p50 s':>7} {'p95 s':>7} {'Jobs/s':>8} {'New/run':>8} {'MB':>8}")
+    print("-" * 92)
+    for key in sorted(groups):
+        m = summarize(groups[key])
+        name = ' '.join(key)
+        print(f"{name:<26} {m['runs']:>5} {m['failures']:>5} {_fmt(m['latency_p50'], '7.2f')} "
+              f"{_fmt(m['latency_p95'], '7.2f')} {_fmt(m['jobs_per_second'], '8.1f')} "
+              f"{m['new_jobs_per_run']:>8.1f} {m['mb_fetched']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape run history")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    report_parser = subparsers.add_parser('report', help="rolling latency, throughput and yield per source")
+    report_parser.add_argument('--days', type=int, default=30)
+    report_parser.add_argument('--by-day', action='store_true', help="one row per source and day")
+    report_parser.add_argument('--source', help="only this source")
+    args = parser.parse_args()
+
+    if args.command == 'report':
+        report(args.days, args.by_day, args.source)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Direct HTML backend: fetch a job board's own HTML and extract listings with
+CSS selectors, skipping the Jina Reader round trip.
+
+A source opts in from its scraper module:
+
+    BACKEND = 'html'
+    HTML_SELECTORS = {
+        'item': 'a[href*="/jobs/"]',  # one node per listing
+        'title': 'h3',                 # optional, defaults to the item text
+        'link': 'a',                   # optional, defaults to the item's href
+    }
+
+Links are made absolute and only kept if they match the source's
+JOB_URL_PATTERN, so a changed layout yields no rows (and the Jina markdown
+fallback) rather than navigation junk. selectolax is used when installed,
+otherwise lxml with cssselect (see requirements.txt). Without either the
+runner warns and uses Jina only.
+
+Parsing is offline-testable against saved pages:
+
+    python html_backend.py bravura saved_page.html
+"""
+import importlib
+import re
+import sys
+from datetime import datetime
+from urllib.parse import urljoin
+
+from classifier import tag_jobs
+
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:
+    HTMLParser = None
+
+try:
+    import lxml.html
+    from lxml.cssselect import CSSSelector
+except ImportError:
+    lxml = None
+
+AVAILABLE = HTMLParser is not None or lxml is not None
+DATE_FIELDS = ('date_added', 'data_added')
+
+
+def _select_selectolax(html, selectors):
+    tree = HTMLParser(html)
+    for item in tree.css(selectors['item']):
+        title_node = item.css_first(selectors['title']) if selectors.get('title') else item
+        link_node = item.css_first(selectors['link']) if selectors.get('link') else item
+        if title_node is None or link_node is None:
+            continue
+        yield title_node.text(separator=' ', strip=True), link_node.attributes.get('href')
+
+
+def _select_lxml(html, selectors):
+    root = lxml.html.fromstring(html)
+    for item in CSSSelector(selectors['item'])(root):
+        title_nodes = CSSSelector(selectors['title'])(item) if selectors.get('title') else [item]
+        link_nodes = CSSSelector(selectors['link'])(item) if selectors.get('link') else [item]
+        if not title_nodes or not link_nodes:
+            continue
+        # Separate text nodes with spaces, like selectolax's text(separator=' ')
+        yield ' '.join(title_nodes[0].itertext()), link_nodes[0].get('href')
+
+
+def select_listings(html, selectors):
+    """Yield (title, href) for every listing node matched by the selectors"""
+    if HTMLParser is not None:
+        return _select_selectolax(html, selectors)
+    if lxml is not None:
+        return _select_lxml(html, selectors)
+    raise ImportError("The html backend needs selectolax or lxml (with cssselect) installed")
+
+
+def parse_html_jobs(html, module):
+    """Parse a source's listings from its raw HTML using the module's source config"""
+    link_field = getattr(module, 'LINK_FIELD', 'link')
+    job_url_pattern = re.compile(module.JOB_URL_PATTERN)
+    date_added = datetime.now().strftime('%d/%m/%y')
+
+    jobs = []
+    seen = set()
+    for title, href in select_listings(html, module.HTML_SELECTORS):
+        title = ' '.join((title or '').split())
+        if not href or len(title) <= 3:
+            continue
+        link = urljoin(module.URL, href)
+        if not job_url_pattern.match(link) or link in seen:
+            continue
+        seen.add(link)
+
+        job = {field: '' for field in module.FIELDNAMES}
+        job['title'] = title
+        job[link_field] = link
+        for field in DATE_FIELDS:
+            if field in job:
+                job[field] = date_added
+        jobs.append(job)
+
+    return tag_jobs(jobs)
+
+
+if __name__ == "__main__":
+    source, fixture = sys.argv[1], sys.argv[2]
+    source_module = importlib.import_module(f'{source}_scraper')
+    with open(fixture, encoding='utf-8') as f:
+        parsed = parse_html_jobs(f.read(), source_module)
+    print(f"Parsed {len(parsed)} jobs from {fixture}")
+    for i, parsed_job in enumerate(parsed):
+        print(f"{i+1}. {parsed_job['title']} - {parsed_job[getattr(source_module, 'LINK_FIELD', 'link')]}")
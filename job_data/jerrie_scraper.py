@@ -1,36 +1,32 @@
 #!/usr/bin/env python3
-import requests
 import re
-import csv
 import os
 
-def get_jina_content(url, api_key=None):
-    """Fetch content using Jina Reader API"""
-    jina_url = f"https://r.jina.ai/{url}"
-    headers = {}
-    
-    if api_key:
-        headers['Authorization'] = f'Bearer {api_key}'
-    
-    try:
-        response = requests.get(jina_url, headers=headers)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"Error fetching content: {e}")
-        return None
+from classifier import KeywordClassifier, tag_jobs
+from fetcher import get_jina_content
+from publisher import publish_csv
+
+URL = "https://jerrie.se/lediga-jobb"
+CSV_FILENAME = 'jerrie_jobs.csv'
+FIELDNAMES = ['title', 'link', 'date_added', 'categories', 'employer']
+JOB_URL_PATTERN = r'https://jerrie\.se/lediga-jobb/[^?#]+'
+CLASSIFIER = KeywordClassifier(
+    role_keywords=['utvecklare', 'konsult', 'analyst', 'manager', 'chef', 'ingenjör', 'specialist', 'koordinator'],
+    skip_keywords=['cookie', 'consent', 'samtycke', 'information', 'om', 'kontakt']
+)
+JOB_PATTERNS = [
+    re.compile(r'\[([^\]]+)\]\((https://jerrie\.se/[^)]+)\)', re.MULTILINE),  # Job links
+    re.compile(r'#### ([^|]+?)(?:\|[^|]*)?$', re.MULTILINE),  # Job titles as headings
+]
+# Every regex the parser runs, for the sandbox fuzzer
+PATTERNS = [*JOB_PATTERNS, CLASSIFIER.pattern]
 
 def parse_jerrie_jobs(content):
     """Parse Jerrie job listings from Jina content"""
     jobs = []
     
-    job_patterns = [
-        r'\[([^\]]+)\]\((https://jerrie\.se/[^)]+)\)',  # Job links
-        r'#### ([^|]+?)(?:\|[^|]*)?$',  # Job titles as headings
-    ]
-    
-    for pattern in job_patterns:
-        matches = re.findall(pattern, content, re.MULTILINE)
+    for pattern in JOB_PATTERNS:
+        matches = pattern.findall(content)
         for match in matches:
             if isinstance(match, tuple):
                 title, link = match
@@ -40,8 +36,7 @@ def parse_jerrie_jobs(content):
             
             title = title.strip()
             if title and len(title) > 3:
-                skip_keywords = ['cookie', 'consent', 'samtycke', 'information', 'om', 'kontakt']
-                if not any(skip.lower() in title.lower() for skip in skip_keywords):
+                if not CLASSIFIER.label(title).skip:
                     jobs.append({
                         'title': title,
                         'link': link,
@@ -53,7 +48,7 @@ def parse_jerrie_jobs(content):
         for line in lines:
             line = line.strip()
             if len(line) > 10 and len(line) < 200:
-                if any(keyword in line.lower() for keyword in ['utvecklare', 'konsult', 'analyst', 'manager', 'chef', 'ingenjör', 'specialist', 'koordinator']):
+                if CLASSIFIER.label(line).role:
                     jobs.append({
                         'title': line,
                         'link': 'https://jerrie.se/lediga-jobb',
@@ -68,11 +63,11 @@ def parse_jerrie_jobs(content):
             seen.add(job_key)
             unique_jobs.append(job)
     
-    return unique_jobs[:30]
+    return tag_jobs(unique_jobs[:30])
 
 def scrape_jerrie_jobs():
     """Main function to scrape Jerrie jobs"""
-    url = "https://jerrie.se/lediga-jobb"
+    url = URL
     
     api_key = os.getenv('JINA_API_KEY')
     
@@ -91,16 +86,11 @@ def scrape_jerrie_jobs():
         print(content[:1000])
         return
     
-    csv_filename = 'jerrie_jobs.csv'
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'link', 'date_added']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for job in jobs:
-            writer.writerow(job)
-    
-    print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    csv_filename = CSV_FILENAME
+    if publish_csv(csv_filename, FIELDNAMES, jobs):
+        print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    else:
+        print(f"Scraped {len(jobs)} jobs, {csv_filename} unchanged")
     
     for i, job in enumerate(jobs[:5]):
         print(f"{i+1}. {job['title']} - {job['link']}")
@@ -1,56 +1,68 @@
 #!/usr/bin/env python3
-import requests
 import re
-import csv
 import os
 from datetime import datetime
 import time
+from bisect import bisect_left
 
-def get_jina_content(url, api_key=None):
-    """Fetch content using Jina Reader API"""
-    jina_url = f"https://r.jina.ai/{url}"
-    headers = {}
-    
-    if api_key:
-        headers['Authorization'] = f'Bearer {api_key}'
-    
-    try:
-        response = requests.get(jina_url, headers=headers)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"Error fetching content: {e}")
-        return None
+from classifier import KeywordClassifier, tag_jobs
+from employers import logo_employers
+from fetcher import get_jina_content
+from publisher import publish_csv
+
+URL = "https://juridikjobb.se/sv/jobb"
+CSV_FILENAME = 'juridikjobb_jobs.csv'
+FIELDNAMES = ['title', 'link', 'date_added', 'categories', 'employer']
+JOB_URL_PATTERN = r'https://juridikjobb\.se/sv/jobb/[^?#]+'
+CLASSIFIER = KeywordClassifier(
+    role_keywords=['jurist', 'advokat', 'legal', 'paralegal', 'juridisk', 'rättslig'],
+    skip_keywords=['sök jobb', 'mitt konto', 'för arbetsgivare', 'karriärtips']
+)
+# Pattern to match Juridikjobb job listings
+JOB_PATTERNS = [
+    re.compile(r'\[([^\]]+jurist[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)', re.IGNORECASE),  # Jobs with "jurist" in title
+    re.compile(r'\[([^\]]+advokat[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)', re.IGNORECASE),  # Jobs with "advokat" in title
+    re.compile(r'\[([^\]]+legal[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)', re.IGNORECASE),   # Jobs with "legal" in title
+    re.compile(r'\[([^\]]+paralegal[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)', re.IGNORECASE), # Jobs with "paralegal" in title
+    re.compile(r'\[((?:Jurist|Affärsjurist|Bolagsjurist|Legal Counsel|Advokat|Paralegal|Head of Legal)[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)', re.IGNORECASE),  # Specific legal roles
+]
+LISTING_PATTERN = re.compile(r'(?<=\]\()https://juridikjobb\.se/sv/jobb/')
+# Every regex the parser runs, for the sandbox fuzzer
+PATTERNS = [*JOB_PATTERNS, LISTING_PATTERN, CLASSIFIER.pattern]
+
+def card_employer(logos, listing_offsets, offset):
+    """Employer of the listing at offset: the closest logo before it, unless another listing sits between them"""
+    before = bisect_left(logos, (offset,)) - 1
+    if before < 0:
+        return ''
+    logo_offset, employer = logos[before]
+    between = bisect_left(listing_offsets, logo_offset)
+    if between < len(listing_offsets) and listing_offsets[between] < offset:
+        return ''
+    return employer
 
 def parse_juridikjobb_jobs(content):
     """Parse Juridikjobb job listings from Jina content"""
     jobs = []
     
-    # Pattern to match Juridikjobb job listings
-    job_patterns = [
-        r'\[([^\]]+jurist[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)',  # Jobs with "jurist" in title
-        r'\[([^\]]+advokat[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)',  # Jobs with "advokat" in title
-        r'\[([^\]]+legal[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)',   # Jobs with "legal" in title
-        r'\[([^\]]+paralegal[^\]]*)\]\((https://juridikjobb\.se/[^)]+)\)', # Jobs with "paralegal" in title
-        r'\[(Jurist|Affärsjurist|Bolagsjurist|Legal Counsel|Advokat|Paralegal|Head of Legal)[^\]]*\]\((https://juridikjobb\.se/[^)]+)\)',  # Specific legal roles
-    ]
-    
-    for pattern in job_patterns:
-        matches = re.findall(pattern, content, re.IGNORECASE)
-        for match in matches:
-            if isinstance(match, tuple):
-                title, link = match
-            else:
-                title = match
-                link = "https://juridikjobb.se/sv/jobb"
+    # Each listing card starts with the firm's logo, whose alt text names the employer
+    logos = logo_employers(content)
+    listing_offsets = [match.start() for match in LISTING_PATTERN.finditer(content)]
+
+    for pattern in JOB_PATTERNS:
+        for match in pattern.finditer(content):
+            title, link = match.groups()
             
-            # Clean the title
+            # Clean the title; a logo is the employer, not a listing
             title = title.strip()
+            if title.startswith('![') or '/_next/' in link:
+                continue
             if title and len(title) > 3:
                 jobs.append({
                     'title': title,
                     'link': link,
-                    'date_added': '19/06/25'
+                    'date_added': '19/06/25',
+                    'employer': card_employer(logos, listing_offsets, match.start(2)),
                 })
     
     # If no specific job matches found, look for general legal content
@@ -60,15 +72,15 @@ def parse_juridikjobb_jobs(content):
             line = line.strip()
             # Look for legal job keywords
             if len(line) > 10 and len(line) < 150:
-                if any(keyword in line.lower() for keyword in ['jurist', 'advokat', 'legal', 'paralegal', 'juridisk', 'rättslig']):
-                    # Avoid navigation items
-                    if not any(skip in line.lower() for skip in ['sök jobb', 'mitt konto', 'för arbetsgivare', 'karriärtips']):
-                        jobs.append({
-                            'title': line,
-                            'link': 'https://juridikjobb.se/sv/jobb',
-                            'date_added': '19/06/25'
-                        })
-    
+                label = CLASSIFIER.label(line)
+                # Avoid navigation items
+                if label.role and not label.skip:
+                    jobs.append({
+                        'title': line,
+                        'link': 'https://juridikjobb.se/sv/jobb',
+                        'date_added': '19/06/25'
+                    })
+
     # Remove duplicates
     seen = set()
     unique_jobs = []
@@ -78,11 +90,11 @@ def parse_juridikjobb_jobs(content):
             seen.add(job_key)
             unique_jobs.append(job)
     
-    return unique_jobs[:20]  # Limit to first 20
+    return tag_jobs(unique_jobs[:20])  # Limit to first 20
 
 def scrape_juridikjobb_jobs():
     """Main function to scrape Juridikjobb jobs"""
-    url = "https://juridikjobb.se/sv/jobb"
+    url = URL
     
     # Get API key from environment (if available)
     api_key = os.getenv('JINA_API_KEY')
@@ -102,17 +114,12 @@ def scrape_juridikjobb_jobs():
         print(content[:1000])
         return
     
-    # Write to CSV
-    csv_filename = 'juridikjobb_jobs.csv'
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'link', 'date_added']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for job in jobs:
-            writer.writerow(job)
-    
-    print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    # Publish the CSV atomically
+    csv_filename = CSV_FILENAME
+    if publish_csv(csv_filename, FIELDNAMES, jobs):
+        print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    else:
+        print(f"Scraped {len(jobs)} jobs, {csv_filename} unchanged")
     
     # Display first few jobs
     for i, job in enumerate(jobs[:5]):
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Posting lifecycle tracking across scrape runs.
+
+Every published job is kept in a SQLite table keyed by its source and
+canonical link with first_seen, last_seen and closed_at, so the same link on
+two boards stays two postings. Rows whose link is the site root or no job
+page of the source (parsers fall back to the homepage when a listing has no
+link of its own) are left out, since they would merge unrelated postings
+into one. After each run a source's fresh
+rows are loaded into a temporary table and the lifecycle is updated with
+three set-based statements (seen again, new, gone), which SQLite resolves
+with primary-key lookups instead of comparing row by row. A partial index
+on open postings keeps "active jobs" queries cheap, and one on the
+normalized employer name turns "open roles at X on every board" into an
+index lookup.
+
+    python lifecycle.py active --source poolia
+    python lifecycle.py stats
+    python lifecycle.py employer "Advokatbyrån Gulliksson"
+    python lifecycle.py employers
+"""
+import argparse
+import re
+import sqlite3
+from datetime import datetime
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from employers import company_key
+
+DB_FILE = 'lifecycle.db'
+
+# Query parameters that never identify a posting
+TRACKING_PARAMS = {'fbclid', 'gclid', 'msclkid', 'ref'}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    link TEXT NOT NULL,
+    source TEXT NOT NULL,
+    title TEXT,
+    apply_by_date TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL,
+    closed_at TEXT,
+    employer TEXT,
+    employer_key TEXT,
+    PRIMARY KEY (source, link)
+);
+"""
+
+INDEXES = """
+CREATE INDEX IF NOT EXISTS postings_active ON postings (source, first_seen) WHERE closed_at IS NULL;
+CREATE INDEX IF NOT EXISTS postings_closed ON postings (source, closed_at) WHERE closed_at IS NOT NULL;
+CREATE INDEX IF NOT EXISTS postings_employer ON postings (employer_key) WHERE closed_at IS NULL;
+"""
+
+# Columns added after the table was first created
+ADDED_COLUMNS = ('employer', 'employer_key')
+COLUMNS = ('link', 'source', 'title', 'apply_by_date', 'first_seen', 'last_seen', 'closed_at', 'employer',
+           'employer_key')
+
+
+def connect(db_file=DB_FILE):
+    """Open the lifecycle database, creating the table on first use"""
+    connection = sqlite3.connect(db_file)
+    connection.executescript(SCHEMA)
+    columns = {row[1]: row[5] for row in connection.execute("PRAGMA table_info(postings)")}
+    for column in ADDED_COLUMNS:
+        if column not in columns:
+            connection.execute(f"ALTER TABLE postings ADD COLUMN {column} TEXT")
+    if not columns['source']:
+        # Tables from before postings were keyed per source: rebuild under the new key
+        with connection:
+            connection.execute("ALTER TABLE postings RENAME TO postings_by_link")
+            connection.execute(SCHEMA.replace('IF NOT EXISTS ', ''))
+            connection.execute(f"INSERT INTO postings ({', '.join(COLUMNS)}) "
+                               f"SELECT {', '.join(COLUMNS)} FROM postings_by_link")
+            connection.execute("DROP TABLE postings_by_link")
+    connection.executescript(INDEXES)
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def canonical_link(url):
+    """Normalize a job link so the same posting always gets the same key"""
+    parts = urlsplit(url.strip())
+    query = [(key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+             if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS]
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(sorted(query)), ''))
+
+
+def is_posting_link(link, job_url_pattern=None):
+    """Whether a link can identify one posting: not the site root, and a job page when the pattern is known"""
+    parts = urlsplit(canonical_link(link))
+    if parts.path == '/' and not parts.query:
+        return False
+    return job_url_pattern is None or re.match(job_url_pattern, link.strip()) is not None
+
+
+def update_source(connection, source, jobs, link_field='link', seen_at=None, job_url_pattern=None):
+    """Record one source's current postings; returns (new, seen_again, closed) counts"""
+    seen_at = seen_at or datetime.now().isoformat(timespec='seconds')
+    current = {}
+    for job in jobs:
+        link = job.get(link_field)
+        if link and is_posting_link(link, job_url_pattern):
+            employer = job.get('employer') or None
+            current.setdefault(canonical_link(link), (job.get('title'), job.get('apply_by_date') or None,
+                                                      employer, company_key(employer) if employer else None))
+
+    connection.execute("DROP TABLE IF EXISTS temp.current_postings")
+    connection.execute("CREATE TEMP TABLE current_postings "
+                       "(link TEXT PRIMARY KEY, title TEXT, apply_by_date TEXT, employer TEXT, employer_key TEXT)")
+    connection.executemany("INSERT INTO current_postings VALUES (?, ?, ?, ?, ?)",
+                           [(link, *fields) for link, fields in current.items()])
+
+    # Seen again (reopens postings that had disappeared, picks up a newly extracted employer)
+    seen_again = connection.execute(
+        "UPDATE postings SET last_seen = ?, closed_at = NULL, "
+        "employer = COALESCE((SELECT employer FROM current_postings c WHERE c.link = postings.link), employer), "
+        "employer_key = COALESCE((SELECT employer_key FROM current_postings c WHERE c.link = postings.link), employer_key) "
+        "WHERE source = ? AND link IN (SELECT link FROM current_postings)", (seen_at, source)).rowcount
+    # New
+    new = connection.execute(
+        "INSERT OR IGNORE INTO postings (link, source, title, apply_by_date, first_seen, last_seen, employer, employer_key) "
+        "SELECT link, ?, title, apply_by_date, ?, ?, employer, employer_key FROM current_postings",
+        (source, seen_at, seen_at)).rowcount
+    # Gone since the previous snapshot
+    closed = connection.execute(
+        "UPDATE postings SET closed_at = ? WHERE source = ? AND closed_at IS NULL "
+        "AND link NOT IN (SELECT link FROM current_postings)", (seen_at, source)).rowcount
+
+    connection.execute("DROP TABLE temp.current_postings")
+    return new, seen_again, closed
+
+
+def record_run(snapshots, seen_at=None, db_file=DB_FILE):
+    """Update the lifecycle from {source: (jobs, job_url_pattern, link_field)} of the sources with fresh data"""
+    connection = connect(db_file)
+    try:
+        with connection:
+            return {source: update_source(connection, source, jobs, link_field, seen_at, job_url_pattern)
+                    for source, (jobs, job_url_pattern, link_field) in snapshots.items()}
+    finally:
+        connection.close()
+
+
+def active_jobs(source=None, db_file=DB_FILE):
+    """Open postings, newest first"""
+    connection = connect(db_file)
+    try:
+        query = "SELECT * FROM postings WHERE closed_at IS NULL"
+        params = []
+        if source:
+            query += " AND source = ?"
+            params.append(source)
+        return [dict(row) for row in connection.execute(query + " ORDER BY first_seen DESC", params)]
+    finally:
+        connection.close()
+
+
+def employer_jobs(employer, db_file=DB_FILE):
+    """Open postings at one employer on every board, newest first"""
+    connection = connect(db_file)
+    try:
+        return [dict(row) for row in connection.execute(
+            "SELECT * FROM postings WHERE employer_key = ? AND closed_at IS NULL ORDER BY first_seen DESC",
+            (company_key(employer),))]
+    finally:
+        connection.close()
+
+
+def employers(db_file=DB_FILE):
+    """Employers with open postings: name, open count and the boards listing them, busiest first"""
+    connection = connect(db_file)
+    try:
+        return [dict(row) for row in connection.execute(
+            "SELECT MAX(employer) AS employer, COUNT(DISTINCT link) AS active, GROUP_CONCAT(DISTINCT source) AS sources "
+            "FROM postings WHERE employer_key IS NOT NULL AND closed_at IS NULL "
+            "GROUP BY employer_key ORDER BY active DESC, employer_key")]
+    finally:
+        connection.close()
+
+
+def lifetime_stats(db_file=DB_FILE):
+    """Per source: open and closed counts and average days a closed posting stayed up"""
+    connection = connect(db_file)
+    try:
+        return [dict(row) for row in connection.execute(
+            "SELECT source, "
+            "SUM(closed_at IS NULL) AS active, "
+            "SUM(closed_at IS NOT NULL) AS closed, "
+            "AVG(CASE WHEN closed_at IS NOT NULL THEN julianday(closed_at) - julianday(first_seen) END) AS avg_days "
+            "FROM postings GROUP BY source ORDER BY source")]
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Job posting lifecycle")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    active_parser = subparsers.add_parser('active', help="list open postings")
+    active_parser.add_argument('--source', help="only this source")
+    subparsers.add_parser('stats', help="active/closed counts and average lifetime per source")
+    employer_parser = subparsers.add_parser('employer', help="open postings at one employer across all sources")
+    employer_parser.add_argument('name')
+    subparsers.add_parser('employers', help="employers with open postings")
+    args = parser.parse_args()
+
+    if args.command == 'active':
+        jobs = active_jobs(args.source)
+        for job in jobs:
+            print(f"{job['first_seen'][:10]}  {job['source']:<13} {job['title']}  {job['link']}")
+        print(f"{len(jobs)} active postings")
+    elif args.command == 'stats':
+        print(f"{'Source':<15} {'Active':>7} {'Closed':>7} {'Avg days up':>12}")
+        print("-" * 44)
+        for row in lifetime_stats():
+            avg_days = '-' if row['avg_days'] is None else f"{row['avg_days']:.1f}"
+            print(f"{row['source']:<15} {row['active']:>7} {row['closed']:>7} {avg_days:>12}")
+    elif args.command == 'employer':
+        jobs = employer_jobs(args.name)
+        for job in jobs:
+            print(f"{job['first_seen'][:10]}  {job['source']:<13} {job['title']}  {job['link']}")
+        print(f"{len(jobs)} open postings at {args.name}")
+    elif args.command == 'employers':
+        for row in employers():
+            print(f"{row['active']:>4}  {row['employer']}  ({row['sources']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Reverse matching of new jobs against saved keyword searches.
+
+All saved searches are compiled into one inverted index (query term ->
+search ids). A job is matched against every search at once by looking up
+its own terms in the index, so the cost per job depends on the job's length,
+not on the number of saved searches. A search matches when all of its terms
+were hit.
+
+Swedish titles glue words together ("Bolagsjurist", "Ekonomisamordnare"), so
+a job's terms also include the word endings of each token: "bolagsjurist"
+is found by a search for "jurist".
+"""
+import re
+from collections import defaultdict
+
+MIN_SUFFIX_LENGTH = 4
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """Lowercase word tokens"""
+    return TOKEN_PATTERN.findall((text or '').lower())
+
+
+def job_terms(text):
+    """A job's lookup terms: its tokens plus their compound-word endings"""
+    terms = set()
+    for token in tokenize(text):
+        terms.add(token)
+        for start in range(1, len(token) - MIN_SUFFIX_LENGTH + 1):
+            terms.add(token[start:])
+    return terms
+
+
+def job_text(job):
+    """The searchable text of a job row from any source"""
+    return ' '.join(job.get(field) or '' for field in ('title', 'occupation', 'city'))
+
+
+class SavedSearchIndex:
+    """Inverted index of saved searches for matching many searches per job lookup"""
+
+    def __init__(self):
+        self._index = defaultdict(set)
+        self._terms = {}
+
+    def add(self, search_id, query):
+        """Register a saved search; a search without terms is not indexed"""
+        terms = set(tokenize(query))
+        if not terms:
+            return
+        self._terms[search_id] = terms
+        for term in terms:
+            self._index[term].add(search_id)
+
+    def __len__(self):
+        return len(self._terms)
+
+    def match(self, text):
+        """Return the ids of every saved search whose terms all occur in the text"""
+        hits = defaultdict(int)
+        for term in job_terms(text):
+            for search_id in self._index.get(term, ()):
+                hits[search_id] += 1
+        return {search_id for search_id, count in hits.items() if count == len(self._terms[search_id])}
+
+    def match_jobs(self, jobs, key='link'):
+        """Match a batch of jobs; returns {job key: set of search ids}"""
+        return {job[key]: self.match(job_text(job)) for job in jobs}
+
+
+def normalize_query(query):
+    """Canonical form of a query, so identical searches share one digest"""
+    return ' '.join(sorted(set(tokenize(query))))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+import re
+import os
+from datetime import datetime
+
+from classifier import tag_jobs
+from fetcher import get_jina_content
+from publisher import publish_csv
+
+URL_TEMPLATE = "https://meritmind.se/karriar/lediga-jobb/?location={city}"
+QUERY_MATRIX = {
+    'city': {
+        'uppsala': {'city': 'uppsala'},
+        'stockholm': {'city': 'stockholm'},
+        'goteborg': {'city': 'goteborg'},
+        'malmo': {'city': 'malmo'},
+    },
+}
+DEFAULT_QUERY = {'city': 'uppsala'}
+URL = URL_TEMPLATE.format(**QUERY_MATRIX['city']['uppsala'])
+CSV_FILENAME = 'meritmind_jobs.csv'
+FIELDNAMES = ['title', 'link', 'data_added', 'categories', 'employer']
+JOB_URL_PATTERN = r'https://meritmind\.se/karriar/lediga-jobb/[^/?#]+/?$'
+BACKEND = 'html'
+HTML_SELECTORS = {'item': 'a[href*="/karriar/lediga-jobb/"]'}
+# Job pages live one level below the listing page, e.g.
+# [Ekonomer sökes till Uppsala](https://meritmind.se/karriar/lediga-jobb/ekonomer-sokes-till-uppsala-2/)
+JOB_PATTERN = re.compile(r'\[(?:#+\s*)?([^\]\n]+?)\s*\]\((https://meritmind\.se/karriar/lediga-jobb/[^/?#)\s]+/?)\)')
+# Every regex the parser runs, for the sandbox fuzzer
+PATTERNS = [JOB_PATTERN]
+
+def parse_meritmind_jobs(content):
+    """Parse Meritmind job listings from Jina content"""
+    jobs = []
+    date_added = datetime.now().strftime('%d/%m/%y')
+    
+    for title, link in JOB_PATTERN.findall(content):
+        title = title.strip()
+        if len(title) > 3 and not title.startswith('!['):
+            jobs.append({
+                'title': title,
+                'link': link,
+                'data_added': date_added
+            })
+    
+    # Remove duplicates
+    seen = set()
+    unique_jobs = []
+    for job in jobs:
+        if job['link'] not in seen:
+            seen.add(job['link'])
+            unique_jobs.append(job)
+    
+    return tag_jobs(unique_jobs)
+
+def scrape_meritmind_jobs():
+    """Main function to scrape Meritmind jobs"""
+    url = URL
+    
+    # Get API key from environment (if available)
+    api_key = os.getenv('JINA_API_KEY')
+    
+    print(f"Scraping Meritmind jobs from: {url}")
+    content = get_jina_content(url, api_key)
+    
+    if not content:
+        print("Failed to fetch content")
+        return
+    
+    jobs = parse_meritmind_jobs(content)
+    
+    if not jobs:
+        print("No jobs found. Let me check the content structure...")
+        print("\nFirst 1000 characters of content:")
+        print(content[:1000])
+        return
+    
+    # Publish the CSV atomically
+    csv_filename = CSV_FILENAME
+    if publish_csv(csv_filename, FIELDNAMES, jobs):
+        print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    else:
+        print(f"Scraped {len(jobs)} jobs, {csv_filename} unchanged")
+    
+    # Display first few jobs
+    for i, job in enumerate(jobs[:5]):
+        print(f"{i+1}. {job['title']} - {job['link']}")
+
+if __name__ == "__main__":
+    scrape_meritmind_jobs()
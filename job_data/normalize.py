@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+One typed schema for every source's jobs CSV.
+
+The scrapers write different layouts (date_added vs data_added, Poolia's
+published/apply-by dates and job_url, Arbetsförmedlingen's id/email/city/
+occupation without a date). normalize_frame maps any of them onto SCHEMA in
+one vectorized pass: dates are parsed once into datetime64 columns and also
+emitted as ISO strings (<date>_iso) and integer days since 1970-01-01
+(<date>_day), so nothing downstream parses DD/MM/YY again.
+
+The runner publishes the combined result as normalized_jobs.csv after every
+run; export.py streams the same schema.
+
+    python normalize.py                  # rebuild normalized_jobs.csv
+    python normalize.py --source poolia --output -
+"""
+import argparse
+import glob
+import os
+import sys
+
+import pandas as pd
+
+NORMALIZED_FILE = 'normalized_jobs.csv'
+SOURCE_DATE_FORMAT = '%d/%m/%y'
+EPOCH = pd.Timestamp('1970-01-01')
+
+TEXT_COLUMNS = ['source', 'id', 'title', 'link', 'employer', 'city', 'occupation', 'email', 'categories']
+DATE_COLUMNS = ['date_added', 'published_date', 'apply_by_date']
+
+# Column aliases in the source CSVs, first match wins
+ALIASES = {
+    'title': ('title', 'occupation'),
+    'link': ('link', 'job_url'),
+    'employer': ('employer',),
+    'date_added': ('date_added', 'data_added'),
+    'published_date': ('published_date',),
+    'apply_by_date': ('apply_by_date',),
+    'city': ('city',),
+    'occupation': ('occupation',),
+    'email': ('email',),
+    'categories': ('categories',),
+}
+
+ARBETSFORMEDLINGEN_AD_URL = 'https://arbetsformedlingen.se/platsbanken/annonser/'
+
+SCHEMA = (TEXT_COLUMNS + DATE_COLUMNS
+          + [f'{column}_iso' for column in DATE_COLUMNS]
+          + [f'{column}_day' for column in DATE_COLUMNS])
+
+
+def source_files(sources=None):
+    """Map source name -> CSV path for every jobs CSV (optionally only the given sources)"""
+    files = {}
+    for path in sorted(glob.glob('*_jobs.csv')):
+        source = os.path.basename(path)[:-len('_jobs.csv')]
+        if (not sources or source in sources) and path != NORMALIZED_FILE:
+            files[source] = path
+    return files
+
+
+def parse_dates(values):
+    """DD/MM/YY strings -> datetime64 (NaT where missing or malformed)"""
+    return pd.to_datetime(values, format=SOURCE_DATE_FORMAT, errors='coerce')
+
+
+def epoch_days(dates):
+    """datetime64 -> nullable integer days since 1970-01-01"""
+    return ((dates - EPOCH) // pd.Timedelta(days=1)).astype('Int32')
+
+
+def unique_ids(ids):
+    """Suffix repeated ids with their occurrence number (-1, -2 ...), keeping the first as is"""
+    occurrence = ids.groupby(ids, sort=False).cumcount()
+    return ids.where(occurrence == 0, ids + '-' + occurrence.astype(str))
+
+
+def normalize_frame(frame, source):
+    """Map one source's rows (read with dtype=str) onto SCHEMA"""
+    def column(name):
+        for alias in ALIASES[name]:
+            if alias in frame:
+                return frame[alias].fillna('')
+        return pd.Series('', index=frame.index, dtype=object)
+
+    normalized = pd.DataFrame({name: column(name) for name in ALIASES}, index=frame.index)
+    normalized.insert(0, 'source', source)
+
+    if 'id' in frame:
+        ids = frame['id'].fillna('')
+        normalized['link'] = normalized['link'].where(normalized['link'] != '', ARBETSFORMEDLINGEN_AD_URL + ids)
+    else:
+        # Many rows share a fallback listing link, so the title is part of the key;
+        # hashed for the whole frame at once
+        ids = pd.util.hash_pandas_object(normalized[['link', 'title']], index=False).map('{:016x}'.format)
+    normalized.insert(1, 'id', source + '-' + unique_ids(ids.astype(str)))
+
+    for name in DATE_COLUMNS:
+        dates = parse_dates(normalized[name])
+        normalized[name] = dates
+        normalized[f'{name}_iso'] = dates.dt.strftime('%Y-%m-%d')
+        normalized[f'{name}_day'] = epoch_days(dates)
+    return normalized[SCHEMA]
+
+
+def load_normalized(sources=None):
+    """Every source's jobs in the unified schema"""
+    frames = [normalize_frame(pd.read_csv(path, dtype=str), source)
+              for source, path in source_files(sources).items()]
+    if not frames:
+        return pd.DataFrame(columns=SCHEMA)
+    return pd.concat(frames, ignore_index=True)
+
+
+def publish_normalized(sources=None, output=NORMALIZED_FILE):
+    """Rebuild the unified CSV through the atomic publisher; returns True if it changed"""
+    from publisher import publish_csv
+
+    rows = load_normalized(sources).drop(columns=DATE_COLUMNS)
+    rows = rows.astype(object).where(rows.notna(), '')
+    return publish_csv(output, list(rows.columns), rows.to_dict('records'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normalize all jobs CSVs onto one schema")
+    parser.add_argument('--source', action='append', help="only this source (repeatable)")
+    parser.add_argument('--output', default=NORMALIZED_FILE, help="output CSV, '-' for stdout")
+    args = parser.parse_args()
+
+    if args.output == '-':
+        frame = load_normalized(args.source)
+        frame.drop(columns=DATE_COLUMNS).to_csv(sys.stdout, index=False)
+        return
+    changed = publish_normalized(args.source, args.output)
+    print(f"{args.output} {'updated' if changed else 'unchanged'}")
+
+
+if __name__ == "__main__":
+    main()
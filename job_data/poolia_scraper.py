@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+import re
+import os
+from datetime import datetime
+
+from classifier import tag_jobs
+from fetcher import get_jina_content
+from publisher import publish_csv
+
+URL_TEMPLATE = "https://www.poolia.se/lediga-jobb/{city}"
+QUERY_MATRIX = {
+    'city': {
+        'uppsala': {'city': 'uppsala'},
+        'stockholm': {'city': 'stockholm'},
+        'goteborg': {'city': 'goteborg'},
+        'malmo': {'city': 'malmo'},
+    },
+}
+DEFAULT_QUERY = {'city': 'uppsala'}
+URL = URL_TEMPLATE.format(**QUERY_MATRIX['city']['uppsala'])
+CSV_FILENAME = 'poolia_jobs.csv'
+FIELDNAMES = ['title', 'published_date', 'apply_by_date', 'job_url', 'data_added', 'categories', 'employer']
+JOB_URL_PATTERN = r'https://www\.poolia\.se/lediga-jobb/[^/]+/[^/]+/\d+'
+LINK_FIELD = 'job_url'
+
+# One pattern extracts the whole job card: the linked title followed by the
+# card text (bounded, and never running into the next link) holding the
+# publish date and the last application date, both optional.
+DATE = r'\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}'
+POOLIA_JOB_PATTERN = re.compile(
+    r'\[(?:#+\s*)?(?P<title>[^\]\n]+?)\s*\]'
+    r'\((?P<job_url>https://www\.poolia\.se/lediga-jobb/[^/\s)]+/[^/\s)]+/\d+)/?\)'
+    r'(?:[^\[]{0,200}?Publicerad:?\s*(?P<published>' + DATE + r'))?'
+    r'(?:[^\[]{0,200}?(?:Sista ansökningsdag|Ansök senast):?\s*(?P<apply_by>' + DATE + r'))?',
+    re.IGNORECASE
+)
+# Every regex the parser runs, for the sandbox fuzzer
+PATTERNS = [POOLIA_JOB_PATTERN]
+
+def normalize_date(value):
+    """Convert a scraped date (2025-06-12, 12/06/2025, 12.06.25 ...) to DD/MM/YY"""
+    if not value:
+        return ''
+    for fmt in ('%Y-%m-%d', '%d/%m/%Y', '%d/%m/%y', '%d.%m.%Y', '%d.%m.%y', '%d-%m-%Y'):
+        try:
+            return datetime.strptime(value, fmt).strftime('%d/%m/%y')
+        except ValueError:
+            continue
+    return ''
+
+def parse_poolia_jobs(content):
+    """Parse Poolia job listings with their dates from Jina content in a single pass"""
+    jobs = []
+    seen = set()
+    date_added = datetime.now().strftime('%d/%m/%y')
+    
+    for match in POOLIA_JOB_PATTERN.finditer(content):
+        title = match.group('title').strip()
+        job_url = match.group('job_url')
+        if len(title) <= 3 or title.startswith('![') or job_url in seen:
+            continue
+        seen.add(job_url)
+        jobs.append({
+            'title': title,
+            'published_date': normalize_date(match.group('published')),
+            'apply_by_date': normalize_date(match.group('apply_by')),
+            'job_url': job_url,
+            'data_added': date_added
+        })
+    
+    return tag_jobs(jobs)
+
+def scrape_poolia_jobs():
+    """Main function to scrape Poolia jobs"""
+    url = URL
+    
+    # Get API key from environment (if available)
+    api_key = os.getenv('JINA_API_KEY')
+    
+    print(f"Scraping Poolia jobs from: {url}")
+    content = get_jina_content(url, api_key)
+    
+    if not content:
+        print("Failed to fetch content")
+        return
+    
+    jobs = parse_poolia_jobs(content)
+    
+    if not jobs:
+        print("No jobs found. Let me check the content structure...")
+        print("\nFirst 1000 characters of content:")
+        print(content[:1000])
+        return
+    
+    # Publish the CSV atomically
+    csv_filename = CSV_FILENAME
+    if publish_csv(csv_filename, FIELDNAMES, jobs):
+        print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    else:
+        print(f"Scraped {len(jobs)} jobs, {csv_filename} unchanged")
+    
+    # Display first few jobs
+    for i, job in enumerate(jobs[:5]):
+        print(f"{i+1}. {job['title']} - {job['job_url']}")
+
+if __name__ == "__main__":
+    scrape_poolia_jobs()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Opt-in profiling of the runner's per-source stages (run_all_scrapers.py --profile).
+
+Every fetch, parse and write stage of a source runs under cProfile and
+tracemalloc while a sampler thread records the stage's call stacks. For each
+source the profile directory then holds:
+
+    <source>.<stage>.prof   cProfile stats (python -m pstats, snakeviz)
+    <source>.alloc.txt      top allocating lines and peak memory per stage
+    <source>.collapsed      collapsed stacks (flamegraph.pl, speedscope)
+
+cProfile can only profile one thread at a time, so profiled runs are
+sequential.
+"""
+import cProfile
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+
+PROFILE_DIR = 'profiles'
+SAMPLE_INTERVAL = 0.005
+TOP_ALLOCATIONS = 15
+TRACEMALLOC_FRAMES = 25
+
+# Allocations of the profiler itself are noise in the summaries
+_IGNORED_FILES = (tracemalloc.__file__, cProfile.__file__, __file__, '<frozen importlib._bootstrap>')
+
+
+class StackSampler(threading.Thread):
+    """Samples the call stack of the thread running the active stage"""
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        super().__init__(name='stack-sampler', daemon=True)
+        self.interval = interval
+        self.target = None
+        self.counts = defaultdict(Counter)
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            target = self.target
+            if target is None:
+                continue
+            source, stage, thread_id = target
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                frame = frame.f_back
+            self.counts[source][';'.join([stage] + stack[::-1])] += 1
+
+    def stop(self):
+        self._stopped.set()
+        self.join()
+
+
+class SourceProfiler:
+    """Profiles the stages of one source"""
+
+    enabled = True
+
+    def __init__(self, source, sampler):
+        self.source = source
+        self.sampler = sampler
+        self.profiles = {}
+        self.timings = Counter()
+        self.allocations = defaultdict(list)
+        self.peaks = Counter()
+
+    @contextmanager
+    def stage(self, name):
+        """Profile a block as one run of the named stage"""
+        profile = self.profiles.setdefault(name, cProfile.Profile())
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        started = time.perf_counter()
+        self.sampler.target = (self.source, name, threading.get_ident())
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self.sampler.target = None
+            self.timings[name] += time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            self.peaks[name] = max(self.peaks[name], peak)
+            after = tracemalloc.take_snapshot()
+            filters = [tracemalloc.Filter(False, path) for path in _IGNORED_FILES]
+            self.allocations[name].extend(
+                after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')[:TOP_ALLOCATIONS]
+            )
+
+    def save(self, output_dir):
+        """Write this source's .prof files and allocation summary"""
+        for name, profile in self.profiles.items():
+            profile.dump_stats(os.path.join(output_dir, f'{self.source}.{name}.prof'))
+
+        with open(os.path.join(output_dir, f'{self.source}.alloc.txt'), 'w', encoding='utf-8') as f:
+            for name in self.profiles:
+                f.write(f"== {self.source} {name}: {self.timings[name]:.3f}s, "
+                        f"peak traced memory {self.peaks[name] / 1024:.1f} KiB\n")
+                top = sorted(self.allocations[name], key=lambda stat: stat.size_diff, reverse=True)
+                for stat in top[:TOP_ALLOCATIONS]:
+                    f.write(f"{stat}\n")
+                f.write("\n")
+
+
+class NullProfiler:
+    """Stand-in used when profiling is off"""
+
+    enabled = False
+
+    def stage(self, name):
+        return nullcontext()
+
+
+class ProfileSession:
+    """Profiling for one runner invocation"""
+
+    def __init__(self, output_dir=PROFILE_DIR):
+        self.output_dir = output_dir
+        self.sources = {}
+        self.sampler = StackSampler()
+
+    def start(self):
+        os.makedirs(self.output_dir, exist_ok=True)
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        self.sampler.start()
+
+    def source(self, name):
+        """The profiler for one source's stages"""
+        return self.sources.setdefault(name, SourceProfiler(name, self.sampler))
+
+    def save(self):
+        """Stop sampling and write every source's profile files; returns stage timings"""
+        self.sampler.stop()
+        tracemalloc.stop()
+        for name, profiler in self.sources.items():
+            profiler.save(self.output_dir)
+            with open(os.path.join(self.output_dir, f'{name}.collapsed'), 'w', encoding='utf-8') as f:
+                for stack, count in sorted(self.sampler.counts[name].items()):
+                    f.write(f"{stack} {count}\n")
+        return {name: dict(profiler.timings) for name, profiler in self.sources.items()}
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Atomic, conditional publishing of the jobs CSVs served by the web app.
+
+Rows are written to a temp file next to the target with a buffered writer,
+hashed, and renamed over the target only if the content changed, so the
+Next.js routes never see a half-written file and unchanged data keeps its
+ETag. An empty result never replaces a published file. manifest.json records
+hash, row count, size, mtime and generation time of every published file; a
+manifest hash is only trusted while the file still has that size and mtime,
+so a file rewritten behind the publisher's back is hashed afresh.
+"""
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+MANIFEST_FILE = 'manifest.json'
+WRITE_BUFFER_SIZE = 1 << 16
+
+_manifest_lock = threading.Lock()
+
+
+def file_hash(path):
+    """sha256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(WRITE_BUFFER_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_file=MANIFEST_FILE):
+    """Load the manifest of published files"""
+    try:
+        with open(manifest_file, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_json_atomic(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.manifest-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def published_hash(csv_file, entry):
+    """Hash of the file on disk: the manifest's if the file is as recorded, else computed"""
+    if not os.path.exists(csv_file):
+        return None
+    stat = os.stat(csv_file)
+    if entry.get('hash') and entry.get('bytes') == stat.st_size and entry.get('mtime_ns') == str(stat.st_mtime_ns):
+        return entry['hash']
+    return file_hash(csv_file)
+
+
+def update_manifest(filename, entry, manifest_file=MANIFEST_FILE):
+    """Record a published file in the manifest"""
+    with _manifest_lock:
+        manifest = load_manifest(manifest_file)
+        manifest[filename] = entry
+        _write_json_atomic(manifest_file, manifest)
+
+
+def publish_csv(csv_file, fieldnames, rows, manifest_file=MANIFEST_FILE):
+    """
+    Publish rows to csv_file atomically if they differ from what is published.
+
+    Returns True if the file was replaced, False if it was unchanged or the
+    rows were empty (the previous file is kept either way).
+    """
+    if not rows:
+        print(f"Refusing to publish an empty {csv_file}, keeping the previous file")
+        return False
+
+    directory = os.path.dirname(os.path.abspath(csv_file))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f'.{os.path.basename(csv_file)}-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', newline='', encoding='utf-8', buffering=WRITE_BUFFER_SIZE) as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+
+        new_hash = file_hash(tmp_path)
+        filename = os.path.basename(csv_file)
+        published = load_manifest(manifest_file).get(filename, {})
+        current_hash = published_hash(csv_file, published)
+
+        if new_hash == current_hash:
+            os.unlink(tmp_path)
+            # Bring a missing or stale entry in line with the file
+            entry = _manifest_entry(new_hash, rows, csv_file)
+            if any(published.get(key) != entry[key] for key in ('hash', 'rows', 'bytes', 'mtime_ns')):
+                update_manifest(filename, entry, manifest_file)
+            return False
+
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, csv_file)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+    update_manifest(filename, _manifest_entry(new_hash, rows, csv_file), manifest_file)
+    return True
+
+
+def _manifest_entry(content_hash, rows, csv_file):
+    stat = os.stat(csv_file)
+    return {
+        'hash': content_hash,
+        'rows': len(rows),
+        'bytes': stat.st_size,
+        # A string, since JSON readers (the web app) lose precision on integers this large
+        'mtime_ns': str(stat.st_mtime_ns),
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+    }
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Parse-quality scoring and anomaly alerts for a scrape run.
+
+All sources' parsed rows are assessed in one vectorized pass: how many links
+look like real job pages for the source, how long the titles are, how many
+rows are duplicates or leftover markdown (image links, cookie banners), and
+how the run compares with the trailing baseline of earlier runs. Only
+complete runs that were published or unchanged enter the baseline, so
+outages and rejected drops never become the new normal.
+"""
+import os
+from datetime import datetime
+
+import pandas as pd
+
+HISTORY_FILE = 'quality_history.csv'
+BASELINE_RUNS = 5
+# Fewer good runs than this (or a zero median) is no baseline to compare against
+MIN_BASELINE_RUNS = 3
+
+# Alert thresholds
+MIN_LINK_MATCH_RATE = 0.5
+MAX_DUPLICATE_RATE = 0.3
+MAX_MARKUP_RATE = 0.2
+MAX_ROW_DROP = 0.5
+MAX_LINK_MATCH_DROP = 0.3
+
+# Titles that are markdown leftovers rather than job titles
+MARKUP_PATTERN = r'!\[|\]\(|^Image \d+|^\d+$|^\W+$'
+
+
+def assess_run(outputs):
+    """
+    Score every source's parsed jobs in one pass.
+
+    outputs maps source -> (jobs, job_url_pattern, link_field).
+    Returns a DataFrame with one row of metrics per source.
+    """
+    frames = []
+    for source, (jobs, job_url_pattern, link_field) in outputs.items():
+        if not jobs:
+            frames.append(pd.DataFrame({'source': [source], 'title': [None], 'link': [None], 'link_ok': [None]}))
+            continue
+        frame = pd.DataFrame(jobs)
+        links = frame[link_field].fillna('').astype(str)
+        frames.append(pd.DataFrame({
+            'source': source,
+            'title': frame['title'].fillna('').astype(str),
+            'link': links,
+            'link_ok': links.str.match(job_url_pattern),
+        }))
+
+    df = pd.concat(frames, ignore_index=True)
+    has_row = df['title'].notna()
+    titles = df['title'].fillna('')
+    df['title_len'] = titles.str.len().where(has_row)
+    df['markup'] = titles.str.contains(MARKUP_PATTERN, regex=True).where(has_row)
+    df['duplicate'] = df.duplicated(['source', 'link']).where(has_row)
+    df['link_ok'] = df['link_ok'].astype(float)
+    df['markup'] = df['markup'].astype(float)
+    df['duplicate'] = df['duplicate'].astype(float)
+
+    grouped = df.groupby('source', sort=False)
+    metrics = pd.DataFrame({
+        'rows': grouped['title'].count(),
+        'link_match_rate': grouped['link_ok'].mean(),
+        'duplicate_rate': grouped['duplicate'].mean(),
+        'markup_rate': grouped['markup'].mean(),
+        'title_len_p10': grouped['title_len'].quantile(0.1),
+        'title_len_p50': grouped['title_len'].median(),
+        'title_len_p90': grouped['title_len'].quantile(0.9),
+    }).fillna(0.0)
+
+    metrics['score'] = (metrics['link_match_rate']
+                        * (1 - metrics['duplicate_rate'])
+                        * (1 - metrics['markup_rate']))
+    return metrics
+
+
+def load_history(history_file=HISTORY_FILE):
+    """Load earlier runs' metrics"""
+    if os.path.exists(history_file):
+        return pd.read_csv(history_file)
+    return pd.DataFrame()
+
+
+def compare_with_baseline(metrics, history, baseline_runs=BASELINE_RUNS):
+    """Add the trailing N-run baseline and the change against it"""
+    metrics = metrics.copy()
+    if history.empty:
+        metrics['baseline_rows'] = float('nan')
+        metrics['baseline_link_match_rate'] = float('nan')
+    else:
+        trailing = history.groupby('source').tail(baseline_runs).groupby('source')
+        enough = trailing['rows'].count() >= MIN_BASELINE_RUNS
+        rows = trailing['rows'].median()
+        metrics['baseline_rows'] = rows.where(enough & (rows > 0)).reindex(metrics.index)
+        metrics['baseline_link_match_rate'] = (trailing['link_match_rate'].median()
+                                               .where(enough).reindex(metrics.index))
+
+    metrics['rows_change'] = (metrics['rows'] - metrics['baseline_rows']) / metrics['baseline_rows']
+    metrics['link_match_change'] = metrics['link_match_rate'] - metrics['baseline_link_match_rate']
+    return metrics
+
+
+def find_alerts(metrics):
+    """Return (source, message) alerts for sources whose output looks broken"""
+    alerts = []
+    for source, m in metrics.iterrows():
+        if m['rows'] == 0:
+            alerts.append((source, "no rows parsed"))
+            continue
+        if m['link_match_rate'] < MIN_LINK_MATCH_RATE:
+            alerts.append((source, f"only {m['link_match_rate']:.0%} of links look like job pages"))
+        if m['duplicate_rate'] > MAX_DUPLICATE_RATE:
+            alerts.append((source, f"{m['duplicate_rate']:.0%} duplicate rows"))
+        if m['markup_rate'] > MAX_MARKUP_RATE:
+            alerts.append((source, f"{m['markup_rate']:.0%} of titles are markup leftovers"))
+        # NaN change: no usable baseline yet, so the drop checks are skipped
+        if pd.notna(m['rows_change']) and m['rows_change'] < -MAX_ROW_DROP:
+            alerts.append((source, f"row count {m['rows']:.0f} is {-m['rows_change']:.0%} below baseline {m['baseline_rows']:.0f}"))
+        if pd.notna(m['link_match_change']) and m['link_match_change'] < -MAX_LINK_MATCH_DROP:
+            alerts.append((source, f"job-link rate fell {-m['link_match_change']:.0%} from baseline, layout may have changed"))
+    return alerts
+
+
+def grade(score):
+    """Human-readable quality grade"""
+    if score >= 0.9:
+        return "🟢 Excellent"
+    elif score >= 0.7:
+        return "🟡 Good"
+    elif score >= 0.4:
+        return "🟠 Moderate"
+    return "🔴 Poor"
+
+
+def record_run(metrics, history_file=HISTORY_FILE):
+    """Append this run's metrics to the history used as baseline"""
+    row = metrics.reset_index()[['source', 'rows', 'link_match_rate', 'duplicate_rate', 'markup_rate',
+                                 'title_len_p50', 'score']]
+    if row.empty:
+        return
+    row.insert(0, 'run_at', datetime.now().isoformat(timespec='seconds'))
+    row.to_csv(history_file, mode='a', header=not os.path.exists(history_file), index=False)
+
+
+def assess(outputs, history_file=HISTORY_FILE, baseline_sources=None):
+    """
+    Score a run, compare it with the baseline, record it and return (metrics, alerts).
+
+    Only baseline_sources (default: every source) are recorded as baseline; the
+    runner passes the sources whose run was complete and published or unchanged.
+    """
+    metrics = assess_run(outputs)
+    metrics = compare_with_baseline(metrics, load_history(history_file))
+    alerts = find_alerts(metrics)
+    good = metrics['rows'] > 0
+    if baseline_sources is not None:
+        good &= metrics.index.isin(list(baseline_sources))
+    record_run(metrics[good], history_file)
+    return metrics, alerts
+
+
+def check_source(source, jobs, job_url_pattern, link_field='link', history_file=HISTORY_FILE):
+    """Alerts for one source's freshly parsed jobs, used to gate publishing"""
+    metrics = assess_run({source: (jobs, job_url_pattern, link_field)})
+    metrics = compare_with_baseline(metrics, load_history(history_file))
+    return [message for _, message in find_alerts(metrics)]
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Query matrix for multi-city / multi-category scraping.
+
+A source that defines URL_TEMPLATE and QUERY_MATRIX ({dimension: {value:
+template params}}) is crawled once per combination of the selected values;
+DEFAULT_QUERY ({dimension: value}) fills dimensions nothing was selected
+for and is what the source's URL renders. Sources without a template are
+crawled at URL only. Values come from --city / --category on the runner or
+SCRAPE_CITIES / SCRAPE_CATEGORIES (comma-separated, 'all' for every value).
+
+    SCRAPE_CITIES=stockholm,goteborg,malmo python run_all_scrapers.py
+"""
+import itertools
+import os
+
+DIMENSIONS = {
+    'city': 'SCRAPE_CITIES',
+    'category': 'SCRAPE_CATEGORIES',
+}
+
+# City query values: lowercase, å/ä/ö folded to a/o. Every source's city dimension
+# draws from these, and employers.py uses them to tell a place from a company.
+CITIES = (
+    'stockholm', 'goteborg', 'malmo', 'uppsala', 'linkoping', 'orebro', 'vasteras', 'helsingborg',
+    'norrkoping', 'jonkoping', 'umea', 'lund', 'boras', 'sundsvall', 'gavle', 'eskilstuna',
+    'sodertalje', 'karlstad', 'vaxjo', 'halmstad', 'solna', 'sundbyberg', 'lulea', 'kiruna',
+    'tierp', 'enkoping', 'ostersund', 'kalmar', 'kristianstad', 'skelleftea', 'falun', 'visby',
+)
+
+
+def selection_from_env():
+    """Selected values per dimension from the environment"""
+    selection = {}
+    for dimension, variable in DIMENSIONS.items():
+        values = [v.strip().lower() for v in os.getenv(variable, '').split(',') if v.strip()]
+        if values:
+            selection[dimension] = values
+    return selection
+
+
+def expand_queries(module, selection=None):
+    """Template params of every query to crawl for a source ([] if it has no query matrix)"""
+    matrix = getattr(module, 'QUERY_MATRIX', None)
+    if not matrix:
+        return []
+    selection = selection_from_env() if selection is None else selection
+    default = module.DEFAULT_QUERY
+
+    choices = []
+    for dimension, values in matrix.items():
+        wanted = selection.get(dimension)
+        if not wanted:
+            chosen = [default[dimension]]
+        elif 'all' in wanted:
+            chosen = list(values)
+        else:
+            # Values a source does not offer are skipped; with none left it keeps its default
+            chosen = [value for value in wanted if value in values] or [default[dimension]]
+        choices.append([values[value] for value in chosen])
+
+    queries = []
+    for combination in itertools.product(*choices):
+        params = {}
+        for part in combination:
+            params.update(part)
+        queries.append(params)
+    return queries
+
+
+def expand_urls(module, selection=None):
+    """URLs to crawl for a source under the selection (deduplicated, in order)"""
+    queries = expand_queries(module, selection)
+    if not queries:
+        return [module.URL]
+    return list(dict.fromkeys(module.URL_TEMPLATE.format(**params) for params in queries))
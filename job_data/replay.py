@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Offline replay of recorded source pages and an end-to-end load benchmark.
+
+record   fetches every URL in urls.txt and every scraper's URL once, through
+         Jina and, for html-backend sources, directly, into recordings/.
+serve    runs a local stand-in for r.jina.ai and the job sites that replays
+         the recordings, with configurable latency, error rate and 429 rate.
+         Point the pipeline at it with
+             JINA_BASE_URL=http://127.0.0.1:8765/jina
+             DIRECT_FETCH_BASE_URL=http://127.0.0.1:8765/direct
+bench    runs run_all_scrapers.py against the replay server in a scratch
+         directory at 1x/10x/100x the source count (replica sources that
+         reuse each scraper under a new name) and reports wall time, peak
+         RSS of the runner and rows published per second. --ci runs it once
+         at 1x over the synthetic recordings in tests/fixtures/recordings/
+         and fails unless every source publishes.
+
+The benchmark measures the runner with os.wait4 (ru_maxrss in KiB), so it
+runs on Linux only; record and serve work anywhere.
+
+Injected faults are drawn from a generator seeded per URL and request count,
+so the same run sees the same faults.
+
+    python replay.py record
+    python replay.py serve --latency 0.2 --throttle-rate 0.05
+    python replay.py bench --scales 1 10 100
+    python replay.py bench --ci
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+RECORDINGS_DIR = 'recordings'
+# Small synthetic response set for every source in urls.txt, used by bench --ci and the tests
+FIXTURE_RECORDINGS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tests', 'fixtures', 'recordings')
+INDEX_FILE = 'index.json'
+URLS_FILE = 'urls.txt'
+DEFAULT_PORT = 8765
+REPLICA_PARAM = 'replica'
+SCALES = (1, 10, 100)
+
+KINDS = {'jina': 'text/plain; charset=utf-8', 'direct': 'text/html; charset=utf-8'}
+
+
+def listed_urls(urls_file=URLS_FILE):
+    """URLs in urls.txt (one per line, trailing commas allowed)"""
+    with open(urls_file, encoding='utf-8') as f:
+        return [line.strip().rstrip(',') for line in f if line.strip().rstrip(',')]
+
+
+def strip_replica(url):
+    """The recorded URL a replica URL stands for"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != REPLICA_PARAM]
+    return urlunsplit(parts._replace(query=urlencode(query, safe='[]%')))
+
+
+def recording_name(kind, url):
+    return f"{kind}-{hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]}"
+
+
+def load_index(recordings_dir=RECORDINGS_DIR):
+    try:
+        with open(os.path.join(recordings_dir, INDEX_FILE), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def record(recordings_dir=RECORDINGS_DIR):
+    """Fetch and store every source page once"""
+    import importlib
+    from fetcher import get_direct_content, get_jina_content
+    from run_all_scrapers import SCRAPERS
+
+    os.makedirs(recordings_dir, exist_ok=True)
+    index = load_index(recordings_dir)
+    modules = [importlib.import_module(f'{source}_scraper') for source in SCRAPERS]
+    direct_urls = {module.URL for module in modules if getattr(module, 'BACKEND', 'jina') == 'html'}
+    urls = list(dict.fromkeys(listed_urls() + [module.URL for module in modules]))
+
+    for url in urls:
+        kinds = ['jina'] + (['direct'] if url in direct_urls else [])
+        for kind in kinds:
+            content = get_jina_content(url, os.getenv('JINA_API_KEY')) if kind == 'jina' else get_direct_content(url)
+            if not content:
+                print(f"Could not record {kind} {url}")
+                continue
+            name = recording_name(kind, url)
+            with open(os.path.join(recordings_dir, name), 'w', encoding='utf-8') as f:
+                f.write(content)
+            index[f'{kind} {url}'] = name
+            print(f"Recorded {kind} {url} ({len(content)} chars)")
+
+    with open(os.path.join(recordings_dir, INDEX_FILE), 'w', encoding='utf-8') as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+
+
+class ReplayServer(ThreadingHTTPServer):
+    """Serves /jina/<url> and /direct/<url> from the recordings with injected latency and faults"""
+
+    daemon_threads = True
+
+    def __init__(self, address, recordings_dir=RECORDINGS_DIR, latency=0.0, jitter=0.0,
+                 error_rate=0.0, throttle_rate=0.0, seed=0):
+        super().__init__(address, ReplayHandler)
+        self.recordings_dir = recordings_dir
+        self.index = load_index(recordings_dir)
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.seed = seed
+        self.stats = Counter()
+        self._requests = Counter()
+        self._lock = threading.Lock()
+
+    def draw(self, key):
+        """Deterministic random source for the n-th request of a URL"""
+        with self._lock:
+            self._requests[key] += 1
+            count = self._requests[key]
+        return random.Random(f'{self.seed}|{key}|{count}')
+
+    def count(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        kind, _, url = self.path.lstrip('/').partition('/')
+        url = strip_replica(url)
+        rng = server.draw(f'{kind} {self.path}')
+
+        time.sleep(max(0.0, server.latency + rng.uniform(-server.jitter, server.jitter)))
+        name = server.index.get(f'{kind} {url}')
+        if kind not in KINDS or name is None:
+            server.count('missing')
+            return self._respond(404, 'text/plain', f"No recording for {kind} {url}")
+        if rng.random() < server.throttle_rate:
+            server.count('throttled')
+            return self._respond(429, 'text/plain', "Too Many Requests", {'Retry-After': '1'})
+        if rng.random() < server.error_rate:
+            server.count('errors')
+            return self._respond(503, 'text/plain', "Service Unavailable")
+
+        with open(os.path.join(server.recordings_dir, name), encoding='utf-8') as f:
+            body = f.read()
+        server.count('served')
+        self._respond(200, KINDS[kind], body)
+
+    def _respond(self, status, content_type, body, headers=None):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(port=0, **options):
+    """Start a replay server in a background thread; returns it (server.server_port is the port)"""
+    server = ReplayServer(('127.0.0.1', port), **options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+REPLICA_MODULE = '''from {source}_scraper import *
+from {source}_scraper import parse_{source}_jobs as parse_{name}_jobs
+
+CSV_FILENAME = '{name}_jobs.csv'
+URL = {url!r}
+QUERY_MATRIX = None
+'''
+
+
+def replica_url(url, replica):
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query, keep_blank_values=True) + [(REPLICA_PARAM, str(replica))]
+    return urlunsplit(parts._replace(query=urlencode(query, safe='[]%')))
+
+
+def write_replicas(workdir, scale):
+    """Replica scraper modules for scale x the sources; returns their names"""
+    import importlib
+    from run_all_scrapers import SCRAPERS
+
+    names = []
+    for source in SCRAPERS:
+        module = importlib.import_module(f'{source}_scraper')
+        for replica in range(scale):
+            name = f'{source}r{replica}'
+            with open(os.path.join(workdir, f'{name}_scraper.py'), 'w', encoding='utf-8') as f:
+                f.write(REPLICA_MODULE.format(source=source, name=name, url=replica_url(module.URL, replica)))
+            names.append(name)
+    return names
+
+
+def run_benchmark(scale, base_url, workers=None):
+    """Run the pipeline over scale x the sources in a scratch directory; returns a result dict (Linux only)"""
+    here = os.path.dirname(os.path.abspath(__file__))
+    workdir = tempfile.mkdtemp(prefix=f'replay-bench-{scale}x-')
+    try:
+        sources = write_replicas(workdir, scale)
+        env = dict(os.environ,
+                   JINA_BASE_URL=f'{base_url}/jina',
+                   DIRECT_FETCH_BASE_URL=f'{base_url}/direct',
+                   BUNDLE_DIR=os.path.join(workdir, 'public'),
+                   PYTHONPATH=os.pathsep.join([workdir, here]))
+        env.pop('JINA_API_KEY', None)
+        if workers:
+            env['SCRAPER_WORKERS'] = str(workers)
+        command = [sys.executable, os.path.join(here, 'run_all_scrapers.py')]
+        for source in sources:
+            command += ['--source', source]
+
+        with open(os.path.join(workdir, 'runner.log'), 'w', encoding='utf-8') as log:
+            started = time.perf_counter()
+            process = subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+            _, status, usage = os.wait4(process.pid, 0)
+            wall = time.perf_counter() - started
+        process.returncode = os.waitstatus_to_exitcode(status)
+
+        try:
+            with open(os.path.join(workdir, 'manifest.json'), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        rows = sum(entry['rows'] for filename, entry in manifest.items() if filename != 'normalized_jobs.csv')
+        return {
+            'scale': scale,
+            'sources': len(sources),
+            # The scratch directory starts empty, so every CSV in the manifest was published by this run
+            'published': sum(f'{source}_jobs.csv' in manifest for source in sources),
+            'exit_code': process.returncode,
+            'wall_seconds': wall,
+            # ru_maxrss is in KiB on Linux
+            'peak_rss_mb': usage.ru_maxrss / 1024,
+            'rows': rows,
+            'rows_per_second': rows / wall if wall else 0.0,
+        }
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench(scales=SCALES, workers=None, **server_options):
+    """Benchmark the pipeline at each scale against one replay server"""
+    server = start_server(**server_options)
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    results = []
+    try:
+        for scale in scales:
+            print(f"Running {scale}x ...")
+            results.append(run_benchmark(scale, base_url, workers))
+    finally:
+        server.shutdown()
+
+    print(f"\n{'Scale':>6} {'Sources':>8} {'Published':>10} {'Exit':>5} {'Wall s':>9} {'Peak RSS MB':>12} "
+          f"{'Rows':>8} {'Rows/s':>9}")
+    print("-" * 73)
+    for r in results:
+        print(f"{r['scale']:>5}x {r['sources']:>8} {r['published']:>10} {r['exit_code']:>5} {r['wall_seconds']:>9.2f} "
+              f"{r['peak_rss_mb']:>12.1f} {r['rows']:>8} {r['rows_per_second']:>9.1f}")
+    print(f"Server: {dict(server.stats)}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline replay server and load benchmark")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('record', help="record every source page into recordings/")
+    serve_parser = subparsers.add_parser('serve', help="serve the recordings")
+    serve_parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    bench_parser = subparsers.add_parser('bench', help="end-to-end benchmark at several source counts")
+    bench_parser.add_argument('--scales', type=int, nargs='+', default=list(SCALES))
+    bench_parser.add_argument('--workers', type=int, help="runner worker threads (default: runner's own)")
+    bench_parser.add_argument('--ci', action='store_true',
+                              help="1x over the fixture recordings; fail unless every source publishes")
+    for sub in (serve_parser, bench_parser):
+        sub.add_argument('--recordings', default=RECORDINGS_DIR, help="recordings directory")
+        sub.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+        sub.add_argument('--jitter', type=float, default=0.0, help="+/- seconds of random latency")
+        sub.add_argument('--error-rate', type=float, default=0.0, help="fraction of 503 responses")
+        sub.add_argument('--throttle-rate', type=float, default=0.0, help="fraction of 429 responses")
+        sub.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record()
+        return
+
+    options = dict(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                   throttle_rate=args.throttle_rate, seed=args.seed, recordings_dir=args.recordings)
+    if args.command == 'serve':
+        server = ReplayServer(('127.0.0.1', args.port), **options)
+        print(f"Replaying {len(server.index)} recordings on http://127.0.0.1:{args.port}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print(f"Served: {dict(server.stats)}")
+    elif args.command == 'bench':
+        if args.ci:
+            options['recordings_dir'] = FIXTURE_RECORDINGS_DIR
+            results = bench([1], args.workers, **options)
+            failed = any(r['exit_code'] or r['published'] < r['sources'] for r in results)
+        else:
+            results = bench(args.scales, args.workers, **options)
+            failed = any(r['exit_code'] for r in results)
+        raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,68 +1,332 @@
 #!/usr/bin/env python3
 """
-Master script to run all job scrapers and show summary results
+Master script to run all job scrapers concurrently and show summary results
 """
-import subprocess
+import argparse
+import importlib
 import os
+import time
+import uuid
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 
-def run_scraper(scraper_name):
-    """Run a scraper and return results"""
+from fetcher import (get_jina_content, get_direct_content, content_changed, remember_content,
+                     save_state, fetch_metrics, budget)
+from publisher import publish_csv
+from html_backend import parse_html_jobs, AVAILABLE as HTML_BACKEND_AVAILABLE
+from quality import assess, check_source, grade
+from breaker import CircuitBreaker
+from digest import send_digests
+from history import record_run
+from lifecycle import record_run as record_lifecycle
+from normalize import publish_normalized
+from bundles import publish_bundles
+from queries import expand_urls
+from profiling import ProfileSession, NullProfiler, PROFILE_DIR
+from sandbox import parse_sandboxed, ParserError, ParserTimeout
+
+SCRAPERS = [
+    'bravura',      # Best performer
+    'academicwork',
+    'juridikjobb',
+    'amendo',
+    'wise',
+    'jerrie',
+    'randstad',
+    'adecco',
+    'sjr',
+    'meritmind',
+    'poolia'
+]
+
+STATUS_LABELS = {
+    'published': "✅ Success",
+    'unchanged': "✅ Success",
+    'failed': "❌ Failed",
+    'rejected': "🚫 Rejected",
+    'partial': "⚠️ Partial",
+    'skipped': "⏸️ Skipped",
+}
+
+# The fetch layer adapts its own concurrency, so by default every source gets a worker
+MAX_WORKERS = int(os.getenv('SCRAPER_WORKERS', str(len(SCRAPERS))))
+# Pages of one source's query matrix fetched in parallel
+PAGE_WORKERS = int(os.getenv('SCRAPER_PAGE_WORKERS', '8'))
+
+def load_jobs(csv_file):
+    """Load the jobs of an existing CSV"""
+    if os.path.exists(csv_file):
+        return pd.read_csv(csv_file, dtype=str).fillna('').to_dict('records')
+    return []
+
+def source_urls(module, selection=None):
+    """Pages to crawl for a source under the city/category selection"""
+    return expand_urls(module, selection)
+
+_html_backend_warned = set()
+
+def source_backends(module):
+    """Backends to try in order; sources configured for direct HTML fall back to Jina markdown"""
+    backends = ['jina']
+    if getattr(module, 'BACKEND', 'jina') == 'html':
+        if HTML_BACKEND_AVAILABLE:
+            backends.insert(0, 'html')
+        elif module.__name__ not in _html_backend_warned:
+            _html_backend_warned.add(module.__name__)
+            print(f"Warning: {module.__name__} asks for the html backend, but neither selectolax nor "
+                  f"lxml+cssselect is installed; using Jina only")
+    return backends
+
+def fetch_content(backend, module, api_key, url=None):
+    """Fetch a source page (default: its URL) through the given backend"""
+    url = url or module.URL
+    if not budget.take():
+        print(f"Fetch budget of {budget.limit} pages spent, skipping {url}")
+        return None
+    if backend == 'html':
+        return get_direct_content(url)
+    return get_jina_content(url, api_key)
+
+def parse_content(backend, scraper_name, module, content, sandboxed=True):
+    """
+    Parse fetched content with the backend's parser, by default in a time-boxed child process.
+
+    A crashing parser raises ParserError either way, a parser over its time budget ParserTimeout.
+    """
+    if sandboxed:
+        return parse_sandboxed(backend, scraper_name, content)
     try:
-        print(f"\n{'='*50}")
-        print(f"Running {scraper_name}...")
-        print(f"{'='*50}")
+        if backend == 'html':
+            return parse_html_jobs(content, module)
+        return getattr(module, f'parse_{scraper_name}_jobs')(content)
+    except Exception as e:
+        raise ParserError(f"{type(e).__name__}: {e}") from e
+
+def dedupe_jobs(jobs, link_field):
+    """Drop rows already found by an overlapping query, keeping the first"""
+    seen = set()
+    unique = []
+    for job in jobs:
+        key = (job.get(link_field), job.get('title'))
+        if key not in seen:
+            seen.add(key)
+            unique.append(job)
+    return unique
+
+def fetch_page(scraper_name, module, url, api_key, profiler):
+    """Fetch one page, trying the source's backends in order, and parse it unless unchanged"""
+    page = {'url': url, 'content': None, 'backend': None, 'jobs': [], 'unchanged': False,
+            'latency': 0.0, 'bytes': 0, 'error': None}
+    for backend in source_backends(module):
+        print(f"[{scraper_name}] Fetching {url} ({backend})")
+        fetch_started = time.monotonic()
+        with profiler.stage('fetch'):
+            content = fetch_content(backend, module, api_key, url)
+        page['latency'] += time.monotonic() - fetch_started
         
-        result = subprocess.run([
-            'python', f'{scraper_name}_scraper.py'
-        ], capture_output=True, text=True, cwd='.')
+        if not content:
+            print(f"[{scraper_name}] Failed to fetch content ({backend})")
+            continue
+        page.update(content=content, backend=backend, bytes=page['bytes'] + len(content.encode('utf-8')))
         
-        print(result.stdout)
-        if result.stderr:
-            print(f"Errors: {result.stderr}")
+        # Identical to the last run: parse only if another page of the source changed
+        if not content_changed(url, content, module.CSV_FILENAME):
+            page['unchanged'] = True
+            return page
         
-        # Check if CSV was created and count jobs
-        csv_file = f'{scraper_name}_jobs.csv'
-        if os.path.exists(csv_file):
-            df = pd.read_csv(csv_file)
-            return len(df), True
-        else:
-            return 0, False
-            
-    except Exception as e:
-        print(f"Error running {scraper_name}: {e}")
-        return 0, False
+        # Profiled runs parse in-process so the parse stage shows up in the profile
+        try:
+            with profiler.stage('parse'):
+                page['jobs'] = parse_content(backend, scraper_name, module, content, not profiler.enabled)
+            page['error'] = None
+        except ParserTimeout as e:
+            page['error'] = f"Parser timed out ({e})"
+            print(f"[{scraper_name}] {page['error']} at {url} ({backend})")
+            continue
+        except ParserError as e:
+            page['error'] = f"Parser failed ({e})"
+            print(f"[{scraper_name}] {page['error']} at {url} ({backend})")
+            continue
+        if page['jobs']:
+            return page
+        print(f"[{scraper_name}] No jobs found at {url} ({backend})")
+    return page
+
+def count_new_jobs(jobs, previous_jobs, link_field):
+    """Jobs whose link was not in the previously published CSV"""
+    previous_links = {job.get(link_field) for job in previous_jobs}
+    return sum(1 for job in jobs if job.get(link_field) not in previous_links)
+
+def run_scraper(scraper_name, breaker, selection=None, profiler=None):
+    """Fetch, parse, check and publish one source; returns a result dict"""
+    profiler = profiler or NullProfiler()
+    module = importlib.import_module(f'{scraper_name}_scraper')
+    api_key = os.getenv('JINA_API_KEY')
+    link_field = getattr(module, 'LINK_FIELD', 'link')
+    started = time.monotonic()
+    stats = {'new_jobs': 0, 'fetch_bytes': 0, 'fetch_latency': None, 'error': None}
+    
+    def result(jobs, status, changed=False, complete=False):
+        # complete: every page was fetched and parsed, so the jobs are a full snapshot of the source
+        return {'jobs': list(jobs), 'status': status, 'changed': changed, 'complete': complete,
+                'duration': time.monotonic() - started, **stats}
+    
+    def failed(reason, jobs=(), status='failed'):
+        opened = breaker.record_failure(scraper_name, reason)
+        print(f"[{scraper_name}] {reason}, keeping last good {module.CSV_FILENAME}"
+              + (" (circuit opened)" if opened else ""))
+        stats['error'] = reason
+        return result(jobs, status)
+    
+    if not breaker.allow(scraper_name):
+        open_until = breaker.status(scraper_name)['open_until']
+        print(f"[{scraper_name}] Circuit open until {open_until}, serving last good {module.CSV_FILENAME}")
+        return result([], 'skipped')
+    
+    # Every query of the source's matrix is fetched concurrently; the shared
+    # fetch limiter and budget bound the total across sources (one at a time when profiling)
+    urls = source_urls(module, selection)
+    page_workers = 1 if profiler.enabled else min(len(urls), PAGE_WORKERS)
+    with ThreadPoolExecutor(max_workers=page_workers) as pages_executor:
+        pages = list(pages_executor.map(lambda url: fetch_page(scraper_name, module, url, api_key, profiler), urls))
+    fetched = [page for page in pages if page['content']]
+    stats['fetch_bytes'] = sum(page['bytes'] for page in pages)
+    stats['fetch_latency'] = max(page['latency'] for page in pages)
+    if not fetched:
+        return failed("Fetch failed")
+    
+    # Skip parsing and writing when every page is identical to the last run
+    if len(fetched) == len(pages) and all(page['unchanged'] for page in pages):
+        print(f"[{scraper_name}] Content unchanged, keeping {module.CSV_FILENAME}")
+        breaker.record_success(scraper_name)
+        return result(load_jobs(module.CSV_FILENAME), 'unchanged', complete=True)
+    
+    for page in fetched:
+        if page['unchanged']:
+            try:
+                with profiler.stage('parse'):
+                    page['jobs'] = parse_content(page['backend'], scraper_name, module, page['content'],
+                                                 not profiler.enabled)
+            except ParserTimeout as e:
+                page['error'] = f"Parser timed out ({e})"
+            except ParserError as e:
+                page['error'] = f"Parser failed ({e})"
+    jobs = dedupe_jobs([job for page in fetched for job in page['jobs']], link_field)
+    if not jobs:
+        errors = [page['error'] for page in fetched if page['error']]
+        return failed(errors[0] if errors else "No jobs parsed")
+    
+    # A missing page would drop its rows from the CSV, so a partial crawl is never published
+    failed_pages = [page for page in pages if not page['content'] or (page['error'] and not page['jobs'])]
+    if failed_pages:
+        first_error = failed_pages[0]['error'] or "fetch failed"
+        return failed(f"{len(failed_pages)} of {len(pages)} pages failed ({first_error})", jobs, status='partial')
+    
+    # Never publish output that looks like navigation junk or a broken layout
+    with profiler.stage('check'):
+        alerts = check_source(scraper_name, jobs, module.JOB_URL_PATTERN, link_field)
+    if alerts:
+        return failed(f"Output rejected: {'; '.join(alerts)}", jobs, status='rejected')
+    
+    stats['new_jobs'] = count_new_jobs(jobs, load_jobs(module.CSV_FILENAME), link_field)
+    with profiler.stage('write'):
+        changed = publish_csv(module.CSV_FILENAME, module.FIELDNAMES, jobs)
+    for page in fetched:
+        remember_content(page['url'], page['content'])
+    breaker.record_success(scraper_name)
+    if changed:
+        print(f"[{scraper_name}] Scraped {len(jobs)} jobs and saved to {module.CSV_FILENAME}")
+    else:
+        print(f"[{scraper_name}] Scraped {len(jobs)} jobs, {module.CSV_FILENAME} unchanged")
+    return result(jobs, 'published', changed, complete=True)
 
-def main():
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run all job scrapers concurrently")
+    parser.add_argument('--source', action='append', help="only this source (repeatable)")
+    parser.add_argument('--digest', action='store_true', help="send due email digests after scraping")
+    parser.add_argument('--city', action='append', help="crawl this city (repeatable, 'all' for every city)")
+    parser.add_argument('--category', action='append', help="crawl this category (repeatable)")
+    parser.add_argument('--profile', action='store_true',
+                        help="profile each source's stages (runs sources one at a time)")
+    parser.add_argument('--profile-dir', default=PROFILE_DIR, help="where to write profile files")
+    parser.add_argument('--embed', action='store_true', help="embed new job titles for similar-job search")
+    return parser.parse_args()
+
+def main(args):
     """Run all scrapers and show summary"""
     print("JOB SCRAPER MASTER RUNNER")
     print("=" * 60)
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    # cProfile follows one thread at a time, so a profiled run is sequential
+    workers = 1 if args.profile else MAX_WORKERS
+    scrapers = args.source or SCRAPERS
+    print(f"Running {len(scrapers)} scrapers with {workers} workers")
     
-    scrapers = [
-        'bravura',      # Best performer
-        'academicwork', 
-        'juridikjobb',
-        'amendo',
-        'wise',
-        'jerrie',
-        'randstad',
-        'adecco',
-        'sjr'
-    ]
+    # Command-line selection overrides SCRAPE_CITIES / SCRAPE_CATEGORIES
+    selection = {dimension: [v.lower() for v in values]
+                 for dimension, values in (('city', args.city), ('category', args.category)) if values} or None
     
+    run_id = uuid.uuid4().hex
+    run_at = datetime.now().isoformat(timespec='seconds')
     results = {}
+    outputs = {}
+    snapshots = {}
     total_jobs = 0
+    breaker = CircuitBreaker()
+    profiling = ProfileSession(args.profile_dir) if args.profile else None
+    if profiling:
+        profiling.start()
     
-    for scraper in scrapers:
-        job_count, success = run_scraper(scraper)
-        results[scraper] = {
-            'jobs': job_count,
-            'success': success,
-            'csv_file': f'{scraper}_jobs.csv'
-        }
-        total_jobs += job_count
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_scraper, scraper, breaker, selection,
+                                   profiling.source(scraper) if profiling else None): scraper
+                   for scraper in scrapers}
+        for future in as_completed(futures):
+            scraper = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"Error running {scraper}: {e}")
+                breaker.record_failure(scraper, f"{type(e).__name__}: {e}")
+                result = {'jobs': [], 'status': 'failed', 'changed': False, 'error': f"{type(e).__name__}: {e}"}
+            jobs = result['jobs']
+            if result['status'] != 'skipped':
+                module = importlib.import_module(f'{scraper}_scraper')
+                outputs[scraper] = (jobs, module.JOB_URL_PATTERN, getattr(module, 'LINK_FIELD', 'link'))
+            # Only a complete snapshot may close postings; failed and partial sources keep theirs open
+            if result.get('complete'):
+                snapshots[scraper] = outputs[scraper]
+            results[scraper] = {
+                'jobs': len(jobs) if result['status'] in ('published', 'unchanged') else 0,
+                'status': result['status'],
+                'success': result['status'] in ('published', 'unchanged'),
+                'changed': result['changed'],
+                'csv_file': f'{scraper}_jobs.csv',
+                'new_jobs': result.get('new_jobs', 0),
+                'fetch_bytes': result.get('fetch_bytes', 0),
+                'fetch_latency': result.get('fetch_latency'),
+                'duration': result.get('duration'),
+                'error': result.get('error'),
+            }
+            total_jobs += results[scraper]['jobs']
+    
+    save_state()
+    breaker.save()
+    record_run(run_id, run_at, results)
+    lifecycle = record_lifecycle(snapshots, run_at)
+    publish_normalized()
+    publish_bundles()
+    if args.embed:
+        # Imported here so runs without --embed never import sentence-transformers or hnswlib
+        from embeddings import update_embeddings, AVAILABLE as EMBEDDINGS_AVAILABLE
+        if EMBEDDINGS_AVAILABLE:
+            update_embeddings()
+        else:
+            print("Skipping title embeddings: sentence-transformers is not installed")
+    
+    # Score parse quality against the trailing baseline of earlier runs; only complete runs extend it
+    metrics, alerts = assess(outputs, baseline_sources=snapshots)
     
     # Print summary
     print(f"\n{'='*60}")
@@ -72,33 +336,51 @@ def main():
     # Sort by job count
     sorted_results = sorted(results.items(), key=lambda x: x[1]['jobs'], reverse=True)
     
-    print(f"{'Scraper':<15} {'Jobs Found':<12} {'Status':<10} {'Quality'}")
+    print(f"{'Scraper':<15} {'Jobs Found':<12} {'Status':<10} {'Job links':<10} {'Quality'}")
     print("-" * 60)
     
     for scraper, data in sorted_results:
-        status = "✅ Success" if data['success'] else "❌ Failed"
-        
-        # Assess quality based on job count and known performance
-        if scraper == 'bravura' and data['jobs'] > 50:
-            quality = "🟢 Excellent"
-        elif data['jobs'] > 15:
-            quality = "🟡 Good"
-        elif data['jobs'] > 5:
-            quality = "🟠 Moderate"
-        else:
-            quality = "🔴 Poor"
-        
-        print(f"{scraper:<15} {data['jobs']:<12} {status:<10} {quality}")
+        status = STATUS_LABELS[data['status']]
+        if scraper not in metrics.index:
+            data['score'] = 0.0
+            print(f"{scraper:<15} {data['jobs']:<12} {status:<10} {'-':<10} -")
+            continue
+        m = metrics.loc[scraper]
+        data['score'] = m['score']
+        print(f"{scraper:<15} {data['jobs']:<12} {status:<10} {m['link_match_rate']:<10.0%} {grade(m['score'])}")
     
     print("-" * 60)
     print(f"TOTAL JOBS FOUND: {total_jobs}")
+    print(f"NEW JOBS: {sum(v['new_jobs'] for v in results.values())}")
+    print(f"Postings opened: {sum(new for new, _, _ in lifecycle.values())}, "
+          f"closed: {sum(closed for _, _, closed in lifecycle.values())}")
+    unchanged = [k for k, v in results.items() if v['success'] and not v['changed']]
+    if unchanged:
+        print(f"Unchanged since last run: {', '.join(sorted(unchanged))}")
+    open_circuits = [k for k in scrapers if breaker.status(k)['state'] == 'open']
+    if open_circuits:
+        print(f"Open circuits (serving last good snapshot): {', '.join(open_circuits)}")
+    
+    fetch = fetch_metrics()
+    print(f"Fetch concurrency: limit {fetch['limit']} (peak {fetch['peak_limit']}, "
+          f"peak in flight {fetch['peak_in_flight']}), {fetch['requests']} requests, "
+          f"{fetch['throttled']} throttled, latency EWMA {fetch['latency_ewma']}s")
+    if fetch['budget_refused']:
+        print(f"Fetch budget exhausted: {fetch['budget_refused']} fetches skipped")
+    
+    if alerts:
+        print(f"\n{'='*60}")
+        print("QUALITY ALERTS")
+        print(f"{'='*60}")
+        for scraper, message in alerts:
+            print(f"⚠️  {scraper}: {message}")
     
     # Show best performers
     print(f"\n{'='*60}")
     print("RECOMMENDED SCRAPERS")
     print(f"{'='*60}")
     
-    best_scrapers = [(k, v) for k, v in sorted_results if v['jobs'] > 15]
+    best_scrapers = [(k, v) for k, v in sorted_results if v['jobs'] > 15 and v['score'] >= 0.7]
     
     if best_scrapers:
         for scraper, data in best_scrapers:
@@ -107,7 +389,27 @@ def main():
         print("No scrapers performed exceptionally well.")
         print("Consider improving parsing logic or trying different URLs.")
     
+    if profiling:
+        timings = profiling.save()
+        print(f"\n{'='*60}")
+        print("PROFILE")
+        print(f"{'='*60}")
+        for scraper, stages in timings.items():
+            if stages:
+                print(f"{scraper:<15} " + ", ".join(f"{stage} {seconds:.2f}s" for stage, seconds in stages.items()))
+        print(f"Profiles, allocation summaries and collapsed stacks written to {args.profile_dir}/")
+    
+    if args.digest:
+        print(f"\n{'='*60}")
+        print("EMAIL DIGESTS")
+        print(f"{'='*60}")
+        try:
+            send_digests()
+        except Exception as e:
+            # The scrape is already published; a digest failure shouldn't fail the run
+            print(f"❌ Email digests failed: {type(e).__name__}: {e}")
+    
     print(f"\nCompleted at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main(parse_args())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Time-boxed parser execution and a regex backtracking fuzzer.
+
+Python's re engine backtracks, so a pattern like r'(.*?)\\s*-\\s*SJR' or
+r'#### ([^|]+?)(?:\\|[^|]*)?$' can take minutes on a Jina page that puts all
+navigation on one long line. The runner therefore parses every page in a
+separate process that is killed once it exceeds PARSE_TIMEOUT, so one
+pathological page fails its own source instead of freezing the run.
+
+The fuzz command runs every parser over an adversarial corpus (long single
+lines, unclosed brackets, repeated separators, real listings flattened onto
+one line) and, for each input that blows the budget, times each regex the
+parser uses on its own to name the slow patterns. Every scraper lists its
+regexes in PATTERNS; classifier.PATTERNS adds the ones tag_jobs runs:
+
+    python sandbox.py fuzz
+    python sandbox.py fuzz --source sjr --budget 1 --size 200000
+"""
+import argparse
+import csv
+import importlib
+import multiprocessing
+import os
+import re
+
+PARSE_TIMEOUT = float(os.getenv('PARSE_TIMEOUT', '30'))
+FUZZ_BUDGET = 2.0
+FUZZ_SIZES = (10_000, 100_000)
+_KILL_GRACE = 1.0
+
+_context = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+if _context.get_start_method() == 'forkserver':
+    # Imported once by the fork server instead of in every parse child
+    _context.set_forkserver_preload(['classifier', 'fetcher', 'html_backend'])
+
+
+class ParserTimeout(Exception):
+    """A parser ran past its time budget and was killed"""
+
+
+class ParserError(Exception):
+    """A parser raised inside the sandbox"""
+
+
+def _parse(backend, scraper_name, content):
+    module = importlib.import_module(f'{scraper_name}_scraper')
+    if backend == 'html':
+        from html_backend import parse_html_jobs
+        return parse_html_jobs(content, module)
+    return getattr(module, f'parse_{scraper_name}_jobs')(content)
+
+
+def parser_patterns(backend, scraper_name):
+    """(pattern, flags) of every regex a source's parser runs on a page"""
+    from classifier import PATTERNS as TAGGING_PATTERNS
+
+    module = importlib.import_module(f'{scraper_name}_scraper')
+    patterns = [*module.PATTERNS, *TAGGING_PATTERNS]
+    if backend == 'html':
+        patterns.append(re.compile(module.JOB_URL_PATTERN))
+    return list(dict.fromkeys((compiled.pattern, compiled.flags) for compiled in patterns if compiled is not None))
+
+
+def _regex(pattern, flags, content):
+    return len(re.compile(pattern, flags).findall(content))
+
+
+_TASKS = {'parse': _parse, 'regex': _regex}
+
+
+def _child(conn, task, args):
+    try:
+        conn.send(('ok', _TASKS[task](*args)))
+    except Exception as e:
+        conn.send(('error', f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+def run_in_sandbox(task, args, timeout):
+    """Run a task in a child process; kill it and raise ParserTimeout after timeout seconds"""
+    parent_conn, child_conn = _context.Pipe(duplex=False)
+    process = _context.Process(target=_child, args=(child_conn, task, args), daemon=True)
+    process.start()
+    child_conn.close()
+    try:
+        # Receive before joining: a large result would otherwise block the child on a full pipe
+        if not parent_conn.poll(timeout):
+            process.kill()
+            raise ParserTimeout(f"{task} exceeded {timeout:g}s")
+        try:
+            status, value = parent_conn.recv()
+        except EOFError:
+            process.join(_KILL_GRACE)
+            raise ParserError(f"{task} process exited with code {process.exitcode}")
+    finally:
+        parent_conn.close()
+        process.join(_KILL_GRACE)
+        if process.is_alive():
+            process.kill()
+            process.join()
+    if status == 'error':
+        raise ParserError(value)
+    return value
+
+
+def parse_sandboxed(backend, scraper_name, content, timeout=PARSE_TIMEOUT):
+    """Parse content with the source's parser in a killable child process"""
+    return run_in_sandbox('parse', (backend, scraper_name, content), timeout)
+
+
+def fuzz_corpus(scraper_name, size):
+    """Adversarial inputs of roughly size characters, as (name, content) pairs"""
+    module = importlib.import_module(f'{scraper_name}_scraper')
+    link_field = getattr(module, 'LINK_FIELD', 'link')
+    listings = []
+    if os.path.exists(module.CSV_FILENAME):
+        with open(module.CSV_FILENAME, newline='', encoding='utf-8') as f:
+            listings = [f"[{row.get('title', '')}]({row.get(link_field, '')})" for row in csv.DictReader(f)]
+    listing_line = ' '.join(listings) or f"[Jurist till Byrå AB]({module.URL})"
+
+    def fill(unit):
+        return (unit * (size // len(unit) + 1))[:size]
+
+    return [
+        ('navigation on one line', fill(f"[Lediga jobb]({module.URL}) | [Om oss]({module.URL}) - ")),
+        ('listings on one line', fill(listing_line + ' ')),
+        ('headings without separators', fill('#### Konsult inom ekonomi ')),
+        ('repeated separators', fill(' - ')),
+        ('whitespace run', fill(' ') + 'x'),
+        ('unclosed brackets', fill('[Jobb](')),
+        ('unclosed image links', fill('![Image 1](')),
+        ('date-like noise', fill('2025-06-19 1/2/3 ')),
+    ]
+
+
+def fuzz_source(scraper_name, sizes=FUZZ_SIZES, budget=FUZZ_BUDGET):
+    """Run one source's parsers over the corpus; returns a list of finding dicts"""
+    from run_all_scrapers import source_backends
+
+    module = importlib.import_module(f'{scraper_name}_scraper')
+    findings = []
+    for backend in source_backends(module):
+        for size in sizes:
+            for case, content in fuzz_corpus(scraper_name, size):
+                try:
+                    parse_sandboxed(backend, scraper_name, content, budget)
+                    continue
+                except ParserTimeout:
+                    pass
+                except ParserError as e:
+                    findings.append({'source': scraper_name, 'backend': backend, 'case': case, 'size': size,
+                                     'pattern': None, 'error': str(e)})
+                    continue
+
+                # Time each pattern alone on the input that blew the budget
+                slow = False
+                for pattern, flags in parser_patterns(backend, scraper_name):
+                    try:
+                        run_in_sandbox('regex', (pattern, flags, content), budget)
+                    except ParserTimeout:
+                        slow = True
+                        findings.append({'source': scraper_name, 'backend': backend, 'case': case, 'size': size,
+                                         'pattern': pattern, 'flags': flags, 'error': None})
+                if not slow:
+                    findings.append({'source': scraper_name, 'backend': backend, 'case': case, 'size': size,
+                                     'pattern': None, 'error': "parser over budget, no single slow pattern"})
+    return findings
+
+
+def main():
+    from run_all_scrapers import SCRAPERS
+
+    parser = argparse.ArgumentParser(description="Parser sandbox and regex fuzzer")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    fuzz_parser = subparsers.add_parser('fuzz', help="flag parser patterns that exceed the time budget")
+    fuzz_parser.add_argument('--source', action='append', help="only this source (repeatable)")
+    fuzz_parser.add_argument('--budget', type=float, default=FUZZ_BUDGET, help="seconds per parse")
+    fuzz_parser.add_argument('--size', type=int, action='append', help="input size in characters (repeatable)")
+    args = parser.parse_args()
+
+    findings = []
+    for source in args.source or SCRAPERS:
+        print(f"[{source}] fuzzing")
+        findings.extend(fuzz_source(source, args.size or FUZZ_SIZES, args.budget))
+
+    print(f"\n{'='*60}")
+    print("SLOW PATTERNS")
+    print(f"{'='*60}")
+    if not findings:
+        print(f"No parser exceeded {args.budget:g}s on the corpus")
+    for finding in findings:
+        where = f"{finding['source']} ({finding['backend']}), {finding['case']}, {finding['size']} chars"
+        if finding['pattern']:
+            print(f"⚠️  {where}: {finding['pattern']!r} flags={finding['flags']}")
+        else:
+            print(f"⚠️  {where}: {finding['error']}")
+    raise SystemExit(1 if findings else 0)
+
+
+if __name__ == "__main__":
+    main()
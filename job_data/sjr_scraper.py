@@ -1,39 +1,48 @@
 #!/usr/bin/env python3
-import requests
 import re
-import csv
 import os
 from datetime import datetime
 import time
 
-def get_jina_content(url, api_key=None):
-    """Fetch content using Jina Reader API"""
-    jina_url = f"https://r.jina.ai/{url}"
-    headers = {}
-    
-    if api_key:
-        headers['Authorization'] = f'Bearer {api_key}'
-    
-    try:
-        response = requests.get(jina_url, headers=headers)
-        response.raise_for_status()
-        return response.text
-    except requests.RequestException as e:
-        print(f"Error fetching content: {e}")
-        return None
+from classifier import KeywordClassifier, tag_jobs
+from fetcher import get_jina_content
+from publisher import publish_csv
+
+URL_TEMPLATE = "https://sjr.se/lediga-jobb-samling/?filter=gi_city%3D{city}"
+QUERY_MATRIX = {
+    'city': {
+        'stockholm': {'city': 'stockholm'},
+        'goteborg': {'city': 'goteborg'},
+        'malmo': {'city': 'malmo'},
+        'uppsala': {'city': 'uppsala'},
+    },
+}
+DEFAULT_QUERY = {'city': 'stockholm'}
+URL = URL_TEMPLATE.format(**QUERY_MATRIX['city']['stockholm'])
+CSV_FILENAME = 'sjr_jobs.csv'
+FIELDNAMES = ['title', 'link', 'date_added', 'categories', 'employer']
+JOB_URL_PATTERN = r'https://sjr\.se/(lediga-)?jobb/[^?#]+'
+CLASSIFIER = KeywordClassifier(
+    role_keywords=['utvecklare', 'konsult', 'analyst', 'manager', 'chef', 'ingenjör', 'designer', 'säljare'],
+    skip_keywords=['cookie', 'consent', 'about', 'details']
+)
+# Pattern to match job titles and links
+# Look for patterns that might indicate job listings
+JOB_PATTERNS = [
+    # Job title followed by SJR; anchored and ending on a non-space so a long line without
+    # the suffix is scanned once instead of retried from every position
+    re.compile(r'^([^\n]*?\S)\s*-\s*(?:SJR|sjr\.se)', re.IGNORECASE),
+    re.compile(r'\[(.*?)\]\((https?://[^\)]+)\)', re.IGNORECASE),  # Markdown links
+    re.compile(r'(?:Jobb|Job|Position|Tjänst|Konsult):\s*(.*?)(?:\n|$)', re.IGNORECASE),  # Job indicators
+]
+HEADING_PATTERN = re.compile(r'^#+\s+(.*?)$')
+# Every regex the parser runs, for the sandbox fuzzer
+PATTERNS = [*JOB_PATTERNS, HEADING_PATTERN, CLASSIFIER.pattern]
 
 def parse_sjr_jobs(content):
     """Parse SJR job listings from Jina content"""
     jobs = []
     
-    # Pattern to match job titles and links
-    # Look for patterns that might indicate job listings
-    job_patterns = [
-        r'(.*?)\s*-\s*(?:SJR|sjr\.se)',  # Job title followed by SJR
-        r'\[(.*?)\]\((https?://[^\)]+)\)',  # Markdown links
-        r'(?:Jobb|Job|Position|Tjänst|Konsult):\s*(.*?)(?:\n|$)',  # Job indicators
-    ]
-    
     # Try to find job listings in the content
     lines = content.split('\n')
     for line in lines:
@@ -42,8 +51,8 @@ def parse_sjr_jobs(content):
             continue
             
         # Look for potential job titles
-        for pattern in job_patterns:
-            matches = re.findall(pattern, line, re.IGNORECASE)
+        for pattern in JOB_PATTERNS:
+            matches = pattern.findall(line)
             for match in matches:
                 if isinstance(match, tuple):
                     title, link = match
@@ -60,23 +69,22 @@ def parse_sjr_jobs(content):
     
     # If no jobs found with patterns, try to extract from headings
     if not jobs:
-        heading_pattern = r'^#+\s+(.*?)$'
         for line in lines:
-            match = re.match(heading_pattern, line)
+            match = HEADING_PATTERN.match(line)
             if match:
                 title = match.group(1).strip()
-                if len(title) > 5 and not any(skip in title.lower() for skip in ['cookie', 'consent', 'about', 'details']):
+                if len(title) > 5 and not CLASSIFIER.label(title).skip:
                     jobs.append({
                         'title': title,
                         'link': 'https://sjr.se',
                         'date_added': '19/06/25'
                     })
     
-    return jobs
+    return tag_jobs(jobs)
 
 def scrape_sjr_jobs():
     """Main function to scrape SJR jobs"""
-    url = "https://sjr.se/lediga-jobb-samling/?filter=gi_city%3Dstockholm"
+    url = URL
     
     # Get API key from environment (if available)
     api_key = os.getenv('JINA_API_KEY')
@@ -103,7 +111,7 @@ def scrape_sjr_jobs():
             line = line.strip()
             if line and len(line) > 10 and len(line) < 200:
                 # Look for lines that might be job titles
-                if any(keyword in line.lower() for keyword in ['utvecklare', 'konsult', 'analyst', 'manager', 'chef', 'ingenjör', 'designer', 'säljare']):
+                if CLASSIFIER.label(line).role:
                     potential_jobs.append({
                         'title': line,
                         'link': 'https://sjr.se',
@@ -111,19 +119,14 @@ def scrape_sjr_jobs():
                     })
         
         if potential_jobs:
-            jobs = potential_jobs[:10]  # Limit to first 10
-    
-    # Write to CSV
-    csv_filename = 'sjr_jobs.csv'
-    with open(csv_filename, 'w', newline='', encoding='utf-8') as csvfile:
-        fieldnames = ['title', 'link', 'date_added']
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        
-        for job in jobs:
-            writer.writerow(job)
+            jobs = tag_jobs(potential_jobs[:10])  # Limit to first 10
     
-    print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    # Publish the CSV atomically
+    csv_filename = CSV_FILENAME
+    if publish_csv(csv_filename, FIELDNAMES, jobs):
+        print(f"Scraped {len(jobs)} jobs and saved to {csv_filename}")
+    else:
+        print(f"Scraped {len(jobs)} jobs, {csv_filename} unchanged")
     
     # Display first few jobs
     for i, job in enumerate(jobs[:5]):
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+# The pipeline is a directory of flat scripts run from job_data/
+JOB_DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+sys.path.insert(0, JOB_DATA_DIR)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory, since the pipeline keeps its state files in the cwd"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def fixture_text(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
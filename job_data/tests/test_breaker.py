@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+
+from breaker import CLOSED, HALF_OPEN, MAX_COOLDOWN, OPEN, CircuitBreaker
+
+NOW = datetime(2025, 6, 1, 12, 0)
+
+
+def make_breaker(workdir):
+    return CircuitBreaker(state_file=str(workdir / 'breaker_state.json'), failure_threshold=2,
+                          cooldown=timedelta(hours=1))
+
+
+def test_opens_after_threshold_and_skips_until_cooldown(workdir):
+    breaker = make_breaker(workdir)
+    assert breaker.record_failure('poolia', 'timeout', NOW) is False
+    assert breaker.record_failure('poolia', 'timeout', NOW) is True
+
+    assert breaker.status('poolia')['state'] == OPEN
+    assert breaker.allow('poolia', NOW + timedelta(minutes=59)) is False
+    assert breaker.allow('meritmind', NOW) is True
+    assert breaker.allow('poolia', NOW + timedelta(hours=1)) is True
+    assert breaker.status('poolia')['state'] == HALF_OPEN
+
+
+def test_failed_trial_doubles_cooldown_up_to_max(workdir):
+    breaker = make_breaker(workdir)
+    breaker.record_failure('poolia', 'timeout', NOW)
+    breaker.record_failure('poolia', 'timeout', NOW)
+
+    breaker.allow('poolia', NOW + timedelta(hours=1))
+    assert breaker.record_failure('poolia', 'still down', NOW + timedelta(hours=1)) is True
+    assert breaker.status('poolia')['cooldown_hours'] == 2
+    assert breaker.allow('poolia', NOW + timedelta(hours=2, minutes=59)) is False
+
+    for _ in range(10):
+        breaker.allow('poolia', datetime.max - MAX_COOLDOWN)
+        breaker.record_failure('poolia', 'still down', NOW)
+    assert breaker.status('poolia')['cooldown_hours'] == MAX_COOLDOWN.total_seconds() / 3600
+
+
+def test_success_closes_and_resets(workdir):
+    breaker = make_breaker(workdir)
+    breaker.record_failure('poolia', 'timeout', NOW)
+    breaker.record_failure('poolia', 'timeout', NOW)
+    breaker.allow('poolia', NOW + timedelta(hours=1))
+    breaker.record_success('poolia')
+
+    status = breaker.status('poolia')
+    assert status['state'] == CLOSED
+    assert status['consecutive_failures'] == 0
+    assert status['cooldown_hours'] == 1
+    assert breaker.record_failure('poolia', 'timeout', NOW) is False
+
+
+def test_state_survives_save_and_reload(workdir):
+    breaker = make_breaker(workdir)
+    breaker.record_failure('poolia', 'timeout', NOW)
+    breaker.record_failure('poolia', 'timeout', NOW)
+    breaker.save()
+
+    reloaded = make_breaker(workdir)
+    assert reloaded.status('poolia')['state'] == OPEN
+    assert reloaded.status('poolia')['last_error'] == 'timeout'
+    assert reloaded.allow('poolia', NOW) is False
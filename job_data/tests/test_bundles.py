@@ -0,0 +1,51 @@
+import gzip
+import json
+import os
+from datetime import date
+
+import bundles
+
+
+def write_sources(workdir):
+    (workdir / 'meritmind_jobs.csv').write_text(
+        "title,link,data_added\n"
+        "Controller,https://meritmind.se/karriar/lediga-jobb/controller/,14/06/25\n"
+        "Redovisningsekonom,https://meritmind.se/karriar/lediga-jobb/redovisning/,01/05/25\n"
+        "Ekonomichef,https://meritmind.se/karriar/lediga-jobb/ekonomichef/,\n", encoding='utf-8')
+    (workdir / 'sjr_jobs.csv').write_text(
+        "title,link,date_added\nLönekonsult,https://sjr.se/lediga-jobb/lonekonsult,14/06/25\n", encoding='utf-8')
+
+
+def read_bundle(output_dir, entry):
+    with open(output_dir / 'data' / entry['file'], encoding='utf-8') as f:
+        return json.load(f)['jobs']
+
+
+def test_views_ship_epoch_days_and_keep_undated_jobs(workdir):
+    write_sources(workdir)
+    manifest = bundles.publish_bundles(str(workdir / 'data'), today=date(2025, 6, 15))
+
+    daily = read_bundle(workdir, manifest['views']['daily'])
+    assert [job['title'] for job in daily] == ['Ekonomichef', 'Controller']
+    assert 'dateAddedDay' not in daily[0]
+    assert daily[1]['dateAddedDay'] == (date(2025, 6, 14) - date(1970, 1, 1)).days
+    assert not any(key in daily[1] for key in ('dateAdded', 'publishedDateDay'))
+    assert manifest['views']['all']['rows'] == 3
+    # Only sources the pages display go into the views; every source gets its own bundle
+    assert set(manifest['sources']) == {'meritmind', 'sjr'}
+
+
+def test_bundles_are_content_hashed_and_compressed(workdir):
+    write_sources(workdir)
+    output_dir = workdir / 'data'
+    manifest = bundles.publish_bundles(str(output_dir), today=date(2025, 6, 15))
+    entry = manifest['views']['all']
+    path = output_dir / entry['file']
+
+    assert entry['hash'].startswith(path.name.split('.')[1])
+    assert gzip.decompress((output_dir / (entry['file'] + '.gz')).read_bytes()) == path.read_bytes()
+    assert ('brotli_bytes' in entry) == bundles.BROTLI_AVAILABLE
+
+    mtime = os.path.getmtime(output_dir / bundles.MANIFEST_FILE)
+    assert bundles.publish_bundles(str(output_dir), today=date(2025, 6, 15)) == manifest
+    assert os.path.getmtime(output_dir / bundles.MANIFEST_FILE) == mtime
@@ -0,0 +1,34 @@
+from classifier import KeywordClassifier, categorize, categorize_csv, tag_jobs
+
+
+def test_label_role_skip_and_categories_in_one_scan():
+    classifier = KeywordClassifier(role_keywords=['jurist'], skip_keywords=['cookie'])
+    label = classifier.label('Bolagsjurist till Takab')
+    assert label.role and not label.skip
+    assert label.categories == ['legal']
+    assert classifier.label('Cookie-inställningar').skip
+
+
+def test_overlapping_and_prefix_keywords_are_all_found():
+    # Keywords match as substrings, so 'redovis' finds 'Redovisningsekonom'
+    assert categorize('Redovisningsekonom / Controller') == 'finance'
+    assert categorize('Head of Legal') == 'legal|management'
+
+
+def test_empty_classifier_finds_nothing():
+    classifier = KeywordClassifier(categories={})
+    assert classifier.tags('anything') == set()
+
+
+def test_tag_jobs_uses_title_field():
+    jobs = tag_jobs([{'occupation': 'Systemutvecklare'}], title_field='occupation')
+    assert jobs[0]['categories'] == 'it'
+
+
+def test_categorize_csv_adds_column(workdir):
+    path = workdir / 'x_jobs.csv'
+    path.write_text('title,link\nLöneadministratör,https://example.com/1\n', encoding='utf-8')
+    assert categorize_csv(str(path)) == 1
+    header, row = path.read_text(encoding='utf-8').splitlines()
+    assert header.split(',')[:3] == ['title', 'link', 'categories']
+    assert 'finance' in row and 'administration' in row
@@ -0,0 +1,119 @@
+import csv
+import json
+import smtplib
+
+import digest
+
+
+def write_jobs(source, links):
+    with open(f'{source}_jobs.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['title', 'link'])
+        writer.writeheader()
+        for link in links:
+            writer.writerow({'title': f'Jurist {link}', 'link': link})
+
+
+def write_subscriptions(*subscriptions):
+    with open(digest.SUBSCRIPTIONS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(list(subscriptions), f)
+
+
+def read_state():
+    with open(digest.STATE_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class FakeSMTP:
+    def __init__(self, fail_after=None):
+        self.sent = []
+        self.fail_after = fail_after
+
+    def send_message(self, message):
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            raise smtplib.SMTPServerDisconnected("connection lost")
+        self.sent.append(message)
+
+    def quit(self):
+        raise smtplib.SMTPServerDisconnected("already closed")
+
+
+def test_group_subscribers_merges_identical_configs():
+    groups = digest.group_subscribers([
+        {'emails': ['A@x.se '], 'frequency': 'daily', 'sources': ['poolia', 'meritmind']},
+        {'emails': ['b@x.se'], 'frequency': 'daily', 'sources': ['meritmind', 'poolia']},
+        {'emails': ['c@x.se'], 'frequency': 'daily', 'sources': []},
+    ])
+    assert groups == {('daily', ('meritmind', 'poolia'), ''): {'a@x.se', 'b@x.se'}}
+
+
+def test_first_run_seeds_state_without_sending(workdir, monkeypatch):
+    write_jobs('poolia', ['p1', 'p2'])
+    write_subscriptions({'emails': ['a@x.se'], 'frequency': 'daily', 'sources': ['poolia']})
+    monkeypatch.setattr(digest, 'open_smtp', lambda: (_ for _ in ()).throw(AssertionError("connected")))
+
+    assert digest.send_digests() == 0
+    assert read_state()['daily:poolia']['sent_links'] == ['p1', 'p2']
+
+
+def test_only_new_jobs_are_sent(workdir, monkeypatch):
+    write_jobs('poolia', ['p1', 'p2', 'p3'])
+    write_subscriptions({'emails': ['a@x.se'], 'frequency': 'daily', 'sources': ['poolia']})
+    digest.save_json(digest.STATE_FILE, {'daily:poolia': {'last_sent': '2000-01-01T00:00:00',
+                                                           'sent_links': ['p1', 'p2']}})
+    smtp = FakeSMTP()
+    monkeypatch.setattr(digest, 'open_smtp', lambda: smtp)
+
+    assert digest.send_digests() == 1
+    assert 'p3' in smtp.sent[0].get_body(('plain',)).get_content()
+    assert 'p1' not in smtp.sent[0].get_body(('plain',)).get_content()
+    assert read_state()['daily:poolia']['sent_links'] == ['p1', 'p2', 'p3']
+
+
+def test_state_is_saved_for_groups_sent_before_a_failure(workdir, monkeypatch):
+    write_jobs('poolia', ['p1'])
+    write_jobs('meritmind', ['m1'])
+    write_subscriptions({'emails': ['a@x.se'], 'frequency': 'daily', 'sources': ['meritmind']},
+                        {'emails': ['b@x.se'], 'frequency': 'daily', 'sources': ['poolia']})
+    old = {'last_sent': '2000-01-01T00:00:00', 'sent_links': []}
+    digest.save_json(digest.STATE_FILE, {'daily:meritmind': dict(old), 'daily:poolia': dict(old)})
+    monkeypatch.setattr(digest, 'open_smtp', lambda: FakeSMTP(fail_after=1))
+
+    assert digest.send_digests() == 1
+    state = read_state()
+    assert state['daily:meritmind']['sent_links'] == ['m1']
+    assert state['daily:poolia'] == old
+
+
+def test_unreachable_smtp_server_is_reported_not_raised(workdir, monkeypatch, capsys):
+    write_jobs('poolia', ['p1'])
+    write_subscriptions({'emails': ['a@x.se'], 'frequency': 'daily', 'sources': ['poolia']})
+    digest.save_json(digest.STATE_FILE, {'daily:poolia': {'last_sent': '2000-01-01T00:00:00', 'sent_links': []}})
+
+    def refuse():
+        raise ConnectionRefusedError(111, "Connection refused")
+    monkeypatch.setattr(digest, 'open_smtp', refuse)
+
+    assert digest.send_digests() == 0
+    assert "Digest sending failed" in capsys.readouterr().out
+    assert read_state()['daily:poolia']['sent_links'] == []
+
+
+def test_confirmation_links_are_mailed_once_per_request(workdir, monkeypatch):
+    digest.save_json(digest.REQUESTS_FILE, {
+        'a@x.se': {'action': 'subscribe', 'token': 't1', 'requested_at': '2026-01-01T00:00:00Z',
+                   'frequency': 'weekly', 'sources': ['poolia']},
+        'b@x.se': {'action': 'unsubscribe', 'token': 't2', 'requested_at': '2026-01-01T00:00:00Z'},
+    })
+    smtp = FakeSMTP()
+    monkeypatch.setattr(digest, 'open_smtp', lambda: smtp)
+
+    assert digest.send_digests() == 2
+    assert [message['To'] for message in smtp.sent] == ['a@x.se', 'b@x.se']
+    body = smtp.sent[0].get_body(('plain',)).get_content()
+    assert '/api/email-config/confirm?email=a%40x.se&token=t1' in body
+    assert 'unsubscribe' in smtp.sent[1].get_body(('plain',)).get_content()
+    # Requests are not subscriptions until confirmed
+    assert not (workdir / digest.SUBSCRIPTIONS_FILE).exists()
+
+    assert digest.send_digests() == 0
+    assert len(smtp.sent) == 2
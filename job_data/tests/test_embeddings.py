@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+
+import embeddings
+
+VOCABULARY = ['jurist', 'legal', 'ekonom', 'controller']
+SYNONYMS = {'legal': 0}
+
+
+class FakeModel:
+    """Bag-of-words vectors: 'legal' and 'jurist' share a dimension, like a multilingual model would"""
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, titles, **kwargs):
+        self.encoded.extend(titles)
+        vectors = np.zeros((len(titles), len(VOCABULARY) + 1), dtype=np.float32)
+        for row, title in enumerate(titles):
+            for word in title.lower().split():
+                if word in VOCABULARY:
+                    vectors[row, SYNONYMS.get(word, VOCABULARY.index(word))] += 1
+            vectors[row, -1] += 0.01
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class FakeHnswIndex:
+    """Exact search behind hnswlib's interface, counting builds and loads"""
+
+    builds = 0
+    loads = 0
+
+    def __init__(self, space, dim):
+        self.vectors = None
+
+    def init_index(self, max_elements, ef_construction, M):
+        FakeHnswIndex.builds += 1
+
+    def add_items(self, vectors, labels):
+        self.vectors = np.asarray(vectors)
+
+    def set_ef(self, ef):
+        pass
+
+    def save_index(self, path):
+        with open(path, 'wb') as f:
+            np.save(f, self.vectors)
+
+    def load_index(self, path, max_elements):
+        FakeHnswIndex.loads += 1
+        with open(path, 'rb') as f:
+            self.vectors = np.load(f)
+
+    def knn_query(self, queries, k):
+        similarities = queries @ self.vectors.T
+        labels = np.argsort(-similarities, axis=1)[:, :k]
+        return labels, 1.0 - np.take_along_axis(similarities, labels, axis=1)
+
+
+class FakeHnswlib:
+    Index = FakeHnswIndex
+
+
+def write_jobs(workdir, titles):
+    pd.DataFrame({'title': titles, 'link': [f'https://x.se/{i}' for i in range(len(titles))]}).to_csv(
+        workdir / 'sjr_jobs.csv', index=False)
+
+
+def use_fakes(monkeypatch, hnsw=False):
+    model = FakeModel()
+    monkeypatch.setattr(embeddings, 'load_model', lambda: model)
+    monkeypatch.setattr(embeddings, 'hnswlib', FakeHnswlib if hnsw else None)
+    FakeHnswIndex.builds = FakeHnswIndex.loads = 0
+    return model
+
+
+def test_titles_are_embedded_once(workdir, monkeypatch):
+    model = use_fakes(monkeypatch)
+    write_jobs(workdir, ['Jurist', 'jurist ', 'Ekonom'])
+
+    assert embeddings.update_embeddings() == 2
+    assert embeddings.update_embeddings() == 0
+    assert model.encoded == ['Jurist', 'Ekonom']
+
+
+def test_similar_uses_brute_force_without_hnswlib(workdir, monkeypatch):
+    use_fakes(monkeypatch)
+    write_jobs(workdir, ['Jurist', 'Ekonom', 'Controller'])
+
+    results = embeddings.similar('Legal', k=2)
+    assert results[0]['title'] == 'Jurist'
+    assert results[0]['similarity'] > results[1]['similarity']
+
+
+def test_hnsw_index_is_saved_and_reused_until_titles_change(workdir, monkeypatch):
+    use_fakes(monkeypatch, hnsw=True)
+    write_jobs(workdir, ['Jurist', 'Ekonom'])
+
+    embeddings.update_embeddings()
+    assert (FakeHnswIndex.builds, FakeHnswIndex.loads) == (1, 0)
+    assert embeddings.similar('Legal', k=1)[0]['title'] == 'Jurist'
+    assert (FakeHnswIndex.builds, FakeHnswIndex.loads) == (1, 1)
+
+    write_jobs(workdir, ['Jurist', 'Ekonom', 'Controller'])
+    assert embeddings.similar('Controller', k=1)[0]['title'] == 'Controller'
+    assert (FakeHnswIndex.builds, FakeHnswIndex.loads) == (2, 1)
@@ -0,0 +1,53 @@
+import pytest
+
+from conftest import fixture_text
+from employers import company_key, extract_employer, logo_employers
+from juridikjobb_scraper import card_employer, parse_juridikjobb_jobs
+
+
+@pytest.mark.parametrize('title, employer', [
+    ("Platschef till Takab | Uppsala", "Takab"),
+    ("Application Manager till Hydroscand", "Hydroscand"),
+    ("Legal Counsel hos Vattenfall, Solna", "Vattenfall"),
+    ("Engineer at Volvo Cars", "Volvo Cars"),
+    ("Controller hos Volvo Cars i Göteborg", "Volvo Cars"),
+    ("Förvaltningsekonom till Riksbyggen i Uppsala", "Riksbyggen"),
+    ("Jurist till Advokatfirman Lindahl i Malmö (vikariat)", "Advokatfirman Lindahl"),
+    ("Redovisningsekonom till Ernst & Young", "Ernst & Young"),
+    ("Kundtjänstmedarbetare till Lendo!", "Lendo"),
+    ("Ekonomer sökes till Uppsala", ""),
+    ("Controller till Göteborg", ""),
+    ("Path to Partner", ""),
+    ("Lönekonsult till kund i Solna", ""),
+    ("Financial Controller till Life Science bolag, Uppsala", ""),
+    ("Redovisningskonsult", ""),
+])
+def test_extract_employer(title, employer):
+    assert extract_employer(title) == employer
+
+
+def test_company_key_ignores_case_accents_and_legal_form():
+    assert company_key("Advokatbyrån Gulliksson AB") == company_key("ADVOKATBYRAN GULLIKSSON")
+    assert company_key("AB") == 'ab'
+
+
+def test_juridikjobb_cards_take_their_logo_as_employer():
+    content = fixture_text('juridikjobb.md')
+    assert [name for _, name in logo_employers(content)] == [
+        "Advokatbyrån Gulliksson AB", "Mannheimer Swartling", "Skatteverket"]
+
+    jobs = {job['title']: job['employer'] for job in parse_juridikjobb_jobs(content)}
+    assert jobs == {
+        "Biträdande jurist, Malmö": "Advokatbyrån Gulliksson AB",
+        "Advokat inom M&A": "Mannheimer Swartling",
+        # No logo on the card: the previous card's logo is not reused, the title names the employer
+        "Legal Counsel hos Vattenfall i Solna": "Vattenfall",
+        "Jurist till Uppsala": "Skatteverket",
+    }
+
+
+def test_card_employer_stops_at_the_previous_listing():
+    logos = [(10, "Vinge")]
+    assert card_employer(logos, [20], 20) == "Vinge"
+    assert card_employer(logos, [20, 40], 40) == ""
+    assert card_employer(logos, [20], 5) == ""
@@ -0,0 +1,52 @@
+import csv
+import io
+import json
+
+import export
+
+
+def write_source(workdir):
+    with open(workdir / 'poolia_jobs.csv', 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=['title', 'job_url', 'published_date', 'apply_by_date', 'date_added'])
+        writer.writeheader()
+        for day in range(1, 6):
+            writer.writerow({'title': f'Ekonom {day}', 'job_url': f'https://www.poolia.se/jobb/{day}',
+                             'published_date': f'0{day}/06/25', 'apply_by_date': '', 'date_added': f'0{day}/06/25'})
+
+
+def test_ndjson_has_one_record_per_line_across_chunks(workdir):
+    write_source(workdir)
+    out = io.StringIO()
+    export.export('ndjson', out, chunk_size=2)
+
+    text = out.getvalue()
+    assert text.endswith('}\n')
+    lines = text.split('\n')[:-1]
+    assert len(lines) == 5
+    records = [json.loads(line) for line in lines]
+    assert records[0]['link'] == 'https://www.poolia.se/jobb/1'
+    assert records[0]['date_added'] == '2025-06-01'
+    assert list(records[0]) == export.COLUMNS
+
+
+def test_csv_writes_header_once_and_filters_by_date(workdir):
+    write_source(workdir)
+    out = io.StringIO()
+    export.export('csv', out, since='2025-06-02', until='2025-06-04', chunk_size=2)
+
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+    assert [row['title'] for row in rows] == ['Ekonom 2', 'Ekonom 3', 'Ekonom 4']
+
+
+def test_csv_with_no_rows_still_has_header(workdir):
+    out = io.StringIO()
+    export.export('csv', out)
+    assert out.getvalue() == ','.join(export.COLUMNS) + '\n'
+
+
+def test_sources_limit_the_export(workdir):
+    write_source(workdir)
+    (workdir / 'sjr_jobs.csv').write_text('title,link,date_added\nJurist,https://sjr.se,01/06/25\n', encoding='utf-8')
+    out = io.StringIO()
+    export.export('ndjson', out, sources=['poolia'])
+    assert {json.loads(line)['source'] for line in out.getvalue().splitlines()} == {'poolia'}
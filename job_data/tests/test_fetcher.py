@@ -0,0 +1,74 @@
+from types import SimpleNamespace
+
+import fetcher
+from fetcher import AIMDLimiter, FetchBudget, is_error_page
+
+
+def throttled(retry_after=None):
+    headers = {} if retry_after is None else {'Retry-After': retry_after}
+    return SimpleNamespace(headers=headers)
+
+
+def test_limiter_grows_additively_and_halves_on_throttle():
+    limiter = AIMDLimiter(initial=4, maximum=16, target_latency=10, decrease_cooldown=0)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release(0.1)
+    assert 4.9 < limiter.limit < 5.1
+    limiter.acquire()
+    limiter.release(0.1, throttled=True)
+    assert 2.4 < limiter.limit < 2.6
+
+
+def test_limiter_treats_slow_responses_as_congestion_once_per_cooldown():
+    limiter = AIMDLimiter(initial=8, target_latency=1, decrease_cooldown=60)
+    for _ in range(3):
+        limiter.acquire()
+        limiter.release(5.0)
+    assert limiter.limit == 4
+    assert limiter.metrics()['slow'] == 3
+
+
+def test_limiter_never_drops_below_minimum():
+    limiter = AIMDLimiter(initial=1, minimum=1, decrease_cooldown=0)
+    limiter.acquire()
+    limiter.release(0.1, throttled=True)
+    assert limiter.limit == 1
+
+
+def test_budget_refuses_after_limit():
+    budget = FetchBudget(limit=2)
+    assert [budget.take() for _ in range(3)] == [True, True, False]
+    assert budget.refused == 1
+    assert FetchBudget(limit=0).take()
+
+
+def test_retry_after_is_capped(monkeypatch):
+    monkeypatch.setattr(fetcher, 'MAX_RETRY_AFTER', 30.0)
+    assert fetcher._retry_after(throttled('5'), 0) == 5
+    assert fetcher._retry_after(throttled('86400'), 0) == 30
+    assert fetcher._retry_after(throttled('-3'), 0) == 0
+    # Missing or HTTP-date values fall back to exponential backoff
+    assert fetcher._retry_after(throttled(), 2) == 4
+    assert fetcher._retry_after(throttled('Wed, 21 Oct 2026 07:28:00 GMT'), 10) == 30
+
+
+def test_jina_error_page_detection():
+    assert is_error_page('Title: x\n\nWarning: Target URL returned error 404: Not Found')
+    assert not is_error_page('[Jurist](https://example.com/jobs/1)')
+
+
+def test_content_hash_change_detection(workdir, monkeypatch):
+    monkeypatch.setattr(fetcher, '_state', None)
+    url = 'https://example.com/jobs'
+    (workdir / 'x_jobs.csv').write_text('title,link\n', encoding='utf-8')
+    assert fetcher.content_changed(url, 'page v1', 'x_jobs.csv')
+    fetcher.remember_content(url, 'page v1')
+    assert not fetcher.content_changed(url, 'page v1', 'x_jobs.csv')
+    assert fetcher.content_changed(url, 'page v2', 'x_jobs.csv')
+    # A missing CSV always needs a parse, whatever the hash says
+    assert fetcher.content_changed(url, 'page v1', 'missing_jobs.csv')
+
+    fetcher.save_state()
+    monkeypatch.setattr(fetcher, '_state', None)
+    assert not fetcher.content_changed(url, 'page v1', 'x_jobs.csv')
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from history import load_rows, percentile, record_run, report, summarize
+
+
+def test_percentile_interpolates_and_skips_missing():
+    assert percentile([4, None, 1, 3, 2], 0.5) == 2.5
+    assert percentile([1, 2, 3, 4, 5], 0.95) == pytest.approx(4.8)
+    assert percentile([None], 0.5) is None
+
+
+def test_record_and_summarize_runs(workdir):
+    db_file = str(workdir / 'history.db')
+    recent = datetime.now().isoformat(timespec='seconds')
+    old = (datetime.now() - timedelta(days=40)).isoformat(timespec='seconds')
+    record_run('r0', old, {'poolia': {'status': 'published', 'jobs': 99}}, db_file)
+    record_run('r1', recent, {
+        'poolia': {'status': 'published', 'jobs': 20, 'new_jobs': 4, 'fetch_bytes': 2_000_000,
+                   'fetch_latency': 1.0, 'duration': 4.0},
+        'meritmind': {'status': 'failed', 'error': 'timeout'},
+    }, db_file)
+    record_run('r2', recent, {'poolia': {'status': 'unchanged', 'jobs': 20, 'fetch_latency': 3.0,
+                                         'duration': 6.0}}, db_file)
+
+    rows = load_rows(30, 'poolia', db_file)
+    assert [row['run_id'] for row in rows] == ['r1', 'r2']
+
+    metrics = summarize(rows)
+    assert metrics['runs'] == 2
+    assert metrics['failures'] == 0
+    assert metrics['latency_p50'] == 2.0
+    assert metrics['jobs_per_second'] == 4.0
+    assert metrics['new_jobs_per_run'] == 2.0
+    assert metrics['mb_fetched'] == 2.0
+    assert summarize(load_rows(30, 'meritmind', db_file))['failures'] == 1
+
+
+def test_rerecording_a_run_replaces_its_rows(workdir):
+    db_file = str(workdir / 'history.db')
+    now = datetime.now().isoformat(timespec='seconds')
+    record_run('r1', now, {'poolia': {'status': 'failed'}}, db_file)
+    record_run('r1', now, {'poolia': {'status': 'published', 'jobs': 5}}, db_file)
+
+    rows = load_rows(1, db_file=db_file)
+    assert [(row['status'], row['jobs']) for row in rows] == [('published', 5)]
+
+
+def test_report_prints_one_line_per_source_and_day(workdir, capsys):
+    db_file = str(workdir / 'history.db')
+    record_run('r1', datetime.now().isoformat(timespec='seconds'),
+               {'poolia': {'status': 'published', 'jobs': 5}, 'sjr': {'status': 'published'}}, db_file)
+
+    report(days=7, by_day=True, db_file=db_file)
+    lines = capsys.readouterr().out.splitlines()
+    assert sum(line.startswith(('poolia ', 'sjr ')) for line in lines) == 2
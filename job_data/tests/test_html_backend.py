@@ -0,0 +1,53 @@
+import importlib
+
+import pytest
+
+import html_backend
+import run_all_scrapers
+from conftest import fixture_text
+
+pytestmark = pytest.mark.skipif(not html_backend.AVAILABLE, reason="needs selectolax or lxml+cssselect")
+
+# Saved listing pages (trimmed to the listing markup) and the jobs each must yield
+EXPECTED = {
+    'bravura': [
+        ('Infrastruktur- och molnspecialist till Unionen',
+         'https://ledigajobb.bravura.se/sv/jobs/6077237-infrastruktur-och-molnspecialist-till-unionen'),
+        ('Platschef till Takab', 'https://ledigajobb.bravura.se/sv/jobs/5987695-platschef-till-takab'),
+        ('Application Manager till Hydroscand',
+         'https://ledigajobb.bravura.se/sv/jobs/6067098-application-manager-till-hydroscand'),
+    ],
+    'amendo': [
+        ('Konsult inom rekrytering Stockholm · Heltid', 'https://jobb.amendo.se/jobs/5821144-konsult-inom-rekrytering'),
+        ('Ekonomiassistent Uppsala', 'https://jobb.amendo.se/jobs/5790341-ekonomiassistent'),
+    ],
+    'meritmind': [
+        ('Financial Controller till Life Science bolag, Uppsala',
+         'https://meritmind.se/karriar/lediga-jobb/financial-controller-uppsala/'),
+        ('Projektledare till takbolag inför certifiering, Uppsala',
+         'https://meritmind.se/karriar/lediga-jobb/projektledare-till-takbolag-infor-certifiering-uppsala/'),
+    ],
+}
+
+
+@pytest.mark.parametrize('source', sorted(EXPECTED))
+def test_saved_page(source):
+    module = importlib.import_module(f'{source}_scraper')
+    link_field = getattr(module, 'LINK_FIELD', 'link')
+    jobs = html_backend.parse_html_jobs(fixture_text(f'html/{source}.html'), module)
+    assert [(job['title'], job[link_field]) for job in jobs] == EXPECTED[source]
+    assert all(set(module.FIELDNAMES) <= set(job) for job in jobs)
+
+
+def test_html_sources_try_html_first():
+    module = importlib.import_module('bravura_scraper')
+    assert run_all_scrapers.source_backends(module) == ['html', 'jina']
+
+
+def test_missing_parser_warns_once(monkeypatch, capsys):
+    monkeypatch.setattr(run_all_scrapers, 'HTML_BACKEND_AVAILABLE', False)
+    monkeypatch.setattr(run_all_scrapers, '_html_backend_warned', set())
+    module = importlib.import_module('bravura_scraper')
+    assert run_all_scrapers.source_backends(module) == ['jina']
+    assert run_all_scrapers.source_backends(module) == ['jina']
+    assert capsys.readouterr().out.count('Warning') == 1
@@ -0,0 +1,79 @@
+import sqlite3
+
+import lifecycle
+from lifecycle import canonical_link, record_run
+
+
+def rows(db_file):
+    connection = lifecycle.connect(db_file)
+    try:
+        return {row['link']: dict(row) for row in connection.execute("SELECT * FROM postings")}
+    finally:
+        connection.close()
+
+
+def test_canonical_link_drops_tracking_and_trailing_slash():
+    assert (canonical_link('HTTPS://Poolia.se/jobb/1/?utm_source=x&b=2&a=1&fbclid=y')
+            == 'https://poolia.se/jobb/1?a=1&b=2')
+
+
+def test_new_seen_again_closed_and_reopened(workdir):
+    db_file = str(workdir / 'lifecycle.db')
+    a = {'link': 'https://x.se/jobb/a', 'title': 'Jurist', 'employer': 'Vinge'}
+    b = {'link': 'https://x.se/jobb/b/', 'title': 'Ekonom'}
+
+    assert record_run({'sjr': ([a, b], None, 'link')}, '2025-06-01T08:00:00', db_file) == {'sjr': (2, 0, 0)}
+    assert record_run({'sjr': ([a], None, 'link')}, '2025-06-02T08:00:00', db_file) == {'sjr': (0, 1, 1)}
+    postings = rows(db_file)
+    assert postings['https://x.se/jobb/b']['closed_at'] == '2025-06-02T08:00:00'
+    assert postings['https://x.se/jobb/a']['employer_key'] == 'vinge'
+
+    assert record_run({'sjr': ([a, b], None, 'link')}, '2025-06-03T08:00:00', db_file) == {'sjr': (0, 2, 0)}
+    postings = rows(db_file)
+    assert postings['https://x.se/jobb/b']['closed_at'] is None
+    assert postings['https://x.se/jobb/b']['first_seen'] == '2025-06-01T08:00:00'
+
+
+def test_sources_without_a_snapshot_keep_their_postings_open(workdir):
+    db_file = str(workdir / 'lifecycle.db')
+    record_run({'sjr': ([{'link': 'https://x.se/jobb/a'}], None, 'link'),
+                'poolia': ([{'job_url': 'https://poolia.se/jobb/1'}], None, 'job_url')}, '2025-06-01T08:00:00', db_file)
+    record_run({'poolia': ([{'job_url': 'https://poolia.se/jobb/1'}], None, 'job_url')}, '2025-06-02T08:00:00', db_file)
+
+    assert [job['link'] for job in lifecycle.active_jobs('sjr', db_file)] == ['https://x.se/jobb/a']
+
+
+def test_fallback_links_are_not_tracked(workdir):
+    db_file = str(workdir / 'lifecycle.db')
+    # Parsers link listings without a URL of their own to the homepage
+    jobs = [{'link': 'https://sjr.se', 'title': 'Jurist'}, {'link': 'https://sjr.se/', 'title': 'Ekonom'},
+            {'link': 'https://sjr.se/om-oss', 'title': 'Om SJR'},
+            {'link': 'https://sjr.se/lediga-jobb/controller', 'title': 'Controller'}]
+    snapshot = (jobs, r'https://sjr\.se/(lediga-)?jobb/[^?#]+', 'link')
+
+    assert record_run({'sjr': snapshot}, '2025-06-01T08:00:00', db_file) == {'sjr': (1, 0, 0)}
+    assert list(rows(db_file)) == ['https://sjr.se/lediga-jobb/controller']
+
+
+def test_same_link_on_two_boards_stays_two_postings(workdir):
+    db_file = str(workdir / 'lifecycle.db')
+    job = {'link': 'https://x.se/jobb/a', 'title': 'Jurist'}
+    record_run({'sjr': ([job], None, 'link'), 'wise': ([job], None, 'link')}, '2025-06-01T08:00:00', db_file)
+    record_run({'sjr': ([], None, 'link')}, '2025-06-02T08:00:00', db_file)
+
+    assert [job['source'] for job in lifecycle.active_jobs(db_file=db_file)] == ['wise']
+
+
+def test_link_keyed_tables_are_migrated(workdir):
+    db_file = str(workdir / 'lifecycle.db')
+    connection = sqlite3.connect(db_file)
+    connection.execute("CREATE TABLE postings (link TEXT PRIMARY KEY, source TEXT NOT NULL, title TEXT, "
+                       "apply_by_date TEXT, first_seen TEXT NOT NULL, last_seen TEXT NOT NULL, closed_at TEXT)")
+    connection.execute("INSERT INTO postings VALUES ('https://x.se/jobb/a', 'sjr', 'Jurist', NULL, "
+                       "'2025-06-01T08:00:00', '2025-06-01T08:00:00', NULL)")
+    connection.commit()
+    connection.close()
+
+    job = {'link': 'https://x.se/jobb/a', 'title': 'Jurist'}
+    assert record_run({'sjr': ([job], None, 'link'), 'wise': ([job], None, 'link')},
+                      '2025-06-02T08:00:00', db_file) == {'sjr': (0, 1, 0), 'wise': (1, 0, 0)}
@@ -0,0 +1,35 @@
+from matcher import SavedSearchIndex, job_terms, normalize_query
+
+
+def test_job_terms_include_compound_word_endings():
+    terms = job_terms("Bolagsjurist")
+    assert {'bolagsjurist', 'jurist', 'sjurist'} <= terms
+    assert 'rist' in terms
+    assert 'ist' not in terms
+
+
+def test_search_matches_only_when_all_terms_hit():
+    index = SavedSearchIndex()
+    index.add('jurist', "jurist")
+    index.add('jurist-uppsala', "Jurist Uppsala")
+    index.add('empty', "  ")
+    assert len(index) == 2
+
+    assert index.match("Bolagsjurist Stockholm") == {'jurist'}
+    assert index.match("Bolagsjurist Uppsala") == {'jurist', 'jurist-uppsala'}
+    assert index.match("Ekonom Uppsala") == set()
+
+
+def test_match_jobs_keys_by_link_and_reads_every_field():
+    index = SavedSearchIndex()
+    index.add('controller-gbg', "controller göteborg")
+    jobs = [
+        {'link': 'a', 'title': 'Controller', 'city': 'Göteborg'},
+        {'link': 'b', 'title': 'Controller', 'city': None},
+        {'link': 'c', 'title': None, 'occupation': 'Business controller', 'city': 'Göteborg'},
+    ]
+    assert index.match_jobs(jobs) == {'a': {'controller-gbg'}, 'b': set(), 'c': {'controller-gbg'}}
+
+
+def test_normalize_query_ignores_order_case_and_repeats():
+    assert normalize_query("Jurist  uppsala jurist") == normalize_query("UPPSALA, jurist") == "jurist uppsala"
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from normalize import SCHEMA, load_normalized, normalize_frame
+
+
+def frame(rows):
+    return pd.DataFrame(rows, dtype=str)
+
+
+def test_maps_source_layouts_and_dates():
+    poolia = normalize_frame(frame([{'title': 'Ekonom', 'job_url': 'https://poolia.se/1', 'data_added': '01/06/25',
+                                     'apply_by_date': '15/06/25', 'published_date': 'not a date'}]), 'poolia')
+    row = poolia.iloc[0]
+    assert list(poolia.columns) == SCHEMA
+    assert row['link'] == 'https://poolia.se/1'
+    assert row['date_added_iso'] == '2025-06-01'
+    assert row['date_added_day'] == 20240
+    assert row['apply_by_date_day'] == 20254
+    assert pd.isna(row['published_date_day'])
+
+
+def test_arbetsformedlingen_rows_get_ad_links_and_ids():
+    af = normalize_frame(frame([{'id': '29841', 'occupation': 'Jurist', 'city': 'Uppsala'}]), 'arbetsformedlingen')
+    assert af.iloc[0]['id'] == 'arbetsformedlingen-29841'
+    assert af.iloc[0]['title'] == 'Jurist'
+    assert af.iloc[0]['link'].endswith('/annonser/29841')
+
+
+def test_ids_are_unique_when_rows_share_a_fallback_link():
+    rows = frame([
+        {'title': 'Konsult', 'link': 'https://sjr.se'},
+        {'title': 'Controller', 'link': 'https://sjr.se'},
+        {'title': 'Controller', 'link': 'https://sjr.se'},
+        {'title': 'Controller', 'link': 'https://sjr.se/jobb/1'},
+    ])
+    ids = normalize_frame(rows, 'sjr')['id']
+    assert ids.is_unique
+    assert ids.iloc[2] == ids.iloc[1] + '-1'
+    # Stable across runs
+    assert normalize_frame(rows, 'sjr')['id'].tolist() == ids.tolist()
+
+
+def test_load_normalized_ids_are_unique_across_sources(workdir):
+    frame([{'title': 'Jurist', 'link': 'https://x.se'}] * 2).to_csv(workdir / 'sjr_jobs.csv', index=False)
+    frame([{'title': 'Jurist', 'link': 'https://x.se'}]).to_csv(workdir / 'wise_jobs.csv', index=False)
+    assert load_normalized()['id'].is_unique
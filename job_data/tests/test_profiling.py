@@ -0,0 +1,40 @@
+import os
+import pstats
+import time
+
+from profiling import NullProfiler, ProfileSession
+
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    data = []
+    while time.perf_counter() < end:
+        data.append(sum(range(100)))
+    return data
+
+
+def test_session_writes_profiles_allocations_and_stacks(workdir):
+    session = ProfileSession(str(workdir / 'profiles'))
+    session.start()
+    profiler = session.source('poolia')
+    with profiler.stage('parse'):
+        busy(0.05)
+    with profiler.stage('parse'):
+        busy(0.01)
+    timings = session.save()
+
+    assert set(timings) == {'poolia'}
+    assert timings['poolia']['parse'] >= 0.06
+    output = workdir / 'profiles'
+    assert sorted(os.listdir(output)) == ['poolia.alloc.txt', 'poolia.collapsed', 'poolia.parse.prof']
+    assert 'busy' in {name for _, _, name in pstats.Stats(str(output / 'poolia.parse.prof')).stats}
+    assert (output / 'poolia.alloc.txt').read_text().startswith('== poolia parse:')
+    collapsed = (output / 'poolia.collapsed').read_text().splitlines()
+    assert collapsed and all(line.startswith('parse;') for line in collapsed)
+
+
+def test_null_profiler_is_a_no_op():
+    profiler = NullProfiler()
+    assert profiler.enabled is False
+    with profiler.stage('fetch'):
+        pass
@@ -0,0 +1,76 @@
+import os
+
+from classifier import categorize_csv
+from publisher import file_hash, load_manifest, publish_csv
+
+FIELDNAMES = ['title', 'link']
+ROWS = [{'title': 'Jurist', 'link': 'a', 'extra': 'ignored'}, {'title': 'Ekonom', 'link': 'b'}]
+
+
+def leftover_temp_files(directory):
+    return [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+
+def test_publish_writes_file_and_manifest(workdir):
+    assert publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS) is True
+
+    with open('poolia_jobs.csv', encoding='utf-8') as f:
+        assert f.read().splitlines() == ['title,link', 'Jurist,a', 'Ekonom,b']
+    entry = load_manifest()['poolia_jobs.csv']
+    assert entry['rows'] == 2
+    assert entry['bytes'] == os.path.getsize('poolia_jobs.csv')
+    assert leftover_temp_files(workdir) == []
+
+
+def test_unchanged_rows_keep_file_and_hash(workdir):
+    publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS)
+    mtime = os.stat('poolia_jobs.csv').st_mtime_ns
+    entry = load_manifest()['poolia_jobs.csv']
+
+    assert publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS) is False
+    assert os.stat('poolia_jobs.csv').st_mtime_ns == mtime
+    assert load_manifest()['poolia_jobs.csv']['hash'] == entry['hash']
+    assert leftover_temp_files(workdir) == []
+
+
+def test_changed_rows_replace_file(workdir):
+    publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS)
+    old_hash = load_manifest()['poolia_jobs.csv']['hash']
+
+    assert publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS[:1]) is True
+    assert load_manifest()['poolia_jobs.csv']['rows'] == 1
+    assert load_manifest()['poolia_jobs.csv']['hash'] != old_hash
+
+
+def test_empty_rows_never_replace_published_file(workdir):
+    publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS)
+
+    assert publish_csv('poolia_jobs.csv', FIELDNAMES, []) is False
+    assert load_manifest()['poolia_jobs.csv']['rows'] == 2
+    with open('poolia_jobs.csv', encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 3
+
+
+def test_file_rewritten_outside_the_publisher_is_not_reported_unchanged(workdir):
+    publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS)
+    with open('poolia_jobs.csv', 'w', encoding='utf-8') as f:
+        f.write('title,link\nSomething else,c\n')
+
+    assert publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS) is True
+    with open('poolia_jobs.csv', encoding='utf-8') as f:
+        assert f.read().splitlines() == ['title,link', 'Jurist,a', 'Ekonom,b']
+
+
+def test_categorize_csv_publishes_through_the_manifest(workdir):
+    publish_csv('poolia_jobs.csv', FIELDNAMES, ROWS)
+    old = load_manifest()['poolia_jobs.csv']
+
+    assert categorize_csv('poolia_jobs.csv') == 2
+    entry = load_manifest()['poolia_jobs.csv']
+    assert entry['hash'] != old['hash']
+    assert entry['hash'] == file_hash('poolia_jobs.csv')
+    assert entry['mtime_ns'] == str(os.stat('poolia_jobs.csv').st_mtime_ns)
+    assert leftover_temp_files(workdir) == []
+    # Re-running changes nothing
+    assert categorize_csv('poolia_jobs.csv') == 2
+    assert load_manifest()['poolia_jobs.csv'] == entry
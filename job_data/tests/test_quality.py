@@ -0,0 +1,58 @@
+import pandas as pd
+
+from quality import assess, assess_run, grade
+
+PATTERN = r'https://example\.com/jobs/\d+'
+
+
+def good_jobs(count):
+    return [{'title': f'Jurist {i}', 'link': f'https://example.com/jobs/{i}'} for i in range(count)]
+
+
+def test_clean_output_scores_one():
+    metrics = assess_run({'good': (good_jobs(10), PATTERN, 'link')})
+    assert metrics.loc['good', 'rows'] == 10
+    assert metrics.loc['good', 'score'] == 1.0
+    assert grade(metrics.loc['good', 'score']) == "🟢 Excellent"
+
+
+def test_navigation_junk_is_flagged(workdir):
+    junk = [{'title': '![Image 1: logo', 'link': 'https://example.com/'}] * 4
+    _, alerts = assess({'junk': (junk, PATTERN, 'link')})
+    messages = [message for source, message in alerts if source == 'junk']
+    assert any('look like job pages' in m for m in messages)
+    assert any('duplicate rows' in m for m in messages)
+    assert any('markup leftovers' in m for m in messages)
+
+
+def test_row_drop_against_baseline(workdir):
+    for _ in range(3):
+        assess({'source': (good_jobs(20), PATTERN, 'link')})
+    _, alerts = assess({'source': (good_jobs(5), PATTERN, 'link')})
+    assert any('below baseline' in message for _, message in alerts)
+
+
+def test_empty_source_reports_no_rows(workdir):
+    _, alerts = assess({'empty': ([], PATTERN, 'link')})
+    assert alerts == [('empty', 'no rows parsed')]
+
+
+def test_failed_runs_do_not_lower_the_baseline(workdir):
+    for _ in range(3):
+        assess({'source': (good_jobs(20), PATTERN, 'link')}, baseline_sources={'source'})
+    for _ in range(3):
+        _, alerts = assess({'source': ([], PATTERN, 'link')}, baseline_sources=set())
+        assert alerts == [('source', 'no rows parsed')]
+    # A rejected drop is not complete either, so it must not become the new normal
+    assess({'source': (good_jobs(5), PATTERN, 'link')}, baseline_sources=set())
+
+    metrics, alerts = assess({'source': (good_jobs(5), PATTERN, 'link')})
+    assert metrics.loc['source', 'baseline_rows'] == 20
+    assert any('below baseline' in message for _, message in alerts)
+
+
+def test_thin_baseline_skips_the_drop_check(workdir):
+    assess({'source': (good_jobs(20), PATTERN, 'link')})
+    metrics, alerts = assess({'source': (good_jobs(2), PATTERN, 'link')})
+    assert pd.isna(metrics.loc['source', 'rows_change'])
+    assert alerts == []
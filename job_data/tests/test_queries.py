@@ -0,0 +1,26 @@
+import importlib
+
+import poolia_scraper
+from queries import CITIES, expand_urls
+from run_all_scrapers import SCRAPERS
+
+
+def test_default_query_renders_url():
+    assert expand_urls(poolia_scraper, {}) == [poolia_scraper.URL]
+
+
+def test_selection_expands_and_skips_unknown_values():
+    urls = expand_urls(poolia_scraper, {'city': ['malmo', 'kiruna', 'malmo']})
+    assert urls == ['https://www.poolia.se/lediga-jobb/malmo']
+    assert expand_urls(poolia_scraper, {'city': ['kiruna']}) == [poolia_scraper.URL]
+
+
+def test_all_crawls_every_value(monkeypatch):
+    monkeypatch.setenv('SCRAPE_CITIES', 'all')
+    assert len(expand_urls(poolia_scraper)) == len(poolia_scraper.QUERY_MATRIX['city'])
+
+
+def test_every_source_city_is_a_known_city():
+    for source in SCRAPERS:
+        matrix = getattr(importlib.import_module(f'{source}_scraper'), 'QUERY_MATRIX', None) or {}
+        assert set(matrix.get('city', {})) <= set(CITIES), source
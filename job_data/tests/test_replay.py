@@ -0,0 +1,44 @@
+import os
+import urllib.error
+import urllib.request
+
+import pytest
+
+import replay
+from replay import FIXTURE_RECORDINGS_DIR, listed_urls, load_index, start_server
+
+URLS = listed_urls(os.path.join(os.path.dirname(os.path.abspath(replay.__file__)), 'urls.txt'))
+
+
+def test_fixture_recordings_cover_urls_txt():
+    index = load_index(FIXTURE_RECORDINGS_DIR)
+    assert {f'jina {url}' for url in URLS} <= set(index)
+    assert all(os.path.exists(os.path.join(FIXTURE_RECORDINGS_DIR, name)) for name in index.values())
+
+
+def test_server_replays_recordings_and_injects_faults():
+    server = start_server(recordings_dir=FIXTURE_RECORDINGS_DIR, throttle_rate=1.0)
+    base_url = f'http://127.0.0.1:{server.server_port}/jina/'
+    try:
+        with pytest.raises(urllib.error.HTTPError) as error:
+            urllib.request.urlopen(base_url + URLS[0])
+        assert error.value.code == 429
+        server.throttle_rate = 0.0
+        with urllib.request.urlopen(base_url + replay.replica_url(URLS[0], 3)) as response:
+            assert 'Markdown Content:' in response.read().decode('utf-8')
+    finally:
+        server.shutdown()
+
+
+@pytest.mark.skipif(not hasattr(os, 'wait4'), reason="the benchmark measures the runner with os.wait4")
+def test_benchmark_publishes_every_source_from_fixtures():
+    server = start_server(recordings_dir=FIXTURE_RECORDINGS_DIR)
+    try:
+        result = replay.run_benchmark(1, f'http://127.0.0.1:{server.server_port}')
+    finally:
+        server.shutdown()
+
+    assert result['exit_code'] == 0
+    assert result['published'] == result['sources'] == len(URLS)
+    assert result['rows'] > 0
+    assert server.stats['missing'] == 0
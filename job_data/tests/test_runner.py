@@ -0,0 +1,88 @@
+import os
+
+import run_all_scrapers
+from breaker import CircuitBreaker
+from run_all_scrapers import count_new_jobs, dedupe_jobs, load_jobs
+
+
+def test_dedupe_keeps_first_of_each_link_and_title():
+    jobs = [
+        {'link': 'a', 'title': 'Jurist', 'city': 'uppsala'},
+        {'link': 'a', 'title': 'Jurist', 'city': 'stockholm'},
+        {'link': 'a', 'title': 'Advokat'},
+        {'link': 'b', 'title': 'Jurist'},
+    ]
+    assert dedupe_jobs(jobs, 'link') == [jobs[0], jobs[2], jobs[3]]
+
+
+def test_count_new_jobs_uses_link_field():
+    previous = [{'job_url': 'a'}, {'job_url': 'b'}]
+    jobs = [{'job_url': 'a'}, {'job_url': 'c'}, {'job_url': 'd'}]
+    assert count_new_jobs(jobs, previous, 'job_url') == 2
+
+
+def poolia_page(url, jobs=(), content=True, error=None):
+    return {'url': url, 'content': 'page' if content else None, 'backend': 'jina', 'jobs': list(jobs),
+            'unchanged': False, 'latency': 0.1, 'bytes': 4, 'error': error}
+
+
+def poolia_job(number, city):
+    return {'title': f'Ekonom {number}', 'job_url': f'https://www.poolia.se/lediga-jobb/{city}/ekonom/{number}',
+            'published_date': '', 'apply_by_date': '', 'data_added': '01/06/25', 'categories': '', 'employer': ''}
+
+
+def run_poolia(monkeypatch, pages):
+    monkeypatch.setattr(run_all_scrapers, 'fetch_page', lambda name, module, url, api_key, profiler: pages[url])
+    monkeypatch.setattr(run_all_scrapers, 'source_urls', lambda module, selection=None: list(pages))
+    breaker = CircuitBreaker()
+    return run_all_scrapers.run_scraper('poolia', breaker), breaker
+
+
+def test_partial_crawl_keeps_previous_csv(workdir, monkeypatch):
+    pages = {
+        'https://www.poolia.se/lediga-jobb/uppsala': poolia_page('u', [poolia_job(i, 'uppsala') for i in range(3)]),
+        'https://www.poolia.se/lediga-jobb/malmo': poolia_page('m', content=False),
+    }
+    result, breaker = run_poolia(monkeypatch, pages)
+
+    assert result['status'] == 'partial'
+    assert result['error'].startswith('1 of 2 pages failed')
+    assert len(result['jobs']) == 3
+    assert not os.path.exists('poolia_jobs.csv')
+    assert breaker.status('poolia')['consecutive_failures'] == 1
+
+
+def test_page_whose_parser_failed_counts_as_failed(workdir, monkeypatch):
+    pages = {
+        'https://www.poolia.se/lediga-jobb/uppsala': poolia_page('u', [poolia_job(i, 'uppsala') for i in range(3)]),
+        'https://www.poolia.se/lediga-jobb/malmo': poolia_page('m', error="Parser timed out (5s)"),
+    }
+    result, _ = run_poolia(monkeypatch, pages)
+    assert result['status'] == 'partial'
+    assert 'Parser timed out' in result['error']
+
+
+def test_complete_crawl_is_published(workdir, monkeypatch):
+    pages = {
+        'https://www.poolia.se/lediga-jobb/uppsala': poolia_page('u', [poolia_job(i, 'uppsala') for i in range(3)]),
+        'https://www.poolia.se/lediga-jobb/malmo': poolia_page('m', [poolia_job(i, 'malmo') for i in range(3, 5)]),
+    }
+    result, breaker = run_poolia(monkeypatch, pages)
+
+    assert result['status'] == 'published'
+    assert len(load_jobs('poolia_jobs.csv')) == 5
+    assert breaker.status('poolia')['state'] == 'closed'
+
+
+def test_only_complete_crawls_are_lifecycle_snapshots(workdir, monkeypatch):
+    partial = {
+        'https://www.poolia.se/lediga-jobb/uppsala': poolia_page('u', [poolia_job(1, 'uppsala')] * 3),
+        'https://www.poolia.se/lediga-jobb/malmo': poolia_page('m', content=False),
+    }
+    result, _ = run_poolia(monkeypatch, partial)
+    assert result['complete'] is False
+
+    complete = {'https://www.poolia.se/lediga-jobb/uppsala':
+                poolia_page('u', [poolia_job(i, 'uppsala') for i in range(3)])}
+    result, _ = run_poolia(monkeypatch, complete)
+    assert result['complete'] is True
@@ -0,0 +1,58 @@
+import importlib
+import inspect
+import re
+
+import pytest
+
+import run_all_scrapers
+from run_all_scrapers import SCRAPERS, fetch_page
+from profiling import NullProfiler
+from sandbox import ParserError, ParserTimeout, fuzz_source, parse_sandboxed, parser_patterns
+
+
+@pytest.mark.parametrize('source', SCRAPERS)
+def test_scrapers_declare_every_regex_they_run(source):
+    module = importlib.import_module(f'{source}_scraper')
+    assert module.PATTERNS and all(isinstance(pattern, re.Pattern) for pattern in module.PATTERNS)
+    # The parser may only use the declared patterns, never an inline regex
+    assert 're.' not in inspect.getsource(getattr(module, f'parse_{source}_jobs'))
+
+
+def test_parser_patterns_include_tagging_and_html_link_patterns():
+    module = importlib.import_module('bravura_scraper')
+    patterns = parser_patterns('html', 'bravura')
+    assert (module.JOB_PATTERN.pattern, module.JOB_PATTERN.flags) in patterns
+    assert (module.JOB_URL_PATTERN, re.UNICODE) in patterns
+    assert any('till|hos|at|to' in pattern for pattern, _ in patterns)
+    assert len(patterns) == len(set(patterns))
+
+
+def test_sandbox_reports_parser_crash():
+    with pytest.raises(ParserError, match='TypeError'):
+        parse_sandboxed('jina', 'poolia', None, timeout=30)
+
+
+def test_parser_timeout_kills_the_child(monkeypatch):
+    with pytest.raises(ParserTimeout):
+        parse_sandboxed('jina', 'sjr', 'Konsult: ' + ' ' * 200_000 + 'x' * 50_000, timeout=0.01)
+
+
+def test_fetch_page_records_parser_crash_as_page_failure(monkeypatch):
+    module = importlib.import_module('poolia_scraper')
+    monkeypatch.setattr(run_all_scrapers, 'fetch_content', lambda backend, module, api_key, url: 'page')
+    monkeypatch.setattr(run_all_scrapers, 'content_changed', lambda url, content, csv_file: True)
+
+    def crash(backend, scraper_name, content):
+        raise ParserError("AttributeError: 'NoneType' object has no attribute 'group'")
+    monkeypatch.setattr(run_all_scrapers, 'parse_sandboxed', crash)
+
+    page = fetch_page('poolia', module, module.URL, None, NullProfiler())
+    assert page['jobs'] == []
+    assert page['error'].startswith('Parser failed (AttributeError')
+
+
+def test_sjr_title_pattern_stays_linear_on_the_fuzz_corpus(workdir):
+    module = importlib.import_module('sjr_scraper')
+    assert module.JOB_PATTERNS[0].findall('Jurist - SJR') == ['Jurist']
+    # The old (.*?)\s*-\s*SJR pattern took minutes on 20k characters of repeated separators
+    assert fuzz_source('sjr', sizes=(20_000,), budget=2.0) == []
@@ -0,0 +1,40 @@
+from meritmind_scraper import parse_meritmind_jobs
+from poolia_scraper import normalize_date, parse_poolia_jobs
+
+MERITMIND_PAGE = """
+[![Image 1: Meritmind](https://meritmind.se/logo.svg)](https://meritmind.se/)
+[Lediga jobb](https://meritmind.se/karriar/lediga-jobb/)
+[### Ekonomer sökes till Uppsala](https://meritmind.se/karriar/lediga-jobb/ekonomer-sokes-till-uppsala-2/)
+[Financial Controller](https://meritmind.se/karriar/lediga-jobb/financial-controller-uppsala/)
+[Financial Controller](https://meritmind.se/karriar/lediga-jobb/financial-controller-uppsala/)
+"""
+
+POOLIA_PAGE = """
+[Redovisningsekonom](https://www.poolia.se/lediga-jobb/uppsala/redovisningsekonom/73816)
+Publicerad: 2025-05-13 Sista ansökningsdag: 15.06.2025
+[Lönespecialist](https://www.poolia.se/lediga-jobb/uppsala/lonespecialist/73900)
+[Om Poolia](https://www.poolia.se/om-oss)
+"""
+
+
+def test_meritmind_keeps_job_pages_once():
+    jobs = parse_meritmind_jobs(MERITMIND_PAGE)
+    assert [job['title'] for job in jobs] == ['Ekonomer sökes till Uppsala', 'Financial Controller']
+    assert all(job['link'].startswith('https://meritmind.se/karriar/lediga-jobb/') for job in jobs)
+    assert all(job['data_added'] for job in jobs)
+
+
+def test_poolia_reads_card_dates():
+    jobs = parse_poolia_jobs(POOLIA_PAGE)
+    assert [job['title'] for job in jobs] == ['Redovisningsekonom', 'Lönespecialist']
+    assert jobs[0]['published_date'] == '13/05/25'
+    assert jobs[0]['apply_by_date'] == '15/06/25'
+    assert jobs[1]['published_date'] == '' and jobs[1]['apply_by_date'] == ''
+
+
+def test_normalize_date_formats():
+    assert normalize_date('2025-06-12') == '12/06/25'
+    assert normalize_date('12/06/2025') == '12/06/25'
+    assert normalize_date('12.06.25') == '12/06/25'
+    assert normalize_date('next week') == ''
+    assert normalize_date(None) == ''
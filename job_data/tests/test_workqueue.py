@@ -0,0 +1,112 @@
+import time
+
+import workqueue
+from workqueue import DONE, FAILED, LEASED, MAX_ATTEMPTS, PENDING
+
+
+def open_queue(workdir):
+    return workqueue.connect(str(workdir / 'queue.db'))
+
+
+def test_enqueue_is_idempotent_and_claim_leases_oldest(workdir):
+    connection = open_queue(workdir)
+    workqueue.enqueue(connection, 'run', 'poolia', 'https://a', 1)
+    workqueue.enqueue(connection, 'run', 'poolia', 'https://a', 1)
+    workqueue.enqueue(connection, 'run', 'poolia', 'https://b', 2)
+    assert workqueue.run_counts(connection, 'run') == {PENDING: 2}
+
+    task = workqueue.claim(connection, 'w1')
+    assert (task['url'], task['attempts']) == ('https://a', 1)
+    workqueue.complete(connection, task, 'w1', [{'title': 'Jurist'}])
+    workqueue.complete(connection, task, 'w2', [])
+    assert workqueue.run_counts(connection, 'run') == {DONE: 1, PENDING: 1}
+
+
+def test_failed_task_is_retried_until_max_attempts(workdir):
+    connection = open_queue(workdir)
+    workqueue.enqueue(connection, 'run', 'poolia', 'https://a', 1)
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        task = workqueue.claim(connection, 'w1')
+        assert task['attempts'] == attempt
+        workqueue.fail(connection, task, 'w1', 'boom')
+    assert workqueue.claim(connection, 'w1') is None
+    assert workqueue.run_counts(connection, 'run') == {FAILED: 1}
+
+
+def test_coordinator_side_reaping_requeues_then_fails_expired_leases(workdir):
+    connection = open_queue(workdir)
+    workqueue.enqueue(connection, 'run', 'poolia', 'https://a', 1)
+    workqueue.claim(connection, 'w1', lease_seconds=0)
+    assert workqueue.run_counts(connection, 'run') == {LEASED: 1}
+
+    assert workqueue.reap_expired(connection, 'run', now=time.time() + 1) == 1
+    assert workqueue.run_counts(connection, 'run') == {PENDING: 1}
+
+    connection.execute("UPDATE tasks SET attempts = ?", (MAX_ATTEMPTS - 1,))
+    assert workqueue.claim(connection, 'w1', lease_seconds=0)['attempts'] == MAX_ATTEMPTS
+    assert workqueue.reap_expired(connection, 'run', now=time.time() + 1) == 1
+    row = connection.execute("SELECT status, error FROM tasks").fetchone()
+    assert (row['status'], row['error']) == (FAILED, 'lease expired')
+
+
+def test_coordinator_times_out_without_workers(workdir):
+    db_file = str(workdir / 'queue.db')
+    started = time.monotonic()
+    run_id = workqueue.coordinator(['poolia'], timeout=0, db_file=db_file)
+    assert time.monotonic() - started < 5
+
+    connection = workqueue.connect(db_file)
+    counts = workqueue.run_counts(connection, run_id)
+    assert set(counts) == {FAILED}
+    assert counts[FAILED] > 0
+
+
+def test_collect_snapshots_only_complete_sources(workdir):
+    from breaker import CircuitBreaker
+
+    connection = open_queue(workdir)
+    jobs = [{'title': f'Ekonom {i}', 'job_url': f'https://www.poolia.se/lediga-jobb/uppsala/ekonom/{i}'}
+            for i in range(3)]
+    for source, page in (('poolia', 1), ('meritmind', 1), ('meritmind', 2)):
+        workqueue.enqueue(connection, 'run', source, f'https://{source}/{page}', page)
+    while (task := workqueue.claim(connection, 'w1')) is not None:
+        if task['page'] == 2:
+            workqueue.fail(connection, dict(task, attempts=MAX_ATTEMPTS), 'w1', 'boom')
+        else:
+            rows = jobs if task['source'] == 'poolia' else [
+                {'title': 'Controller', 'link': 'https://meritmind.se/karriar/lediga-jobb/controller/'}]
+            workqueue.complete(connection, task, 'w1', rows)
+
+    results, outputs, snapshots = workqueue.collect(connection, 'run', CircuitBreaker())
+    assert results['poolia']['status'] == 'published'
+    assert results['meritmind']['status'] == 'partial'
+    assert set(outputs) == {'poolia', 'meritmind'}
+    assert set(snapshots) == {'poolia'}
+
+
+def test_no_wait_run_is_collected_later_with_worker_stats(workdir, monkeypatch):
+    import bundles
+    import history
+    import normalize
+    import run_all_scrapers
+
+    monkeypatch.setattr(run_all_scrapers, 'source_urls', lambda module, selection=None: ['https://poolia/1'])
+    monkeypatch.setattr(normalize, 'publish_normalized', lambda: None)
+    monkeypatch.setattr(bundles, 'publish_bundles', lambda: None)
+    db_file = str(workdir / 'queue.db')
+    run_id = workqueue.coordinator(['poolia'], wait=False, db_file=db_file)
+
+    connection = workqueue.connect(db_file)
+    task = workqueue.claim(connection, 'w1')
+    jobs = [{'title': f'Ekonom {i}', 'job_url': f'https://www.poolia.se/lediga-jobb/uppsala/ekonom/{i}'}
+            for i in range(3)]
+    workqueue.complete(connection, task, 'w1', jobs, fetch_bytes=2048, fetch_latency=0.5)
+    connection.close()
+
+    results = workqueue.collect_run(timeout=0, db_file=db_file)
+    assert results['poolia']['status'] == 'published'
+    assert (workdir / 'poolia_jobs.csv').exists()
+
+    [row] = history.load_rows(days=1)
+    assert (row['run_id'], row['jobs'], row['new_jobs']) == (run_id, 3, 3)
+    assert (row['fetch_bytes'], row['fetch_latency']) == (2048, 0.5)
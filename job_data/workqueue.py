@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Work-queue mode for the scrape runner.
+
+A coordinator enqueues one (source, url, page) task per page to crawl into a
+SQLite-backed queue; any number of worker processes claim tasks under a
+lease, fetch and parse them and store the parsed rows on the task. A task
+whose lease expires (worker died or hung) goes back to the queue until
+MAX_ATTEMPTS is reached. Task ids are derived from (run, source, url, page),
+so enqueueing twice or finishing a task twice has no effect. When every task
+of the run is settled the coordinator merges each source's pages, applies
+the quality gate and publishes the CSVs, then updates the posting
+lifecycle, the quality history and the combined outputs like the
+single-host runner does, recording the same per-source history (new jobs,
+fetch bytes and latency reported by the workers). The coordinator reaps
+expired leases itself while it waits, and gives up on tasks still open after
+--timeout seconds, so a run with no live workers still finishes. A run
+enqueued with --no-wait is waited for and published later by collect.
+
+    python workqueue.py coordinator            # enqueue, wait, publish
+    python workqueue.py worker                 # on any host sharing the queue
+    python workqueue.py status
+    python workqueue.py coordinator --no-wait  # enqueue only ...
+    python workqueue.py collect --run <id>     # ... wait for and publish it later
+
+The queue file is set with WORKQUEUE_DB; workers on other machines need it
+on a shared volume (SQLite locks must work there).
+"""
+import argparse
+import hashlib
+import importlib
+import json
+import os
+import socket
+import sqlite3
+import time
+import uuid
+from datetime import datetime
+
+QUEUE_DB = os.getenv('WORKQUEUE_DB', 'work_queue.db')
+LEASE_SECONDS = int(os.getenv('WORKQUEUE_LEASE_SECONDS', '300'))
+COORDINATOR_TIMEOUT = int(os.getenv('WORKQUEUE_TIMEOUT_SECONDS', '3600'))
+MAX_ATTEMPTS = 3
+POLL_INTERVAL = 2.0
+
+PENDING = 'pending'
+LEASED = 'leased'
+DONE = 'done'
+FAILED = 'failed'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    run_id TEXT NOT NULL,
+    source TEXT NOT NULL,
+    url TEXT NOT NULL,
+    page INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    fetch_bytes INTEGER,
+    fetch_latency REAL,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_claim ON tasks (status, lease_expires);
+CREATE INDEX IF NOT EXISTS tasks_run ON tasks (run_id);
+"""
+
+
+# Columns added after the first release, for queues created before them
+ADDED_COLUMNS = {'fetch_bytes': 'INTEGER', 'fetch_latency': 'REAL'}
+
+
+def connect(db_file=QUEUE_DB):
+    """Open the queue, creating it on first use"""
+    connection = sqlite3.connect(db_file, timeout=30, isolation_level=None)
+    connection.execute('PRAGMA journal_mode=WAL')
+    connection.executescript(SCHEMA)
+    columns = {row[1] for row in connection.execute("PRAGMA table_info(tasks)")}
+    for column, column_type in ADDED_COLUMNS.items():
+        if column not in columns:
+            connection.execute(f"ALTER TABLE tasks ADD COLUMN {column} {column_type}")
+    connection.row_factory = sqlite3.Row
+    return connection
+
+
+def task_id(run_id, source, url, page):
+    """Deterministic task id, so the same page is never queued twice for a run"""
+    return hashlib.sha1(f'{run_id}|{source}|{url}|{page}'.encode('utf-8')).hexdigest()[:20]
+
+
+def enqueue(connection, run_id, source, url, page=1):
+    """Add a task; a no-op if it is already queued"""
+    now = time.time()
+    connection.execute(
+        "INSERT OR IGNORE INTO tasks (id, run_id, source, url, page, status, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (task_id(run_id, source, url, page), run_id, source, url, page, PENDING, now, now)
+    )
+
+
+def claim(connection, worker_id, lease_seconds=LEASE_SECONDS):
+    """Lease the oldest available task (pending, or leased with an expired lease) or return None"""
+    now = time.time()
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        row = connection.execute(
+            "SELECT * FROM tasks WHERE (status = ? OR (status = ? AND lease_expires < ?)) "
+            "ORDER BY created_at LIMIT 1",
+            (PENDING, LEASED, now)
+        ).fetchone()
+        if row is None:
+            connection.execute('COMMIT')
+            return None
+        if row['attempts'] >= MAX_ATTEMPTS:
+            # Lease expired on the last attempt: give up on this task
+            connection.execute(
+                "UPDATE tasks SET status = ?, error = ?, updated_at = ? WHERE id = ?",
+                (FAILED, row['error'] or "lease expired", now, row['id'])
+            )
+            connection.execute('COMMIT')
+            return claim(connection, worker_id, lease_seconds)
+        connection.execute(
+            "UPDATE tasks SET status = ?, lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+            "updated_at = ? WHERE id = ?",
+            (LEASED, worker_id, now + lease_seconds, now, row['id'])
+        )
+        connection.execute('COMMIT')
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    return dict(row, attempts=row['attempts'] + 1)
+
+
+def complete(connection, task, worker_id, jobs, fetch_bytes=0, fetch_latency=None):
+    """Store a task's parsed rows and fetch stats; ignored if the lease was lost and the task already finished elsewhere"""
+    connection.execute(
+        "UPDATE tasks SET status = ?, result = ?, error = NULL, lease_owner = NULL, fetch_bytes = ?, "
+        "fetch_latency = ?, updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+        (DONE, json.dumps(jobs, ensure_ascii=False), fetch_bytes, fetch_latency, time.time(), task['id'],
+         LEASED, worker_id)
+    )
+
+
+def fail(connection, task, worker_id, error):
+    """Release a task after an error: back to the queue, or failed after MAX_ATTEMPTS"""
+    status = FAILED if task['attempts'] >= MAX_ATTEMPTS else PENDING
+    connection.execute(
+        "UPDATE tasks SET status = ?, error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+        "WHERE id = ? AND status = ? AND lease_owner = ?",
+        (status, error, time.time(), task['id'], LEASED, worker_id)
+    )
+
+
+def reap_expired(connection, run_id, now=None):
+    """Requeue a run's tasks whose lease expired, or fail them after MAX_ATTEMPTS; returns the number reaped"""
+    now = now or time.time()
+    connection.execute('BEGIN IMMEDIATE')
+    try:
+        failed = connection.execute(
+            "UPDATE tasks SET status = ?, error = COALESCE(error, 'lease expired'), lease_owner = NULL, "
+            "updated_at = ? WHERE run_id = ? AND status = ? AND lease_expires < ? AND attempts >= ?",
+            (FAILED, now, run_id, LEASED, now, MAX_ATTEMPTS)
+        ).rowcount
+        requeued = connection.execute(
+            "UPDATE tasks SET status = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+            "WHERE run_id = ? AND status = ? AND lease_expires < ?",
+            (PENDING, now, run_id, LEASED, now)
+        ).rowcount
+        connection.execute('COMMIT')
+    except BaseException:
+        connection.execute('ROLLBACK')
+        raise
+    return failed + requeued
+
+
+def abandon(connection, run_id, error):
+    """Fail every task of a run that is still open"""
+    return connection.execute(
+        "UPDATE tasks SET status = ?, error = ?, lease_owner = NULL, updated_at = ? "
+        "WHERE run_id = ? AND status IN (?, ?)",
+        (FAILED, error, time.time(), run_id, PENDING, LEASED)
+    ).rowcount
+
+
+def run_counts(connection, run_id):
+    """Task count per status for a run"""
+    rows = connection.execute("SELECT status, COUNT(*) FROM tasks WHERE run_id = ? GROUP BY status", (run_id,))
+    return dict(rows.fetchall())
+
+
+def run_started(connection, run_id):
+    """When a run was enqueued, as an ISO timestamp"""
+    row = connection.execute("SELECT MIN(created_at) AS created FROM tasks WHERE run_id = ?", (run_id,)).fetchone()
+    return datetime.fromtimestamp(row['created']).isoformat(timespec='seconds')
+
+
+def latest_run(connection):
+    """Id of the most recently enqueued run"""
+    row = connection.execute("SELECT run_id FROM tasks ORDER BY created_at DESC LIMIT 1").fetchone()
+    return row['run_id'] if row else None
+
+
+def process(task):
+    """
+    Fetch and parse one task's page, trying the source's backends in order.
+
+    Returns (jobs, stats), stats being the fetch_bytes and fetch_latency the runner records.
+    """
+    from run_all_scrapers import fetch_content, parse_content, source_backends
+    from sandbox import ParserError, ParserTimeout
+
+    module = importlib.import_module(f"{task['source']}_scraper")
+    api_key = os.getenv('JINA_API_KEY')
+    error = "Fetch failed"
+    stats = {'fetch_bytes': 0, 'fetch_latency': 0.0}
+    for backend in source_backends(module):
+        started = time.monotonic()
+        content = fetch_content(backend, module, api_key, task['url'])
+        stats['fetch_latency'] += time.monotonic() - started
+        if not content:
+            continue
+        stats['fetch_bytes'] += len(content.encode('utf-8'))
+        try:
+            jobs = parse_content(backend, task['source'], module, content)
+        except ParserTimeout as e:
+            error = f"Parser timed out ({e})"
+            continue
+        except ParserError as e:
+            error = f"Parser failed ({e})"
+            continue
+        if jobs:
+            return jobs, stats
+        error = "No jobs parsed"
+    raise RuntimeError(error)
+
+
+def worker(once=False, lease_seconds=LEASE_SECONDS, db_file=QUEUE_DB):
+    """Claim and process tasks until the queue is empty (once) or forever"""
+    worker_id = f'{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}'
+    connection = connect(db_file)
+    print(f"Worker {worker_id} polling {db_file}")
+    while True:
+        task = claim(connection, worker_id, lease_seconds)
+        if task is None:
+            if once:
+                break
+            time.sleep(POLL_INTERVAL)
+            continue
+
+        print(f"[{task['source']}] page {task['page']} attempt {task['attempts']}: {task['url']}")
+        try:
+            jobs, stats = process(task)
+        except Exception as e:
+            print(f"[{task['source']}] {type(e).__name__}: {e}")
+            fail(connection, task, worker_id, f"{type(e).__name__}: {e}")
+            continue
+        complete(connection, task, worker_id, jobs, **stats)
+        print(f"[{task['source']}] page {task['page']}: {len(jobs)} jobs")
+    connection.close()
+
+
+def collect(connection, run_id, breaker):
+    """
+    Merge each source's finished pages and publish them.
+
+    Returns (results, outputs, snapshots): per-source results, the parsed jobs
+    for quality scoring and the complete snapshots for the lifecycle.
+    """
+    from publisher import publish_csv
+    from quality import check_source
+    from run_all_scrapers import count_new_jobs, dedupe_jobs, load_jobs
+
+    results = {}
+    outputs = {}
+    snapshots = {}
+    sources = [row['source'] for row in connection.execute(
+        "SELECT DISTINCT source FROM tasks WHERE run_id = ? ORDER BY source", (run_id,))]
+    for source in sources:
+        module = importlib.import_module(f'{source}_scraper')
+        link_field = getattr(module, 'LINK_FIELD', 'link')
+        tasks = connection.execute(
+            "SELECT status, result, error, fetch_bytes, fetch_latency, created_at, updated_at FROM tasks "
+            "WHERE run_id = ? AND source = ?", (run_id, source)).fetchall()
+        jobs = dedupe_jobs([job for task in tasks if task['status'] == DONE for job in json.loads(task['result'])],
+                      link_field)
+        errors = [task['error'] for task in tasks if task['status'] == FAILED]
+        outputs[source] = (jobs, module.JOB_URL_PATTERN, link_field)
+        # Same fields the single-host runner records in the run history
+        latencies = [task['fetch_latency'] for task in tasks if task['fetch_latency'] is not None]
+        result = {
+            'jobs': 0, 'changed': False, 'csv_file': module.CSV_FILENAME, 'new_jobs': 0,
+            'fetch_bytes': sum(task['fetch_bytes'] or 0 for task in tasks),
+            'fetch_latency': max(latencies) if latencies else None,
+            'duration': max(task['updated_at'] for task in tasks) - min(task['created_at'] for task in tasks),
+        }
+        results[source] = result
+
+        def failed(reason, status='failed'):
+            breaker.record_failure(source, reason)
+            print(f"[{source}] {reason}, keeping last good {module.CSV_FILENAME}")
+            result.update(status=status, success=False, error=reason)
+
+        if not jobs:
+            failed(errors[0] if errors else "No jobs parsed")
+            continue
+
+        if errors:
+            # A missing page would drop its rows from the CSV, so a partial crawl is never published
+            failed(f"{len(errors)} of {len(tasks)} pages failed ({errors[0]})", 'partial')
+            continue
+
+        alerts = check_source(source, jobs, module.JOB_URL_PATTERN, link_field)
+        if alerts:
+            failed(f"Output rejected: {'; '.join(alerts)}", 'rejected')
+            continue
+
+        new_jobs = count_new_jobs(jobs, load_jobs(module.CSV_FILENAME), link_field)
+        changed = publish_csv(module.CSV_FILENAME, module.FIELDNAMES, jobs)
+        breaker.record_success(source)
+        print(f"[{source}] {len(jobs)} jobs from {len(tasks)} pages"
+              + ("" if changed else f", {module.CSV_FILENAME} unchanged"))
+        result.update(jobs=len(jobs), status='published', success=True, changed=changed, new_jobs=new_jobs,
+                      error=None)
+        snapshots[source] = outputs[source]
+    return results, outputs, snapshots
+
+
+def wait_for_run(connection, run_id, timeout=COORDINATOR_TIMEOUT):
+    """Reap expired leases until no task of the run is open, failing what is still open after timeout seconds"""
+    deadline = time.monotonic() + timeout
+    while True:
+        reaped = reap_expired(connection, run_id)
+        if reaped:
+            print(f"Reaped {reaped} tasks with expired leases")
+        counts = run_counts(connection, run_id)
+        open_tasks = counts.get(PENDING, 0) + counts.get(LEASED, 0)
+        if not open_tasks:
+            return
+        if time.monotonic() >= deadline:
+            abandon(connection, run_id, f"no worker finished it within {timeout}s")
+            print(f"Timed out after {timeout}s, failed {open_tasks} open tasks")
+            return
+        print(f"Waiting for workers: {open_tasks} open, {counts.get(DONE, 0)} done, {counts.get(FAILED, 0)} failed")
+        time.sleep(min(POLL_INTERVAL * 5, max(deadline - time.monotonic(), 0)))
+
+
+def finish_run(connection, run_id, breaker=None):
+    """Publish a settled run and record it like the single-host runner; returns the per-source results"""
+    from breaker import CircuitBreaker
+    from bundles import publish_bundles
+    from history import record_run
+    from lifecycle import record_run as record_lifecycle
+    from normalize import publish_normalized
+    from quality import assess
+
+    breaker = breaker or CircuitBreaker()
+    run_at = run_started(connection, run_id)
+    results, outputs, snapshots = collect(connection, run_id, breaker)
+    breaker.save()
+    record_run(run_id, run_at, results)
+    record_lifecycle(snapshots, run_at)
+    publish_normalized()
+    publish_bundles()
+    if outputs:
+        _, alerts = assess(outputs, baseline_sources=snapshots)
+        for source, message in alerts:
+            print(f"⚠️  {source}: {message}")
+    print(f"Run {run_id}: {sum(r['jobs'] for r in results.values())} jobs published")
+    return results
+
+
+def collect_run(run_id=None, timeout=COORDINATOR_TIMEOUT, db_file=QUEUE_DB):
+    """Wait for and publish a run enqueued earlier (default: the latest); returns its results"""
+    connection = connect(db_file)
+    run_id = run_id or latest_run(connection)
+    if run_id is None:
+        print("Queue is empty")
+        connection.close()
+        return {}
+    wait_for_run(connection, run_id, timeout)
+    results = finish_run(connection, run_id)
+    connection.close()
+    return results
+
+
+def coordinator(sources=None, selection=None, wait=True, timeout=COORDINATOR_TIMEOUT, db_file=QUEUE_DB):
+    """Enqueue every page of every source, wait up to timeout seconds for the workers and publish the results"""
+    from run_all_scrapers import SCRAPERS, source_urls
+    from breaker import CircuitBreaker
+
+    run_id = uuid.uuid4().hex
+    breaker = CircuitBreaker()
+    connection = connect(db_file)
+
+    queued = 0
+    for source in sources or SCRAPERS:
+        if not breaker.allow(source):
+            print(f"[{source}] Circuit open, not queued")
+            continue
+        module = importlib.import_module(f'{source}_scraper')
+        for page, url in enumerate(source_urls(module, selection), start=1):
+            enqueue(connection, run_id, source, url, page)
+            queued += 1
+    print(f"Run {run_id}: queued {queued} tasks in {db_file}")
+
+    if not wait:
+        print(f"Publish it once the workers are done with: python workqueue.py collect --run {run_id}")
+        connection.close()
+        return run_id
+
+    wait_for_run(connection, run_id, timeout)
+    finish_run(connection, run_id, breaker)
+    connection.close()
+    return run_id
+
+
+def status(run_id=None, db_file=QUEUE_DB):
+    """Print task counts for a run (default: the latest)"""
+    connection = connect(db_file)
+    run_id = run_id or latest_run(connection)
+    if run_id is None:
+        print("Queue is empty")
+        return
+    print(f"Run {run_id}")
+    for row in connection.execute(
+            "SELECT source, status, COUNT(*) AS n, MAX(attempts) AS attempts FROM tasks WHERE run_id = ? "
+            "GROUP BY source, status ORDER BY source", (run_id,)):
+        print(f"  {row['source']:<15} {row['status']:<8} {row['n']:>4} tasks (max attempts {row['attempts']})")
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Distributed scrape work queue")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    coordinator_parser = subparsers.add_parser('coordinator', help="enqueue a run, wait for workers, publish")
+    coordinator_parser.add_argument('--source', action='append', help="only this source (repeatable)")
+    coordinator_parser.add_argument('--city', action='append', help="crawl this city (repeatable, 'all' for every city)")
+    coordinator_parser.add_argument('--category', action='append', help="crawl this category (repeatable)")
+    coordinator_parser.add_argument('--no-wait', action='store_true', help="only enqueue; publish later with collect")
+    coordinator_parser.add_argument('--timeout', type=int, default=COORDINATOR_TIMEOUT,
+                                    help="seconds to wait for workers before failing open tasks")
+    collect_parser = subparsers.add_parser('collect', help="wait for and publish a run enqueued with --no-wait")
+    collect_parser.add_argument('--run', help="run id (default: latest)")
+    collect_parser.add_argument('--timeout', type=int, default=COORDINATOR_TIMEOUT,
+                                help="seconds to wait for workers before failing open tasks")
+    worker_parser = subparsers.add_parser('worker', help="claim and process tasks")
+    worker_parser.add_argument('--once', action='store_true', help="exit when the queue is empty")
+    worker_parser.add_argument('--lease', type=int, default=LEASE_SECONDS, help="lease length in seconds")
+    status_parser = subparsers.add_parser('status', help="task counts for a run")
+    status_parser.add_argument('--run', help="run id (default: latest)")
+    args = parser.parse_args()
+
+    if args.command == 'coordinator':
+        selection = {dimension: [v.lower() for v in values]
+                     for dimension, values in (('city', args.city), ('category', args.category)) if values} or None
+        coordinator(args.source, selection, wait=not args.no_wait, timeout=args.timeout)
+    elif args.command == 'collect':
+        collect_run(args.run, args.timeout)
+    elif args.command == 'worker':
+        worker(args.once, args.lease)
+    elif args.command == 'status':
+        status(args.run)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-import { JobListing } from './types';
+import { BundleJob, BundleManifest, BundleView, JobListing } from './types';
 
 // Parse CSV data into array of objects
 function parseCSV<T extends Record<string, string>>(csvContent: string): T[] {
@@ -51,6 +51,11 @@ function parseDate(dateString: string): Date {
   return new Date(fullYear, parseInt(month) - 1, parseInt(day));
 }
 
+// Parse '|'-separated role categories written by the scrapers
+function parseCategories(categories?: string): string[] {
+  return categories ? categories.split('|').filter(Boolean) : [];
+}
+
 // Normalize Meritmind jobs
 export function normalizeMeritmindJobs(csvContent: string): JobListing[] {
   const jobs = parseCSV<Record<string, string>>(csvContent);
@@ -61,6 +66,8 @@ export function normalizeMeritmindJobs(csvContent: string): JobListing[] {
     link: job.link || '',
     dateAdded: parseDate(job.data_added),
     source: 'meritmind' as const,
+    employer: job.employer || undefined,
+    categories: parseCategories(job.categories),
   }));
 }
 
@@ -76,6 +83,8 @@ export function normalizePooliaJobs(csvContent: string): JobListing[] {
     publishedDate: parseDate(job.published_date),
     applyByDate: parseDate(job.apply_by_date),
     source: 'poolia' as const,
+    employer: job.employer || undefined,
+    categories: parseCategories(job.categories),
   }));
 }
 
@@ -92,25 +101,67 @@ export function normalizeArbetsformedlingenJobs(csvContent: string): JobListing[
     email: job.email,
     city: job.city,
     occupation: job.occupation,
+    categories: parseCategories(job.categories),
   }));
 }
 
-// Load and normalize all job data
-export async function loadAllJobs(): Promise<JobListing[]> {
+// Load and normalize all job data from the CSV routes (used until the pipeline has written bundles)
+async function loadJobsFromCsv(): Promise<JobListing[]> {
+  const [meritmindResponse, pooliaResponse, arbetsformedlingenResponse] = await Promise.all([
+    fetch('/api/jobs/meritmind'),
+    fetch('/api/jobs/poolia'),
+    fetch('/api/jobs/arbetsformedlingen'),
+  ]);
+  
+  const [meritmindJobs, pooliaJobs, arbetsformedlingenJobs] = await Promise.all([
+    meritmindResponse.text().then(normalizeMeritmindJobs),
+    pooliaResponse.text().then(normalizePooliaJobs),
+    arbetsformedlingenResponse.text().then(normalizeArbetsformedlingenJobs),
+  ]);
+  
+  return [...meritmindJobs, ...pooliaJobs, ...arbetsformedlingenJobs];
+}
+
+// A bundle date (days since 1970-01-01) as local midnight, like parseDate
+function dateFromEpochDay(day: number): Date {
+  return new Date(1970, 0, 1 + day);
+}
+
+// Load one pre-rendered bundle written by job_data/bundles.py
+async function loadJobsFromBundle(view: BundleView): Promise<JobListing[] | null> {
+  const manifestResponse = await fetch('/data/manifest.json', { cache: 'no-cache' });
+  if (!manifestResponse.ok) {
+    console.warn(`No bundle manifest (HTTP ${manifestResponse.status}), loading the CSVs instead`);
+    return null;
+  }
+  
+  const manifest: BundleManifest = await manifestResponse.json();
+  const entry = manifest.views[view];
+  if (!entry) {
+    console.warn(`Bundle manifest has no ${view} view, loading the CSVs instead`);
+    return null;
+  }
+  
+  // Bundles are immutable: a new content hash means a new file
+  const bundleResponse = await fetch(`/data/${entry.file}`, { cache: 'force-cache' });
+  if (!bundleResponse.ok) {
+    console.warn(`Bundle ${entry.file} unavailable (HTTP ${bundleResponse.status}), loading the CSVs instead`);
+    return null;
+  }
+  
+  const bundle: { jobs: BundleJob[] } = await bundleResponse.json();
+  return bundle.jobs.map(({ dateAddedDay, publishedDateDay, applyByDateDay, ...job }) => ({
+    ...job,
+    dateAdded: dateAddedDay !== undefined ? dateFromEpochDay(dateAddedDay) : new Date(),
+    publishedDate: publishedDateDay !== undefined ? dateFromEpochDay(publishedDateDay) : undefined,
+    applyByDate: applyByDateDay !== undefined ? dateFromEpochDay(applyByDateDay) : undefined,
+  }));
+}
+
+// Load the jobs a page view can show: its bundle, or all CSVs when no bundle is published yet
+export async function loadAllJobs(view: BundleView = 'all'): Promise<JobListing[]> {
   try {
-    const [meritmindResponse, pooliaResponse, arbetsformedlingenResponse] = await Promise.all([
-      fetch('/api/jobs/meritmind'),
-      fetch('/api/jobs/poolia'),
-      fetch('/api/jobs/arbetsformedlingen'),
-    ]);
-    
-    const [meritmindJobs, pooliaJobs, arbetsformedlingenJobs] = await Promise.all([
-      meritmindResponse.text().then(normalizeMeritmindJobs),
-      pooliaResponse.text().then(normalizePooliaJobs),
-      arbetsformedlingenResponse.text().then(normalizeArbetsformedlingenJobs),
-    ]);
-    
-    return [...meritmindJobs, ...pooliaJobs, ...arbetsformedlingenJobs];
+    return (await loadJobsFromBundle(view)) ?? (await loadJobsFromCsv());
   } catch (error) {
     console.error('Error loading jobs:', error);
     return [];
@@ -125,6 +176,12 @@ export function filterJobsByDateRange(jobs: JobListing[], from: Date, to: Date):
   });
 }
 
+// Filter jobs by role category (jobs matching any of the given categories)
+export function filterJobsByCategory(jobs: JobListing[], categories: string[]): JobListing[] {
+  if (categories.length === 0) return jobs;
+  return jobs.filter(job => job.categories?.some(category => categories.includes(category)));
+}
+
 // Get today's jobs
 export function getTodaysJobs(jobs: JobListing[]): JobListing[] {
   const today = new Date();
@@ -0,0 +1,113 @@
+import { promises as fs } from 'fs';
+import path from 'path';
+import { createHash } from 'crypto';
+
+const jobDataDir = path.join(process.cwd(), 'job_data');
+// Written by job_data/bundles.py; read per request, since next start only serves public/ files present at build time
+const bundleDir = process.env.BUNDLE_DIR ?? path.join(jobDataDir, 'web_data');
+// The only paths under /data/: the manifest and content-hashed bundles
+const BUNDLE_FILE = /^bundles\/[\w-]+\.[0-9a-f]{12}\.json$/;
+
+// Entry written by job_data/publisher.py for every published CSV
+export interface ManifestEntry {
+  hash: string;
+  rows: number;
+  bytes: number;
+  mtime_ns?: string;
+  generated_at: string;
+}
+
+export async function readManifest(): Promise<Record<string, ManifestEntry>> {
+  try {
+    return JSON.parse(await fs.readFile(path.join(jobDataDir, 'manifest.json'), 'utf8'));
+  } catch {
+    return {};
+  }
+}
+
+function notModified(etag: string): Response {
+  return new Response(null, {
+    status: 304,
+    headers: { ETag: etag },
+  });
+}
+
+// The file's ETag: the manifest hash while the file still has the size and mtime the
+// publisher recorded, otherwise one derived from its stat, so a file rewritten outside
+// the publisher never matches an old ETag
+async function fileEtag(filePath: string, entry: ManifestEntry | undefined): Promise<string> {
+  const stat = await fs.stat(filePath, { bigint: true });
+  if (entry && BigInt(entry.bytes) === stat.size && entry.mtime_ns === stat.mtimeNs.toString()) {
+    return `"${entry.hash}"`;
+  }
+  return `"${createHash('sha256').update(`${stat.size}-${stat.mtimeNs}`).digest('hex')}"`;
+}
+
+// Serve a jobs CSV with an ETag checked against the file, answering 304 when the client is up to date
+export async function serveJobsCsv(request: Request, filename: string, label: string): Promise<Response> {
+  try {
+    const filePath = path.join(jobDataDir, filename);
+    const etag = await fileEtag(filePath, (await readManifest())[filename]);
+
+    if (request.headers.get('if-none-match') === etag) {
+      return notModified(etag);
+    }
+
+    const fileContent = await fs.readFile(filePath, 'utf8');
+
+    return new Response(fileContent, {
+      headers: {
+        'Content-Type': 'text/csv',
+        'Cache-Control': 'no-cache',
+        ETag: etag,
+      },
+    });
+  } catch (error) {
+    console.error(`Error reading ${label} jobs file:`, error);
+    return new Response('Error loading jobs data', {
+      status: 500,
+    });
+  }
+}
+
+async function readIfExists(filePath: string): Promise<Buffer | null> {
+  try {
+    return await fs.readFile(filePath);
+  } catch {
+    return null;
+  }
+}
+
+// Serve a file of the bundle directory: the manifest is revalidated on every load, bundles
+// never change under their name and go out precompressed when the client accepts it
+export async function serveBundleFile(request: Request, segments: string[]): Promise<Response> {
+  const name = segments.join('/');
+  const headers: Record<string, string> = { 'Content-Type': 'application/json' };
+
+  if (name === 'manifest.json') {
+    const manifest = await readIfExists(path.join(bundleDir, name));
+    if (!manifest) return new Response('Not found', { status: 404 });
+
+    const etag = `"${createHash('sha256').update(manifest).digest('hex')}"`;
+    if (request.headers.get('if-none-match') === etag) return notModified(etag);
+    return new Response(manifest, { headers: { ...headers, 'Cache-Control': 'no-cache', ETag: etag } });
+  }
+
+  if (!BUNDLE_FILE.test(name)) return new Response('Not found', { status: 404 });
+
+  headers['Cache-Control'] = 'public, max-age=31536000, immutable';
+  headers['Vary'] = 'Accept-Encoding';
+  const filePath = path.join(bundleDir, name);
+  const accepted = request.headers.get('accept-encoding') ?? '';
+  for (const [encoding, extension] of [['br', '.br'], ['gzip', '.gz']]) {
+    if (!accepted.includes(encoding)) continue;
+    const compressed = await readIfExists(filePath + extension);
+    if (compressed) {
+      return new Response(compressed, { headers: { ...headers, 'Content-Encoding': encoding } });
+    }
+  }
+
+  const bundle = await readIfExists(filePath);
+  if (!bundle) return new Response('Not found', { status: 404 });
+  return new Response(bundle, { headers });
+}
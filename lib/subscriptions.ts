@@ -0,0 +1,103 @@
+import { promises as fs } from 'fs';
+import path from 'path';
+import { randomBytes, timingSafeEqual } from 'crypto';
+import { EmailConfiguration } from './types';
+
+const jobDataDir = path.join(process.cwd(), 'job_data');
+// Confirmed subscriptions, read by job_data/digest.py
+const subscriptionsFile = path.join(jobDataDir, 'subscriptions.json');
+// Changes waiting for the address owner to confirm; digest.py mails each one its link
+const requestsFile = path.join(jobDataDir, 'subscription_requests.json');
+
+// A request not confirmed within a week is dropped
+const REQUEST_TTL_MS = 7 * 24 * 60 * 60 * 1000;
+
+export interface SubscriptionRequest {
+  action: 'subscribe' | 'unsubscribe';
+  token: string;
+  requested_at: string;
+  frequency?: EmailConfiguration['frequency'];
+  sources?: string[];
+  keywords?: string;
+}
+
+export type SubscriptionRequests = Record<string, SubscriptionRequest>;
+
+export function normalizeEmail(email: string): string {
+  return email.trim().toLowerCase();
+}
+
+async function readJson<T>(file: string, fallback: T): Promise<T> {
+  try {
+    return JSON.parse(await fs.readFile(file, 'utf8'));
+  } catch {
+    return fallback;
+  }
+}
+
+// Write through a temp file and rename, so readers and crashes never see a truncated file
+async function writeJsonAtomic(file: string, data: unknown): Promise<void> {
+  const tmpFile = `${file}.${process.pid}.${randomBytes(4).toString('hex')}.tmp`;
+  try {
+    await fs.writeFile(tmpFile, JSON.stringify(data, null, 2), 'utf8');
+    await fs.rename(tmpFile, file);
+  } catch (error) {
+    await fs.rm(tmpFile, { force: true });
+    throw error;
+  }
+}
+
+// Every read-modify-write of the two files runs one at a time
+let queue: Promise<unknown> = Promise.resolve();
+
+export function updateSubscriptions<T>(
+  update: (subscriptions: EmailConfiguration[], requests: SubscriptionRequests) => T,
+): Promise<T> {
+  const run = queue.then(async () => {
+    const subscriptions = await readJson<EmailConfiguration[]>(subscriptionsFile, []);
+    const requests = await readJson<SubscriptionRequests>(requestsFile, {});
+    const before = [JSON.stringify(subscriptions), JSON.stringify(requests)];
+
+    const now = Date.now();
+    for (const [email, request] of Object.entries(requests)) {
+      if (now - Date.parse(request.requested_at) > REQUEST_TTL_MS) delete requests[email];
+    }
+    const result = update(subscriptions, requests);
+
+    if (JSON.stringify(subscriptions) !== before[0]) await writeJsonAtomic(subscriptionsFile, subscriptions);
+    if (JSON.stringify(requests) !== before[1]) await writeJsonAtomic(requestsFile, requests);
+    return result;
+  });
+  queue = run.catch(() => undefined);
+  return run;
+}
+
+export function newToken(): string {
+  return randomBytes(24).toString('hex');
+}
+
+export function tokenMatches(expected: string, given: string): boolean {
+  const a = Buffer.from(expected);
+  const b = Buffer.from(given);
+  return a.length === b.length && timingSafeEqual(a, b);
+}
+
+// Apply a confirmed request: the address keeps only its latest subscription, or none
+export function applyRequest(subscriptions: EmailConfiguration[], email: string, request: SubscriptionRequest): void {
+  const kept = subscriptions
+    .map(subscription => ({
+      ...subscription,
+      emails: subscription.emails.filter(address => normalizeEmail(address) !== email),
+    }))
+    .filter(subscription => subscription.emails.length > 0);
+  subscriptions.splice(0, subscriptions.length, ...kept);
+
+  if (request.action === 'subscribe') {
+    subscriptions.push({
+      emails: [email],
+      frequency: request.frequency ?? 'daily',
+      sources: request.sources ?? [],
+      ...(request.keywords ? { keywords: request.keywords } : {}),
+    });
+  }
+}
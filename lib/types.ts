@@ -4,17 +4,46 @@ export interface JobListing {
   link: string;
   dateAdded: Date;
   source: 'meritmind' | 'poolia' | 'arbetsformedlingen';
+  employer?: string;
   publishedDate?: Date;
   applyByDate?: Date;
   email?: string;
   city?: string;
   occupation?: string;
+  categories?: string[];
+}
+
+// Page views pre-rendered by job_data/bundles.py
+export type BundleView = 'daily' | 'weekly' | 'all';
+
+export interface BundleEntry {
+  file: string;
+  hash: string;
+  rows: number;
+  bytes: number;
+  gzip_bytes: number;
+  brotli_bytes?: number;
+}
+
+export interface BundleManifest {
+  generated_at: string;
+  views: Partial<Record<BundleView, BundleEntry>>;
+  sources: Record<string, BundleEntry>;
+}
+
+// A job as stored in a bundle: dates are integer days since 1970-01-01
+export interface BundleJob extends Omit<JobListing, 'dateAdded' | 'publishedDate' | 'applyByDate'> {
+  dateAddedDay?: number;
+  publishedDateDay?: number;
+  applyByDateDay?: number;
 }
 
 export interface MeritmindJob {
   title: string;
   link: string;
   data_added: string;
+  categories?: string;
+  employer?: string;
 }
 
 export interface PooliaJob {
@@ -23,6 +52,8 @@ export interface PooliaJob {
   apply_by_date: string;
   job_url: string;
   data_added: string;
+  categories?: string;
+  employer?: string;
 }
 
 export interface ArbetsformedlingenJob {
@@ -31,10 +62,12 @@ export interface ArbetsformedlingenJob {
   city: string;
   occupation: string;
   data_added: string;
+  categories?: string;
 }
 
 export interface FilterOptions {
   sources: string[];
+  categories?: string[];
   dateRange?: {
     from: Date;
     to: Date;
@@ -46,4 +79,5 @@ export interface EmailConfiguration {
   emails: string[];
   frequency: 'daily' | 'weekly';
   sources: string[];
+  keywords?: string;
 } 
\ No newline at end of file